@@ -4,24 +4,16 @@ PovertyLine Backend Application
 This module initializes the Flask application and configures all necessary extensions.
 """
 import os
-from flask import Flask
+from flask import Flask, g, jsonify
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
+from flask_jwt_extended.exceptions import UserLookupError
+from werkzeug.local import LocalProxy
 
-# Set default environment variables if not already set
-if 'DATABASE_URL' not in os.environ:
-    os.environ['DATABASE_URL'] = 'sqlite:///povertyline_db.sqlite'
-if 'SECRET_KEY' not in os.environ:
-    os.environ['SECRET_KEY'] = 'dev-secret-key'
-if 'JWT_SECRET_KEY' not in os.environ:
-    os.environ['JWT_SECRET_KEY'] = 'jwt-secret-key'
-
-# Initialize extensions
+# Initialize extensions (Flask-Migrate is set up by the ``flask db`` command; see app.cli)
 db = SQLAlchemy()
-migrate = Migrate()
 jwt = JWTManager()
 cors = CORS()
 bcrypt = Bcrypt()
@@ -31,7 +23,8 @@ def create_app(config_name=None):
     Application factory function that creates and configures the Flask app.
     
     Args:
-        config_name: Name of the configuration to use (default, development, testing, production)
+        config_name: Name of the configuration to use (default, development, testing, production),
+            or a mapping of settings applied on top of the testing configuration
         
     Returns:
         Flask application instance
@@ -40,8 +33,23 @@ def create_app(config_name=None):
     
     # Load configuration
     from app.config import config
+    overrides = None
+    if isinstance(config_name, dict):
+        overrides, config_name = config_name, 'testing'
     config_name = config_name or os.environ.get('FLASK_ENV', 'default')
     app.config.from_object(config[config_name])
+    if overrides:
+        app.config.update(overrides)
+    config[config_name].init_app(app)
+    
+    # Take the client IP (used by rate limiting) from trusted proxies' X-Forwarded-For
+    if app.config['PROXY_FIX_X_FOR'] or app.config['PROXY_FIX_X_PROTO']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app,
+            x_for=app.config['PROXY_FIX_X_FOR'],
+            x_proto=app.config['PROXY_FIX_X_PROTO']
+        )
     
     # Ensure instance folder exists
     try:
@@ -51,7 +59,10 @@ def create_app(config_name=None):
     
     # Initialize extensions with app
     db.init_app(app)
-    migrate.init_app(app, db)
+    
+    # WAL, pragmas and a per-process write queue for SQLite deployments
+    from app.utils import sqlite
+    sqlite.init_app(app)
     jwt.init_app(app)
     bcrypt.init_app(app)
     
@@ -62,6 +73,29 @@ def create_app(config_name=None):
         supports_credentials=True
     )
     
+    # Keep in-memory search indexes in step with resource commits
+    from app.services import resource_events, suggest, fuzzy, query_expansion
+    resource_events.init_app(app)
+    suggest.init_app(app)
+    fuzzy.init_app(app)
+    query_expansion.init_app(app)
+    
+    # Throttle authentication endpoints
+    from app.services import rate_limit
+    rate_limit.init_app(app)
+    
+    # Outbound email, delivered off the request thread
+    from app.services import notifications
+    notifications.init_app(app)
+    
+    # Record resource changes for delta sync clients
+    from app.services import change_log
+    change_log.init_app(app)
+    
+    # Static directory snapshots for CDN serving
+    from app.services import snapshots
+    snapshots.init_app(app)
+    
     # Register blueprints
     from app.api import api_bp
     from app.auth import auth_bp
@@ -75,13 +109,40 @@ def create_app(config_name=None):
     # Setup JWT loader
     @jwt.user_identity_loader
     def user_identity_lookup(user):
-        return user.id
+        return str(user.id)
     
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
+        # Reason: role checks read token claims, so only load the user row if a view touches current_user
         from app.models.user import User
-        identity = jwt_data["sub"]
-        return User.query.filter_by(id=identity).one_or_none()
+        user_id = int(jwt_data["sub"])
+        
+        def load_user():
+            user = db.session.get(User, user_id)
+            if user is None:
+                # Views catch Exception, so also flag the failure for the after_request hook below
+                g.user_lookup_failed = user_id
+                raise UserLookupError(f"user_lookup returned None for {user_id}", _jwt_header, jwt_data)
+            return user
+        
+        return LocalProxy(load_user)
+    
+    @app.after_request
+    def reject_missing_user(response):
+        # Reason: the lazy lookup fails inside the view; answer as flask_jwt_extended would have up front
+        user_id = g.pop('user_lookup_failed', None)
+        if user_id is None:
+            return response
+        response = jsonify({"msg": f"Error loading the user {user_id}"})
+        response.status_code = 401
+        return response
+    
+    from app.auth import revocation
+    revocation.init_app(app)
+    
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(_jwt_header, jwt_data):
+        return revocation.is_token_revoked(jwt_data)
     
     # Shell context processor
     @app.shell_context_processor
@@ -98,6 +159,11 @@ def create_app(config_name=None):
             'Resource': Resource
         }
     
+    # Compact JSON encoding and compressed responses
+    from app.utils import json_provider, compression
+    json_provider.init_app(app)
+    compression.init_app(app)
+    
     # Register comprehensive error handlers
     from app.utils.error_handlers import register_error_handlers
     register_error_handlers(app)
@@ -5,4 +5,4 @@ from flask import Blueprint
 
 api_bp = Blueprint('api', __name__)
 
-from app.api import users, profiles, resources
+from app.api import users, profiles, resources, search, sync
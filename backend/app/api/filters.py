@@ -0,0 +1,60 @@
+"""
+Filters for the public resource listing, shared by the WSGI and ASGI views.
+"""
+from app import db
+from app.models import Resource, ResourceStatus
+from app.models.types import json_array_contains
+from app.services.query_expansion import expand_query
+
+class PublicListingFilters:
+    """
+    WHERE clauses for ``GET /api/resources`` built from its query arguments.
+
+    Attributes:
+        filters (list): Clauses every result must match (status, category, location, requirements)
+        search (str): The search text left after synonym expansion, or None
+        search_filter: Clause matching ``search`` (or the canonical keywords of its
+            synonyms) in titles and descriptions, or None
+        expansion: The ``expand_query`` result, or None if no search was expanded
+    """
+
+    def __init__(self, args, dialect=None):
+        """
+        Args:
+            args: The request's query arguments
+            dialect (str): Database dialect name, for dialect-specific JSON filters
+        """
+        category = args.get('category')
+        location = args.get('location')
+        requirements = args.getlist('requirement')
+        search = args.get('search')
+        allow_expansion = args.get('expand', 'true').lower() != 'false'
+
+        # Only show approved resources to the public
+        self.filters = [Resource.status == ResourceStatus.APPROVED.value]
+        if category:
+            self.filters.append(Resource.category == category)
+        if location:
+            self.filters.append(Resource.location.ilike(f'%{location}%'))
+        if requirements:
+            self.filters.append(json_array_contains(Resource.requirements, requirements, dialect))
+
+        # Rewrite synonyms into category filters before any text matching
+        self.expansion = expand_query(search, category) if search and allow_expansion else None
+        segments = [(search,)] if search else []
+        if self.expansion and self.expansion.changed:
+            search, segments = self.expansion.text, self.expansion.segments
+            if self.expansion.categories:
+                self.filters.append(Resource.category.in_(self.expansion.categories))
+
+        self.search = search or None
+        # Each segment must appear, as any one of its alternatives
+        self.search_filter = db.and_(*(
+            db.or_(*(
+                clause
+                for alternative in segment
+                for clause in (Resource.title.ilike(f'%{alternative}%'),
+                               Resource.description.ilike(f'%{alternative}%'))
+            ))
+            for segment in segments
+        )) if search else None
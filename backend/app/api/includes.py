@@ -0,0 +1,47 @@
+"""
+Embedding related users in resource listings.
+
+Listings accept ``include=`` to embed the ID and name of related users.
+Those users are loaded for the whole page with one ``selectinload`` query
+per relation, restricted to the exposed columns, so a listing runs in a
+constant number of statements however many rows it returns.
+"""
+from sqlalchemy.orm import selectinload
+from app.models import Resource, User
+from app import schemas
+
+# Resource relationships to users that listings can embed with ``include=``
+RESOURCE_INCLUDES = ('provider', 'approved_by')
+
+def include_options(include):
+    """
+    Loader options that fetch the included users for a whole page at once.
+    
+    Args:
+        include (set): Relation names from ``RESOURCE_INCLUDES``
+        
+    Returns:
+        list: ``selectinload`` options loading only the summary columns
+    """
+    # Reason: one IN query per relation instead of a lazy load per row, and only the columns we expose
+    return [selectinload(getattr(Resource, name)).load_only(User.id, User.name) for name in sorted(include)]
+
+def serialize_resources(resources, include=()):
+    """
+    Serialize resources, embedding included users as ``{"id", "name"}``.
+    
+    Args:
+        resources (list): Resources to serialize
+        include (set): Relation names from ``RESOURCE_INCLUDES``
+        
+    Returns:
+        list: Response dictionaries
+    """
+    responses = []
+    for resource in resources:
+        resource_response = schemas.ResourceResponse.model_validate(resource).model_dump()
+        for name in include:
+            user = getattr(resource, name)
+            resource_response[name] = {"id": user.id, "name": user.name} if user else None
+        responses.append(resource_response)
+    return responses
@@ -2,14 +2,16 @@
 Profile API endpoints for the PovertyLine application.
 """
 from flask import request, jsonify, current_app
-from flask_jwt_extended import jwt_required, current_user
+from flask_jwt_extended import jwt_required, current_user, get_jwt_identity
 from app import db
 from app.api import api_bp
 from app.models import User, Profile
-from app.schemas import ProfileUpdate, ProfileResponse
+from app.models.types import json_array_contains
+from app import schemas
 from app.utils.decorators import admin_required
+from app.utils.params import parse_id_list
+from app.utils.conditional import check_not_modified, with_entity_validators
 from pydantic import ValidationError
-import json
 
 @api_bp.route('/profiles/<int:user_id>', methods=['GET'])
 @jwt_required()
@@ -25,18 +27,26 @@ def get_profile(user_id):
     """
     try:
         # Check if the requesting user is an admin or the profile owner
-        if not current_user.is_admin() and current_user.id != user_id:
+        # Reason: owners are recognised from the token, so polling their own profile never loads the user
+        if int(get_jwt_identity()) != user_id and not current_user.is_admin():
             return jsonify({"error": "Unauthorized access"}), 403
         
+        cached = check_not_modified(
+            'profile', db.session.query(Profile.id, Profile.updated_at).filter(Profile.user_id == user_id)
+        )
+        if cached:
+            return cached
+        
         # Find profile by user ID
         profile = Profile.query.filter_by(user_id=user_id).first()
         
         if not profile:
             return jsonify({"error": "Profile not found"}), 404
         
-        return jsonify({
-            "profile": ProfileResponse.model_validate(profile).model_dump()
-        }), 200
+        response = jsonify({
+            "profile": schemas.ProfileResponse.model_validate(profile).model_dump()
+        })
+        return with_entity_validators(response, 'profile', profile), 200
         
     except Exception as e:
         current_app.logger.error(f"Error getting profile for user {user_id}: {str(e)}")
@@ -66,7 +76,7 @@ def update_profile(user_id):
             return jsonify({"error": "Profile not found"}), 404
         
         # Validate request data
-        profile_data = ProfileUpdate(**request.json)
+        profile_data = schemas.ProfileUpdate(**request.json)
         
         # Update profile fields
         if profile_data.phone is not None:
@@ -82,7 +92,7 @@ def update_profile(user_id):
         if profile_data.zip_code is not None:
             profile.zip_code = profile_data.zip_code
         if profile_data.needs is not None:
-            profile.needs = json.dumps(profile_data.needs)
+            profile.needs = profile_data.needs
         
         # Update completion percentage
         profile.update_completion_percentage()
@@ -92,7 +102,7 @@ def update_profile(user_id):
         
         return jsonify({
             "message": "Profile updated successfully",
-            "profile": ProfileResponse.model_validate(profile).model_dump()
+            "profile": schemas.ProfileResponse.model_validate(profile).model_dump()
         }), 200
         
     except ValidationError as e:
@@ -108,6 +118,10 @@ def get_profiles():
     """
     Get all profiles (admin only).
     
+    ``ids=1,2,3`` restricts the result to the profiles of those user IDs, so
+    a page of users can fetch its profiles in one request. ``need=food``
+    (repeatable) keeps profiles listing every given need.
+    
     Returns:
         JSON response with list of profiles
     """
@@ -118,15 +132,35 @@ def get_profiles():
         # Base query
         query = Profile.query
         
+        if request.args.get('ids') is not None:
+            try:
+                user_ids = parse_id_list(request.args['ids'], current_app.config['MAX_BATCH_IDS'])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            query = query.filter(Profile.user_id.in_(user_ids))
+        
         # Apply filters if provided
         if completion_status == 'complete':
             query = query.filter(Profile.is_complete == True)
         elif completion_status == 'incomplete':
             query = query.filter(Profile.is_complete == False)
         
+        # Score filters use the SQL completion expression, so they match current weights
+        min_completion = request.args.get('min_completion', type=int)
+        max_completion = request.args.get('max_completion', type=int)
+        if min_completion is not None:
+            query = query.filter(Profile.completion_score >= min_completion)
+        if max_completion is not None:
+            query = query.filter(Profile.completion_score <= max_completion)
+        
+        # Containment filter, answered by the GIN index on PostgreSQL
+        needs = request.args.getlist('need')
+        if needs:
+            query = query.filter(json_array_contains(Profile.needs, needs))
+        
         # Execute query and convert to response format
         profiles = query.all()
-        profile_responses = [ProfileResponse.model_validate(profile).model_dump() for profile in profiles]
+        profile_responses = [schemas.ProfileResponse.model_validate(profile).model_dump() for profile in profiles]
         
         return jsonify({
             "profiles": profile_responses,
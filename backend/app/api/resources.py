@@ -2,14 +2,20 @@
 Resource API endpoints for the PovertyLine application.
 """
 from flask import request, jsonify, current_app
-from flask_jwt_extended import jwt_required, current_user
+from flask_jwt_extended import jwt_required, current_user, get_jwt_identity
 from app import db
 from app.api import api_bp
 from app.models import Resource, ResourceStatus
-from app.schemas import ResourceCreate, ResourceUpdate, ResourceResponse, ResourceApproval
+from app.models.types import json_array_contains
+from app.api.filters import PublicListingFilters
+from app import schemas
 from app.utils.decorators import admin_required, provider_required
+from app.services.facets import parse_facets, facet_counts
+from app.services.fuzzy import fuzzy_filter
+from app.utils.params import parse_include, parse_pagination
+from app.utils.conditional import is_conditional, entity_tag, not_modified, with_entity_validators
+from app.api.includes import RESOURCE_INCLUDES, include_options, serialize_resources
 from pydantic import ValidationError
-import json
 from datetime import datetime
 
 @api_bp.route('/resources', methods=['GET'])
@@ -17,39 +23,61 @@ def get_resources():
     """
     Get all approved resources.
     
+    Pass ``facets=category,city,state`` (or ``facets=true``) to also receive
+    per-value counts over the filtered results. Known synonyms and
+    translations in ``search`` become category filters (disable with
+    ``expand=false``), and when the search matches nothing exactly,
+    similarity-ranked fuzzy matches are returned instead (disable with
+    ``fuzzy=false``). ``include=provider`` embeds each provider's ID and name.
+    ``requirement=photo_id`` (repeatable) keeps resources listing every
+    given requirement.
+    
     Returns:
         JSON response with list of resources
     """
     try:
-        # Get query parameters for filtering
-        category = request.args.get('category')
-        location = request.args.get('location')
-        search = request.args.get('search')
+        allow_fuzzy = request.args.get('fuzzy', 'true').lower() != 'false'
         
-        # Base query - only show approved resources to the public
-        query = Resource.query.filter_by(status=ResourceStatus.APPROVED.value)
-        
-        # Apply filters if provided
-        if category:
-            query = query.filter(Resource.category == category)
-        if location:
-            query = query.filter(Resource.location.ilike(f'%{location}%'))
-        if search:
-            query = query.filter(
-                db.or_(
-                    Resource.title.ilike(f'%{search}%'),
-                    Resource.description.ilike(f'%{search}%')
-                )
-            )
+        try:
+            facet_fields = parse_facets(request.args.get('facets'))
+            include = parse_include(request.args.get('include'), ('provider',))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        listing = PublicListingFilters(request.args)
+        search, expansion = listing.search, listing.expansion
+        query = Resource.query.filter(*listing.filters)
+        filtered_query = query
+        if listing.search_filter is not None:
+            query = query.filter(listing.search_filter)
         
         # Execute query and convert to response format
-        resources = query.all()
-        resource_responses = [ResourceResponse.model_validate(resource).model_dump() for resource in resources]
+        options = include_options(include)
+        resources = query.options(*options).all()
         
-        return jsonify({
+        # Fall back to typo-tolerant matching only when the exact search found nothing
+        used_fuzzy = False
+        if search and not resources and allow_fuzzy:
+            query, scores = fuzzy_filter(filtered_query, search)
+            resources = query.options(*options).all()
+            if scores is not None:
+                resources.sort(key=lambda resource: -scores[resource.id])
+            used_fuzzy = True
+        
+        resource_responses = serialize_resources(resources, include)
+        
+        response = {
             "resources": resource_responses,
             "count": len(resource_responses)
-        }), 200
+        }
+        if expansion and expansion.changed:
+            response["expanded"] = expansion.to_dict()
+        if used_fuzzy:
+            response["fuzzy"] = True
+        if facet_fields:
+            response["facets"] = facet_counts(query, facet_fields)
+        
+        return jsonify(response), 200
         
     except Exception as e:
         current_app.logger.error(f"Error getting resources: {str(e)}")
@@ -62,6 +90,8 @@ def get_all_resources():
     """
     Get all resources including pending and rejected (admin only).
     
+    ``include=provider,approved_by`` embeds the ID and name of those users.
+    
     Returns:
         JSON response with list of resources
     """
@@ -70,9 +100,14 @@ def get_all_resources():
         status = request.args.get('status')
         category = request.args.get('category')
         provider_id = request.args.get('provider_id')
+        requirements = request.args.getlist('requirement')
+        try:
+            include = parse_include(request.args.get('include'), RESOURCE_INCLUDES)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Base query
-        query = Resource.query
+        query = Resource.query.options(*include_options(include))
         
         # Apply filters if provided
         if status:
@@ -81,10 +116,12 @@ def get_all_resources():
             query = query.filter(Resource.category == category)
         if provider_id:
             query = query.filter(Resource.provider_id == provider_id)
+        if requirements:
+            query = query.filter(json_array_contains(Resource.requirements, requirements))
         
         # Execute query and convert to response format
         resources = query.all()
-        resource_responses = [ResourceResponse.model_validate(resource).model_dump() for resource in resources]
+        resource_responses = serialize_resources(resources, include)
         
         return jsonify({
             "resources": resource_responses,
@@ -99,7 +136,12 @@ def get_all_resources():
 @jwt_required()
 def get_my_resources():
     """
-    Get resources created by the current user.
+    Get a page of resources created by the current user.
+    
+    The response also carries ``status_counts`` (resources per status,
+    respecting the category filter but not the status filter) for dashboard
+    tabs. Both queries are answered from the
+    ``(provider_id, status, category)`` index.
     
     Returns:
         JSON response with list of resources
@@ -108,23 +150,42 @@ def get_my_resources():
         # Get query parameters for filtering
         status = request.args.get('status')
         category = request.args.get('category')
+        try:
+            page, per_page = parse_pagination(
+                request.args, current_app.config['DEFAULT_PAGE_SIZE'], current_app.config['MAX_PAGE_SIZE']
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        # Base query - filter by current user
-        query = Resource.query.filter_by(provider_id=current_user.id)
+        # Base query - filter by current user (from the token, without loading the user)
+        provider_id = int(get_jwt_identity())
+        query = Resource.query.filter(Resource.provider_id == provider_id)
+        if category:
+            query = query.filter(Resource.category == category)
         
-        # Apply filters if provided
+        # One grouped query gives every tab's count, and the page total with it
+        status_counts = {status.value: 0 for status in ResourceStatus}
+        status_counts.update(
+            query.with_entities(Resource.status, db.func.count()).group_by(Resource.status).all()
+        )
         if status:
             query = query.filter(Resource.status == status)
-        if category:
-            query = query.filter(Resource.category == category)
+            total = status_counts.get(status, 0)
+        else:
+            total = sum(status_counts.values())
         
         # Execute query and convert to response format
-        resources = query.all()
-        resource_responses = [ResourceResponse.model_validate(resource).model_dump() for resource in resources]
+        resources = query.order_by(Resource.id.desc()).limit(per_page).offset((page - 1) * per_page).all()
+        resource_responses = [schemas.ResourceResponse.model_validate(resource).model_dump() for resource in resources]
         
         return jsonify({
             "resources": resource_responses,
-            "count": len(resource_responses)
+            "count": len(resource_responses),
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": (total + per_page - 1) // per_page,
+            "status_counts": status_counts
         }), 200
         
     except Exception as e:
@@ -143,7 +204,7 @@ def create_resource():
     """
     try:
         # Validate request data
-        resource_data = ResourceCreate(**request.json)
+        resource_data = schemas.ResourceCreate(**request.json)
         
         # Set provider ID to current user
         resource_data.provider_id = current_user.id
@@ -164,14 +225,14 @@ def create_resource():
             contact_email=resource_data.contact_email,
             start_date=resource_data.start_date,
             end_date=resource_data.end_date,
-            requirements=json.dumps(resource_data.requirements) if resource_data.requirements else None,
+            requirements=resource_data.requirements or None,
             additional_info=resource_data.additional_info
         )
         resource.save()
         
         return jsonify({
             "message": "Resource created successfully",
-            "resource": ResourceResponse.model_validate(resource).model_dump()
+            "resource": schemas.ResourceResponse.model_validate(resource).model_dump()
         }), 201
         
     except ValidationError as e:
@@ -192,8 +253,13 @@ def get_resource(resource_id):
         JSON response with resource data
     """
     try:
-        # Find resource by ID
-        resource = Resource.query.get(resource_id)
+        # Revalidation only needs the columns used for access checks and the ETag
+        if is_conditional():
+            resource = db.session.query(
+                Resource.id, Resource.updated_at, Resource.status, Resource.provider_id
+            ).filter(Resource.id == resource_id).first()
+        else:
+            resource = db.session.get(Resource, resource_id)
         
         if not resource:
             return jsonify({"error": "Resource not found"}), 404
@@ -208,9 +274,18 @@ def get_resource(resource_id):
         if resource.status != ResourceStatus.APPROVED.value and not is_authenticated:
             return jsonify({"error": "Resource not available"}), 403
         
-        return jsonify({
-            "resource": ResourceResponse.model_validate(resource).model_dump()
-        }), 200
+        etag = entity_tag('resource', resource.id, resource.updated_at)
+        is_public = resource.status == ResourceStatus.APPROVED.value
+        cached = not_modified(etag, resource.updated_at, private=not is_public)
+        if cached:
+            return cached
+        if not isinstance(resource, Resource):
+            resource = db.session.get(Resource, resource_id)
+        
+        response = jsonify({
+            "resource": schemas.ResourceResponse.model_validate(resource).model_dump()
+        })
+        return with_entity_validators(response, 'resource', resource, private=not is_public), 200
         
     except Exception as e:
         current_app.logger.error(f"Error getting resource {resource_id}: {str(e)}")
@@ -240,7 +315,7 @@ def update_resource(resource_id):
             return jsonify({"error": "Unauthorized access"}), 403
         
         # Validate request data
-        resource_data = ResourceUpdate(**request.json)
+        resource_data = schemas.ResourceUpdate(**request.json)
         
         # Update resource fields
         if resource_data.title is not None:
@@ -270,7 +345,7 @@ def update_resource(resource_id):
         if resource_data.end_date is not None:
             resource.end_date = resource_data.end_date
         if resource_data.requirements is not None:
-            resource.requirements = json.dumps(resource_data.requirements)
+            resource.requirements = resource_data.requirements
         if resource_data.additional_info is not None:
             resource.additional_info = resource_data.additional_info
         
@@ -283,7 +358,7 @@ def update_resource(resource_id):
         
         return jsonify({
             "message": "Resource updated successfully",
-            "resource": ResourceResponse.model_validate(resource).model_dump()
+            "resource": schemas.ResourceResponse.model_validate(resource).model_dump()
         }), 200
         
     except ValidationError as e:
@@ -313,7 +388,7 @@ def approve_or_reject_resource(resource_id):
             return jsonify({"error": "Resource not found"}), 404
         
         # Validate request data
-        approval_data = ResourceApproval(**request.json)
+        approval_data = schemas.ResourceApproval(**request.json)
         
         # Update resource status
         if approval_data.status == ResourceStatus.APPROVED.value:
@@ -327,7 +402,7 @@ def approve_or_reject_resource(resource_id):
         
         return jsonify({
             "message": message,
-            "resource": ResourceResponse.model_validate(resource).model_dump()
+            "resource": schemas.ResourceResponse.model_validate(resource).model_dump()
         }), 200
         
     except ValidationError as e:
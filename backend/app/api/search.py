@@ -0,0 +1,35 @@
+"""
+Search helper API endpoints for the PovertyLine application.
+"""
+from flask import request, jsonify, current_app
+from app.api import api_bp
+from app.services.suggest import get_suggestion_index
+
+MAX_SUGGESTIONS = 25
+
+@api_bp.route('/resources/suggest', methods=['GET'])
+def suggest_resources():
+    """
+    Get typeahead suggestions for the resource search box.
+    
+    Matches the start of approved resource titles (or any word in them),
+    categories and cities against the ``q`` query parameter.
+    
+    Returns:
+        JSON response with list of suggestions
+    """
+    try:
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', 10, type=int)
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        
+        suggestions = get_suggestion_index().suggest(query, limit)
+        
+        return jsonify({
+            "suggestions": suggestions,
+            "count": len(suggestions)
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error getting suggestions: {str(e)}")
+        return jsonify({"error": "An error occurred while retrieving suggestions"}), 500
@@ -0,0 +1,144 @@
+"""
+Delta sync API endpoints for the PovertyLine application.
+"""
+from datetime import datetime, timedelta
+from flask import request, jsonify, current_app
+from app import db
+from app.api import api_bp
+from app.models import Resource, ResourceStatus, ResourceChangeLog
+from app import schemas
+
+def _settled_before():
+    """Log entries created before this time can no longer be overtaken by an earlier ID."""
+    return datetime.utcnow() - timedelta(seconds=current_app.config['SYNC_SETTLE_SECONDS'])
+
+def _snapshot_position():
+    """Latest settled log entry; changes after it are replayed once a full sync completes."""
+    return db.session.query(db.func.max(ResourceChangeLog.id)).filter(
+        ResourceChangeLog.created_at <= _settled_before()
+    ).scalar() or 0
+
+def _snapshot(position, after, limit):
+    """
+    One page of public resources for a full sync, in ID order.
+
+    While pages remain, the token is ``<position>:<last ID sent>``; the last
+    page hands back ``position``, so changes made while the client was paging
+    are sent by the following delta syncs.
+    """
+    resources = Resource.query.filter(
+        Resource.status == ResourceStatus.APPROVED.value, Resource.id > after
+    ).order_by(Resource.id).limit(limit + 1).all()
+    has_more = len(resources) > limit
+    resources = resources[:limit]
+    changes = [
+        {"op": "upsert", "id": resource.id, "resource": schemas.ResourceResponse.model_validate(resource).model_dump()}
+        for resource in resources
+    ]
+    next_token = f'{position}:{resources[-1].id}' if has_more else position
+    return changes, next_token, has_more
+
+def _parse_token(since):
+    """
+    Split a sync token into (log position, resource cursor).
+
+    The cursor is None for delta tokens and the last resource ID sent for
+    tokens in the middle of a full sync.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    position, _, after = since.partition(':')
+    return int(position), (int(after) if after else None)
+
+def _changes_since(since, limit):
+    """Current state of the resources logged after ``since``, one entry per resource."""
+    entries = ResourceChangeLog.query.with_entities(
+        ResourceChangeLog.id, ResourceChangeLog.resource_id, ResourceChangeLog.created_at
+    ).filter(ResourceChangeLog.id > since).order_by(ResourceChangeLog.id).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Reason: only advance the token over settled entries; unsettled ones are sent again next time
+    next_token = since
+    settled_before = _settled_before()
+    for entry in entries:
+        if entry.created_at > settled_before:
+            break
+        next_token = entry.id
+    # A full page of unsettled entries would otherwise return the same page forever
+    if has_more and next_token == since and entries:
+        next_token = entries[-1].id
+
+    # Latest position of each resource, so a resource edited many times is sent once
+    order = list(dict.fromkeys(entry.resource_id for entry in reversed(entries)))[::-1]
+    resources = {
+        resource.id: resource
+        for resource in Resource.query.filter(Resource.id.in_(order)).all()
+    } if order else {}
+
+    changes = []
+    for resource_id in order:
+        resource = resources.get(resource_id)
+        if resource is not None and resource.status == ResourceStatus.APPROVED.value:
+            changes.append({
+                "op": "upsert",
+                "id": resource_id,
+                "resource": schemas.ResourceResponse.model_validate(resource).model_dump()
+            })
+        else:
+            # Deleted, or no longer public (pending, rejected, expired or archived)
+            changes.append({"op": "delete", "id": resource_id})
+    return changes, next_token, has_more
+
+@api_bp.route('/resources/changes', methods=['GET'])
+def get_resource_changes():
+    """
+    Get changes to public resources since a sync token.
+
+    Without ``since``, approved resources are returned as upserts
+    (``"reset": true``), one page at a time. With ``since``, only resources
+    created, updated, approved or removed after that token are returned:
+    ``upsert`` entries carry the resource, ``delete`` entries only its ID.
+    Store ``next`` and send it as ``since`` on the next call; while
+    ``has_more`` is true, call again straight away.
+
+    Returns:
+        JSON response with list of changes
+    """
+    try:
+        since = request.args.get('since')
+        limit = request.args.get('limit', current_app.config['SYNC_PAGE_SIZE'], type=int)
+        limit = max(1, min(limit, current_app.config['SYNC_PAGE_SIZE']))
+
+        if since is None or since == '':
+            changes, next_token, has_more = _snapshot(_snapshot_position(), 0, limit)
+            reset = True
+        else:
+            try:
+                since, after = _parse_token(since)
+            except ValueError:
+                return jsonify({"error": "since must be a token returned by this endpoint"}), 400
+
+            # Entries the client still needed have been purged; it must start over
+            oldest = ResourceChangeLog.oldest_id()
+            if since < 0 or (oldest is not None and since < oldest - 1):
+                return jsonify({"error": "Sync token expired; resync without since"}), 410
+            if after is None:
+                changes, next_token, has_more = _changes_since(since, limit)
+            else:
+                changes, next_token, has_more = _snapshot(since, after, limit)
+            reset = False
+
+        response = {
+            "changes": changes,
+            "next": str(next_token),
+            "has_more": has_more
+        }
+        if reset:
+            response["reset"] = True
+        return jsonify(response), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error getting resource changes: {str(e)}")
+        return jsonify({"error": "An error occurred while retrieving resource changes"}), 500
@@ -2,12 +2,15 @@
 User API endpoints for the PovertyLine application.
 """
 from flask import request, jsonify, current_app
-from flask_jwt_extended import jwt_required, current_user
+from flask_jwt_extended import jwt_required, current_user, get_jwt_identity
+from sqlalchemy.orm import selectinload
 from app import db
 from app.api import api_bp
 from app.models import User, UserRole
-from app.schemas import UserUpdate, UserResponse
+from app import schemas
 from app.utils.decorators import admin_required
+from app.utils.params import parse_include
+from app.utils.conditional import check_not_modified, with_entity_validators
 from pydantic import ValidationError
 
 @api_bp.route('/users', methods=['GET'])
@@ -17,6 +20,9 @@ def get_users():
     """
     Get all users (admin only).
     
+    ``include=profile`` embeds each user's profile, loaded with one extra
+    query for the whole page instead of a request per user.
+    
     Returns:
         JSON response with list of users
     """
@@ -24,9 +30,15 @@ def get_users():
         # Get query parameters for filtering
         role = request.args.get('role')
         status = request.args.get('status')
+        try:
+            include = parse_include(request.args.get('include'), ('profile',))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # Base query
         query = User.query
+        if 'profile' in include:
+            query = query.options(selectinload(User.profile))
         
         # Apply filters if provided
         if role:
@@ -36,7 +48,14 @@ def get_users():
         
         # Execute query and convert to response format
         users = query.all()
-        user_responses = [UserResponse.model_validate(user).model_dump() for user in users]
+        user_responses = []
+        for user in users:
+            user_response = schemas.UserResponse.model_validate(user).model_dump()
+            if 'profile' in include:
+                user_response['profile'] = (
+                    schemas.ProfileResponse.model_validate(user.profile).model_dump() if user.profile else None
+                )
+            user_responses.append(user_response)
         
         return jsonify({
             "users": user_responses,
@@ -61,18 +80,23 @@ def get_user(user_id):
     """
     try:
         # Check if the requesting user is an admin or the user being requested
-        if not current_user.is_admin() and current_user.id != user_id:
+        if int(get_jwt_identity()) != user_id and not current_user.is_admin():
             return jsonify({"error": "Unauthorized access"}), 403
         
+        cached = check_not_modified('user', db.session.query(User.id, User.updated_at).filter(User.id == user_id))
+        if cached:
+            return cached
+        
         # Find user by ID
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         
         if not user:
             return jsonify({"error": "User not found"}), 404
         
-        return jsonify({
-            "user": UserResponse.model_validate(user).model_dump()
-        }), 200
+        response = jsonify({
+            "user": schemas.UserResponse.model_validate(user).model_dump()
+        })
+        return with_entity_validators(response, 'user', user), 200
         
     except Exception as e:
         current_app.logger.error(f"Error getting user {user_id}: {str(e)}")
@@ -102,7 +126,7 @@ def update_user(user_id):
             return jsonify({"error": "User not found"}), 404
         
         # Validate request data
-        user_data = UserUpdate(**request.json)
+        user_data = schemas.UserUpdate(**request.json)
         
         # Check if email is being changed and if it's already in use
         if user_data.email and user_data.email != user.email:
@@ -133,7 +157,7 @@ def update_user(user_id):
         
         return jsonify({
             "message": "User updated successfully",
-            "user": UserResponse.model_validate(user).model_dump()
+            "user": schemas.UserResponse.model_validate(user).model_dump()
         }), 200
         
     except ValidationError as e:
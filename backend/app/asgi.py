@@ -0,0 +1,279 @@
+"""
+ASGI serving mode for the PovertyLine application.
+
+Under gunicorn's sync workers each request holds a worker for its whole
+lifetime, including the time spent waiting on the database, so
+concurrency is capped at the worker count. The ASGI application serves
+the busiest read endpoints as coroutines on SQLAlchemy's async engine
+(``asyncpg`` or ``aiosqlite``), so one process can keep many queries in
+flight at once:
+
+- ``GET /api/resources`` (public listing)
+- ``GET /api/resources/<id>`` (public resources)
+- ``GET /api/auth/me``
+
+Every other request, and the cases those handlers do not cover (facets,
+fuzzy fallback, non-public resources, missing or invalid tokens), is
+passed to the regular Flask app, run in a thread pool through ``asgiref``.
+Responses are therefore identical in both modes, and the WSGI entry point
+keeps working alongside this one.
+
+Async handlers run inside a Flask request context built from the ASGI
+scope, so they share the Flask app's configuration, JSON provider,
+validators and ``after_request`` hooks such as compression and CORS.
+"""
+import asyncio
+import io
+import re
+import sys
+from flask import request, jsonify, current_app
+from flask_jwt_extended import decode_token
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.api.filters import PublicListingFilters
+from app.api.includes import include_options, serialize_resources
+from app.auth.revocation import is_token_revoked
+from app.models import Resource, ResourceStatus, User
+from app.schemas import ResourceResponse, UserResponse
+from app.utils.conditional import is_conditional, entity_tag, not_modified, with_entity_validators
+from app.utils.params import parse_include
+
+# Async drivers used for each database backend
+ASYNC_DRIVERS = {
+    'postgresql': 'asyncpg',
+    'sqlite': 'aiosqlite',
+}
+
+
+def async_database_url(uri):
+    """
+    Convert a database URI to use the backend's async driver.
+
+    Args:
+        uri (str): SQLAlchemy database URI, e.g. ``postgresql://...``
+
+    Returns:
+        str: The URI with an async driver, e.g. ``postgresql+asyncpg://...``
+
+    Raises:
+        ValueError: If the backend has no supported async driver
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for database backend {backend!r}")
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}').render_as_string(hide_password=False)
+
+
+def _environ(scope):
+    """Build a WSGI environ for a bodyless ASGI HTTP request."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+async def _send_response(send, response):
+    body = b'' if response.status_code == 304 else response.get_data()
+    headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _json_response(body, status=200):
+    response = jsonify(body)
+    response.status_code = status
+    return response
+
+
+class AsyncAPI:
+    """ASGI application: async read endpoints, everything else through the Flask app."""
+
+    def __init__(self, app):
+        """
+        Args:
+            app: The Flask application
+        """
+        from asgiref.wsgi import WsgiToAsgi
+
+        self.app = app
+        self.wsgi = WsgiToAsgi(app)
+        uri = app.config['ASYNC_DATABASE_URL'] or async_database_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        # SQLite connections are cheap local files; only server databases get a sized pool
+        options = {} if uri.startswith('sqlite') else {
+            'pool_size': app.config['ASYNC_POOL_SIZE'],
+            'pool_pre_ping': True
+        }
+        self.engine = create_async_engine(uri, **options)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.routes = [
+            (re.compile(r'^/api/resources$'), self.list_resources),
+            (re.compile(r'^/api/resources/(?P<resource_id>\d+)$'), self.get_resource),
+            (re.compile(r'^/api/auth/me$'), self.get_current_user),
+        ]
+
+    def _match(self, scope):
+        if scope['method'] != 'GET':
+            return None, None
+        for pattern, handler in self.routes:
+            match = pattern.match(scope['path'])
+            if match:
+                return handler, {name: int(value) for name, value in match.groupdict().items()}
+        return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        handler, kwargs = self._match(scope) if scope['type'] == 'http' else (None, None)
+        if handler is not None:
+            response = await self._handle(scope, handler, kwargs)
+            if response is not None:
+                await _send_response(send, response)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _handle(self, scope, handler, kwargs):
+        """Run an async handler in a Flask request context; None hands the request to the Flask app."""
+        with self.app.request_context(_environ(scope)):
+            try:
+                response = await handler(**kwargs)
+            except Exception as e:
+                current_app.logger.error(f"Error in async handler {handler.__name__}: {str(e)}")
+                response = _json_response({"error": "An error occurred while processing the request"}, 500)
+            if response is None:
+                return None
+            return self.app.process_response(response)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def list_resources(self):
+        """Async ``GET /api/resources``; facets and fuzzy fallback are left to the Flask view."""
+        if request.args.get('facets'):
+            return None
+        try:
+            include = parse_include(request.args.get('include'), ('provider',))
+        except ValueError as e:
+            return _json_response({"error": str(e)}, 400)
+
+        listing = PublicListingFilters(request.args, self.engine.dialect.name)
+        query = select(Resource).where(*listing.filters).options(*include_options(include))
+        if listing.search_filter is not None:
+            query = query.where(listing.search_filter)
+        async with self.session() as session:
+            resources = (await session.execute(query)).scalars().all()
+
+        # Reason: fuzzy matching uses the in-process trigram index, which the Flask view maintains
+        if listing.search and not resources and request.args.get('fuzzy', 'true').lower() != 'false':
+            return None
+
+        resource_responses = serialize_resources(resources, include)
+        response = {
+            "resources": resource_responses,
+            "count": len(resource_responses)
+        }
+        if listing.expansion and listing.expansion.changed:
+            response["expanded"] = listing.expansion.to_dict()
+        return _json_response(response)
+
+    async def get_resource(self, resource_id):
+        """Async ``GET /api/resources/<id>`` for public resources."""
+        # Owners and admins may see unpublished resources; the Flask view handles those checks
+        if request.headers.get('Authorization'):
+            return None
+
+        async with self.session() as session:
+            if is_conditional():
+                resource = (await session.execute(
+                    select(Resource.id, Resource.updated_at, Resource.status).where(Resource.id == resource_id)
+                )).first()
+            else:
+                resource = await session.get(Resource, resource_id)
+            if resource is None:
+                return _json_response({"error": "Resource not found"}, 404)
+            if resource.status != ResourceStatus.APPROVED.value:
+                return None
+
+            cached = not_modified(entity_tag('resource', resource.id, resource.updated_at), resource.updated_at,
+                                  private=False)
+            if cached:
+                return cached
+            if not isinstance(resource, Resource):
+                resource = await session.get(Resource, resource_id)
+
+        response = _json_response({"resource": ResourceResponse.model_validate(resource).model_dump()})
+        return with_entity_validators(response, 'resource', resource, private=False)
+
+    async def get_current_user(self):
+        """Async ``GET /api/auth/me``; requests without a valid access token get the Flask view's errors."""
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return None
+        try:
+            jwt_data = decode_token(header[len('Bearer '):])
+        except Exception:
+            return None
+        if jwt_data.get('type') != 'access':
+            return None
+        # Reason: the blocklist refreshes from the database now and then, which must not block the event loop
+        if await asyncio.to_thread(is_token_revoked, jwt_data):
+            return None
+
+        user_id = int(jwt_data['sub'])
+        async with self.session() as session:
+            if is_conditional():
+                row = (await session.execute(select(User.id, User.updated_at).where(User.id == user_id))).first()
+                if row is not None:
+                    cached = not_modified(entity_tag('user', row.id, row.updated_at), row.updated_at)
+                    if cached:
+                        return cached
+            user = await session.get(User, user_id)
+        if user is None:
+            return None
+
+        response = _json_response({"user": UserResponse.model_validate(user).model_dump()})
+        return with_entity_validators(response, 'user', user)
+
+
+def create_asgi_app(config_name=None):
+    """
+    Create the ASGI application.
+
+    Args:
+        config_name: As for ``create_app``
+
+    Returns:
+        AsyncAPI: The ASGI application
+    """
+    from app import create_app
+    return AsyncAPI(create_app(config_name))
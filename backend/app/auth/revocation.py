@@ -0,0 +1,271 @@
+"""
+Token revocation checks.
+
+Two mechanisms feed ``token_in_blocklist_loader``: revocation of access
+tokens whose role or status claims are out of date, and an explicit
+blocklist of token IDs for logout.
+
+Claims revocation
+-----------------
+
+Access tokens carry the user's ``role`` and ``status`` as claims so that
+``admin_required`` and ``provider_required`` can authorize without loading
+the user. When an admin changes a user's role or status, the user's
+``claims_changed_at`` timestamp is set. Tokens carry the value it had when
+they were issued (the ``cv`` claim), so any token issued before the change
+is rejected as revoked; the user has to log in again to get current claims.
+
+Checking a token must not cost a query per request, so each process keeps
+a map of user ID -> last claims change, refreshed with one indexed query
+for rows changed since the previous refresh. ``claims_changed_at`` is
+stamped before the change commits, so a change can commit after a later
+one has been seen; each refresh therefore re-reads the last
+``JWT_REVOCATION_SETTLE_SECONDS`` before the newest change seen. Changes
+committed by this process apply immediately; changes from other workers
+apply within ``JWT_CLAIMS_REFRESH_INTERVAL`` seconds.
+
+Deleting a user leaves no row to stamp, so deletions are recorded in the
+``user_deletions`` table and read by the same refresh. Every token of a
+deleted user issued before the deletion is rejected, refresh tokens
+included.
+
+Token blocklist
+---------------
+Logged-out tokens are stored by ``jti`` in the ``revoked_tokens`` table.
+Nearly every token checked is *not* revoked, so each process keeps a Bloom
+filter of revoked IDs in front of the table: a miss (the common case) is
+answered from memory, and only a hit is confirmed with an indexed lookup.
+New rows are pulled into the filter incrementally by primary key at most
+every ``JWT_BLOCKLIST_REFRESH_INTERVAL`` seconds; revocations made by this
+process are added immediately. IDs are assigned at insert, not at commit,
+so a row can become visible after a higher ID has been loaded; rows created
+in the last ``JWT_REVOCATION_SETTLE_SECONDS`` are therefore re-read on
+every refresh as well.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+from app.models.token import RevokedToken, UserDeletion
+from app.models.user import CLAIMS_CHANGED_SESSION_KEY, claims_version
+from app.utils.bloom import BloomFilter
+
+
+class ClaimsRevocationCache:
+    """Process-local view of recent ``users.claims_changed_at`` values and user deletions."""
+
+    def __init__(self, refresh_interval, max_token_age, settle=timedelta(0)):
+        self.refresh_interval = refresh_interval
+        self.max_token_age = max_token_age
+        self.settle = settle
+        self._lock = threading.Lock()
+        self._changed = {}          # user id -> claims version (see claims_version)
+        self._high_water = None     # newest claims_changed_at seen
+        self._deleted = {}          # deleted user id -> deletion time, as a claims version
+        self._deletions_high_water = None  # newest user_deletions.created_at seen
+        self._refreshed_at = None   # monotonic time of the last refresh
+
+    def invalidate(self):
+        """Force a refresh on the next check."""
+        self._refreshed_at = None
+
+    def _refresh(self):
+        from app.models.user import User
+
+        query = db.session.query(User.id, User.claims_changed_at)
+        if self._high_water is None:
+            # Reason: changes older than the longest-lived token cannot revoke anything
+            since = datetime.utcnow() - self.max_token_age
+            query = query.filter(User.claims_changed_at > since)
+        else:
+            query = query.filter(User.claims_changed_at >= self._high_water - self.settle)
+
+        for user_id, changed_at in query:
+            self._changed[user_id] = claims_version(changed_at)
+            if self._high_water is None or changed_at > self._high_water:
+                self._high_water = changed_at
+        if self._high_water is None:
+            self._high_water = datetime.utcnow() - self.max_token_age
+
+        deletions = db.session.query(UserDeletion.user_id, UserDeletion.created_at)
+        if self._deletions_high_water is None:
+            deletions = deletions.filter(UserDeletion.expires_at > datetime.utcnow())
+        else:
+            deletions = deletions.filter(UserDeletion.created_at >= self._deletions_high_water - self.settle)
+        for user_id, deleted_at in deletions:
+            self._deleted[user_id] = max(self._deleted.get(user_id, 0), claims_version(deleted_at))
+            if self._deletions_high_water is None or deleted_at > self._deletions_high_water:
+                self._deletions_high_water = deleted_at
+        if self._deletions_high_water is None:
+            self._deletions_high_water = datetime.utcnow()
+
+    def _refresh_if_due(self):
+        now = time.monotonic()
+        if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+            with self._lock:
+                if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+                    self._refresh()
+                    self._refreshed_at = now
+
+    def is_revoked(self, user_id, claims_version):
+        """
+        Check whether a token predates its user's last role or status change.
+
+        Args:
+            user_id (int): The token's user ID
+            claims_version (int): The token's ``cv`` claim
+
+        Returns:
+            bool: True if the token must be rejected
+        """
+        self._refresh_if_due()
+        return self._changed.get(user_id, 0) > claims_version
+
+    def is_deleted(self, user_id, issued_at):
+        """
+        Check whether a token was issued to a user who has since been deleted.
+
+        Args:
+            user_id (int): The token's user ID
+            issued_at (int): The token's ``iat`` claim, in epoch seconds
+
+        Returns:
+            bool: True if the token must be rejected
+        """
+        self._refresh_if_due()
+        deleted = self._deleted.get(user_id)
+        # Reason: a later user may reuse a deleted ID, so only tokens issued before the deletion are rejected
+        return deleted is not None and issued_at * 1000 <= deleted
+
+
+class TokenBlocklist:
+    """Bloom filter of revoked token IDs backed by the ``revoked_tokens`` table."""
+
+    def __init__(self, refresh_interval, capacity, error_rate, settle=timedelta(0)):
+        self.refresh_interval = refresh_interval
+        self.settle = settle
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0           # highest revoked_tokens.id loaded into the filter
+        self._refreshed_at = None   # monotonic time of the last refresh
+
+    def add(self, jti):
+        """
+        Add a token ID revoked by this process.
+
+        Args:
+            jti (str): The token's ``jti`` claim
+        """
+        self._bloom.add(jti)
+
+    def _rebuild(self):
+        # Reason: past capacity the false positive rate climbs, so resize from unexpired rows only
+        live = RevokedToken.query.filter(RevokedToken.expires_at > datetime.utcnow()).count()
+        self._bloom = BloomFilter(max(self.capacity, live * 2), self.error_rate)
+        self._last_id = 0
+
+    def _refresh(self):
+        if len(self._bloom) > self._bloom.capacity:
+            self._rebuild()
+        query = db.session.query(RevokedToken.id, RevokedToken.jti)
+        if self._last_id == 0:
+            query = query.filter(RevokedToken.expires_at > datetime.utcnow())
+        else:
+            query = query.filter(db.or_(
+                RevokedToken.id > self._last_id,
+                RevokedToken.created_at >= datetime.utcnow() - self.settle
+            ))
+        for row_id, jti in query.order_by(RevokedToken.id):
+            # Reason: recent rows are read again on every refresh; re-adding would inflate the count
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+            self._last_id = max(self._last_id, row_id)
+
+    def is_revoked(self, jti):
+        """
+        Check whether a token ID has been revoked.
+
+        Args:
+            jti (str): The token's ``jti`` claim
+
+        Returns:
+            bool: True if the token must be rejected
+        """
+        now = time.monotonic()
+        if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+            with self._lock:
+                if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+                    self._refresh()
+                    self._refreshed_at = now
+        if jti not in self._bloom:
+            return False
+        return db.session.query(RevokedToken.query.filter_by(jti=jti).exists()).scalar()
+
+
+def revoke_token(jwt_data):
+    """
+    Revoke a token by its ``jti``; the caller commits the session.
+
+    Args:
+        jwt_data (dict): The decoded token
+    """
+    blocklist = current_app.extensions['token_blocklist']
+    if blocklist.is_revoked(jwt_data['jti']):
+        return
+    RevokedToken.revoke(jwt_data)
+    blocklist.add(jwt_data['jti'])
+
+
+def is_token_revoked(jwt_data):
+    """
+    Check a decoded token against the claims cache and the blocklist.
+
+    Args:
+        jwt_data (dict): The decoded token
+
+    Returns:
+        bool: True if the token must be rejected
+    """
+    cache = current_app.extensions['claims_revocation']
+    if cache.is_deleted(int(jwt_data['sub']), jwt_data['iat']):
+        return True
+    if jwt_data.get('type') == 'access' and 'cv' in jwt_data:
+        if cache.is_revoked(int(jwt_data['sub']), jwt_data['cv']):
+            return True
+    return current_app.extensions['token_blocklist'].is_revoked(jwt_data['jti'])
+
+
+def _after_commit(session):
+    """Make this process see its own claims changes immediately."""
+    if session.info.pop(CLAIMS_CHANGED_SESSION_KEY, False) and has_app_context():
+        current_app.extensions['claims_revocation'].invalidate()
+
+
+def init_app(app):
+    """
+    Attach the claims revocation cache and token blocklist to the app.
+
+    Args:
+        app: The Flask application
+    """
+    max_token_age = app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    if not isinstance(max_token_age, timedelta):
+        max_token_age = timedelta(seconds=max_token_age)
+    settle = timedelta(seconds=app.config['JWT_REVOCATION_SETTLE_SECONDS'])
+    app.extensions['claims_revocation'] = ClaimsRevocationCache(
+        app.config['JWT_CLAIMS_REFRESH_INTERVAL'],
+        max_token_age,
+        settle
+    )
+    app.extensions['token_blocklist'] = TokenBlocklist(
+        app.config['JWT_BLOCKLIST_REFRESH_INTERVAL'],
+        app.config['JWT_BLOCKLIST_BLOOM_CAPACITY'],
+        app.config['JWT_BLOCKLIST_BLOOM_ERROR_RATE'],
+        settle
+    )
+    if not event.contains(db.session, 'after_commit', _after_commit):
+        event.listen(db.session, 'after_commit', _after_commit)
@@ -3,28 +3,22 @@ Authentication routes for the PovertyLine application.
 """
 from flask import request, jsonify, current_app
 from flask_jwt_extended import (
-    create_access_token, jwt_required, get_jwt_identity,
-    get_jwt, current_user
+    create_access_token, create_refresh_token, decode_token,
+    jwt_required, get_jwt_identity, get_jwt, current_user
 )
-from app import db, jwt
+from app import db
 from app.auth import auth_bp
-from app.models import User, Profile
-from app.schemas import (
-    UserCreate, UserResponse, UserPasswordUpdate, UserPasswordReset
-)
+from app.auth.revocation import revoke_token
+from app.services.notifications import send_password_reset
+from app.models import User, Profile, PasswordResetToken
+from app.utils.decorators import rate_limited
+from app.utils.conditional import check_not_modified, with_entity_validators
+from app import schemas
 from datetime import datetime
 from pydantic import ValidationError
 
-@jwt.user_lookup_loader
-def user_lookup_callback(_jwt_header, jwt_data):
-    """
-    Callback function that loads a user from the database whenever
-    a protected route is accessed.
-    """
-    identity = jwt_data["sub"]
-    return User.query.filter_by(id=identity).first()
-
 @auth_bp.route('/register', methods=['POST'])
+@rate_limited('register')
 def register():
     """
     Register a new user.
@@ -34,7 +28,7 @@ def register():
     """
     try:
         # Validate request data
-        user_data = UserCreate(**request.json)
+        user_data = schemas.UserCreate(**request.json)
         
         # Check if user already exists
         if User.query.filter_by(email=user_data.email).first():
@@ -53,13 +47,15 @@ def register():
         profile = Profile(user_id=user.id)
         profile.save()
         
-        # Generate access token
-        access_token = create_access_token(identity=user.id)
+        # Generate access and refresh tokens
+        access_token = create_access_token(identity=user, additional_claims=user.token_claims())
+        refresh_token = create_refresh_token(identity=user)
         
         return jsonify({
             "message": "User registered successfully",
-            "user": UserResponse.model_validate(user).model_dump(),
-            "token": access_token
+            "user": schemas.UserResponse.model_validate(user).model_dump(),
+            "token": access_token,
+            "refresh_token": refresh_token
         }), 201
         
     except ValidationError as e:
@@ -69,6 +65,7 @@ def register():
         return jsonify({"error": "An error occurred while registering user"}), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited('login')
 def login():
     """
     Authenticate a user and issue an access token.
@@ -99,19 +96,82 @@ def login():
         # Update last login timestamp
         user.update_last_login()
         
-        # Generate access token
-        access_token = create_access_token(identity=user.id)
+        # Generate access and refresh tokens
+        access_token = create_access_token(identity=user, additional_claims=user.token_claims())
+        refresh_token = create_refresh_token(identity=user)
         
         return jsonify({
             "message": "Login successful",
-            "user": UserResponse.model_validate(user).model_dump(),
-            "token": access_token
+            "user": schemas.UserResponse.model_validate(user).model_dump(),
+            "token": access_token,
+            "refresh_token": refresh_token
         }), 200
         
     except Exception as e:
         current_app.logger.error(f"Error logging in: {str(e)}")
         return jsonify({"error": "An error occurred during login"}), 500
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """
+    Issue a new access token from a refresh token.
+    
+    Returns:
+        JSON response with a new access token
+    """
+    try:
+        # Reason: refresh tokens carry no claims, so re-read role and status from the user
+        if not current_user.is_active():
+            return jsonify({"error": "Account is inactive or suspended"}), 403
+        
+        access_token = create_access_token(identity=current_user, additional_claims=current_user.token_claims())
+        
+        return jsonify({
+            "message": "Token refreshed successfully",
+            "token": access_token
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error refreshing token: {str(e)}")
+        return jsonify({"error": "An error occurred while refreshing token"}), 500
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """
+    Revoke the presented token and, optionally, a refresh token.
+    
+    Returns:
+        JSON response with success message
+    """
+    try:
+        jwt_data = get_jwt()
+        revoked = [jwt_data]
+        
+        # Allow revoking the refresh token in the same call as the access token
+        data = request.get_json(silent=True) or {}
+        if data.get('refresh_token'):
+            try:
+                refresh_data = decode_token(data['refresh_token'], allow_expired=True)
+            except Exception:
+                return jsonify({"error": "Invalid refresh token"}), 400
+            if refresh_data.get('type') != 'refresh' or refresh_data.get('sub') != jwt_data['sub']:
+                return jsonify({"error": "Invalid refresh token"}), 400
+            if refresh_data['jti'] != jwt_data['jti']:
+                revoked.append(refresh_data)
+        
+        for token_data in revoked:
+            revoke_token(token_data)
+        db.session.commit()
+        
+        return jsonify({"message": "Logged out successfully"}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error logging out: {str(e)}")
+        return jsonify({"error": "An error occurred while logging out"}), 500
+
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
@@ -122,9 +182,16 @@ def get_current_user():
         JSON response with user data
     """
     try:
-        return jsonify({
-            "user": UserResponse.model_validate(current_user).model_dump()
-        }), 200
+        cached = check_not_modified(
+            'user', db.session.query(User.id, User.updated_at).filter(User.id == int(get_jwt_identity()))
+        )
+        if cached:
+            return cached
+        
+        response = jsonify({
+            "user": schemas.UserResponse.model_validate(current_user).model_dump()
+        })
+        return with_entity_validators(response, 'user', current_user), 200
     except Exception as e:
         current_app.logger.error(f"Error getting current user: {str(e)}")
         return jsonify({"error": "An error occurred while retrieving user data"}), 500
@@ -140,7 +207,7 @@ def change_password():
     """
     try:
         # Validate request data
-        password_data = UserPasswordUpdate(**request.json)
+        password_data = schemas.UserPasswordUpdate(**request.json)
         
         # Verify current password
         if not current_user.verify_password(password_data.current_password):
@@ -159,6 +226,7 @@ def change_password():
         return jsonify({"error": "An error occurred while changing password"}), 500
 
 @auth_bp.route('/reset-password', methods=['POST'])
+@rate_limited('password_reset')
 def request_password_reset():
     """
     Request a password reset for a user.
@@ -180,16 +248,10 @@ def request_password_reset():
         # If user exists, generate reset token
         if user:
             token = user.generate_reset_token()
-            
-            # In a real application, you would send an email with the reset link
-            # For now, we'll just return the token in the response
             reset_link = f"{request.host_url}reset-password/{token}"
             
-            # Log the reset link for development purposes
-            current_app.logger.info(f"Password reset link for {email}: {reset_link}")
-            
-            # In production, you would use a proper email service
-            # send_password_reset_email(user, token)
+            # Queued for background delivery so the response does not wait on SMTP
+            send_password_reset(user, reset_link)
         
         # Always return success to prevent email enumeration
         return jsonify({
@@ -201,6 +263,7 @@ def request_password_reset():
         return jsonify({"error": "An error occurred while processing your request"}), 500
 
 @auth_bp.route('/reset-password/<token>', methods=['POST'])
+@rate_limited('password_reset')
 def reset_password(token):
     """
     Reset a user's password using a reset token.
@@ -213,18 +276,17 @@ def reset_password(token):
     """
     try:
         # Validate request data
-        reset_data = UserPasswordReset(token=token, **request.json)
+        reset_data = schemas.UserPasswordReset(token=token, **request.json)
         
-        # Find user by reset token
-        user = User.query.filter_by(reset_token=token).first()
-        
-        # Check if user exists and token is valid
-        if not user or not user.verify_reset_token(token):
+        # Find the unexpired token by its hash
+        reset_token = PasswordResetToken.find_valid(token)
+        if not reset_token:
             return jsonify({"error": "Invalid or expired reset token"}), 400
         
-        # Update password and clear reset token
-        user.password = reset_data.new_password
-        user.clear_reset_token()
+        # Update password and consume the token
+        reset_token.user.password = reset_data.new_password
+        db.session.delete(reset_token)
+        db.session.commit()
         
         return jsonify({"message": "Password has been reset successfully"}), 200
         
@@ -2,16 +2,48 @@
 Command line interface extensions for the PovertyLine application.
 """
 import os
+from datetime import datetime, timedelta
 import click
 from flask import current_app
 from flask.cli import with_appcontext
 from app import db
-from app.models import User, UserRole, UserStatus, Profile
+from app.models import (
+    User, UserRole, UserStatus, Profile, RevokedToken, UserDeletion, PasswordResetToken, ResourceChangeLog
+)
+
+class MigrateGroup(click.Group):
+    """
+    The ``flask db`` commands from Flask-Migrate, set up on first use.
+
+    Flask-Migrate imports Alembic, which takes longer than the rest of the
+    app's startup, so it is only initialized when a ``flask db`` command runs.
+    """
+
+    def _group(self):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_group
+
+        app = current_app._get_current_object()
+        if 'migrate' not in app.extensions:
+            Migrate(app, db)
+        return db_group
+
+    def list_commands(self, ctx):
+        return self._group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._group().get_command(ctx, name)
 
 def register_commands(app):
     """Register Flask CLI commands."""
+    app.cli.add_command(MigrateGroup('db', help='Perform database migrations.'))
     app.cli.add_command(init_db_command)
     app.cli.add_command(create_admin_command)
+    app.cli.add_command(purge_tokens_command)
+    app.cli.add_command(recompute_completion_command)
+    app.cli.add_command(purge_resource_changes_command)
+    app.cli.add_command(build_snapshot_command)
+    app.cli.add_command(seed_command)
 
 @click.command('init-db')
 @with_appcontext
@@ -50,3 +82,64 @@ def create_admin_command(email, name, password):
     profile.save()
     
     click.echo(f"Admin user {email} created successfully!")
+
+@click.command('purge-tokens')
+@with_appcontext
+def purge_tokens_command():
+    """Delete expired revoked tokens, user deletion records and password reset tokens."""
+    revoked = RevokedToken.purge_expired()
+    deletions = UserDeletion.purge_expired()
+    reset = PasswordResetToken.purge_expired()
+    click.echo(f"Purged {revoked} expired revoked token(s), {deletions} user deletion record(s) "
+               f"and {reset} expired password reset token(s).")
+
+@click.command('recompute-completion')
+@click.option('--chunk-size', default=1000, show_default=True, help='Profiles updated per statement')
+@with_appcontext
+def recompute_completion_command(chunk_size):
+    """Recalculate profile completion after changing the scoring weights."""
+    updated = Profile.recompute_completion(chunk_size)
+    click.echo(f"Updated completion for {updated} profile(s).")
+
+@click.command('purge-resource-changes')
+@click.option('--days', type=int, default=None, help='Keep this many days of changes (default RESOURCE_CHANGES_RETENTION_DAYS)')
+@with_appcontext
+def purge_resource_changes_command(days):
+    """Delete old delta sync log entries; clients with older tokens resync in full."""
+    days = current_app.config['RESOURCE_CHANGES_RETENTION_DAYS'] if days is None else days
+    deleted = ResourceChangeLog.purge_before(datetime.utcnow() - timedelta(days=days))
+    click.echo(f"Purged {deleted} resource change log entries older than {days} day(s).")
+
+@click.command('build-snapshot')
+@with_appcontext
+def build_snapshot_command():
+    """Write static JSON snapshots of the public resource directory."""
+    builder = current_app.extensions['snapshots']
+    manifest = builder.build()
+    click.echo(
+        f"Wrote {manifest['all']['count']} resource(s), {len(manifest['categories'])} category file(s) "
+        f"and {len(manifest['cities'])} city file(s) to {builder.directory}."
+    )
+
+@click.command('seed')
+@click.option('--users', type=int, default=1000, show_default=True, help='Users to create, each with a profile')
+@click.option('--resources', type=int, default=5000, show_default=True, help='Resources to create')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed; the same seed gives the same data')
+@click.option('--batch-size', type=int, default=10000, show_default=True, help='Rows per INSERT and commit')
+@with_appcontext
+def seed_command(users, resources, seed, batch_size):
+    """Bulk-insert realistic synthetic data for benchmarks and index tuning."""
+    from app.services.seed import SEED_PASSWORD, seed_database
+
+    db.create_all()
+    started = datetime.utcnow()
+    try:
+        counts = seed_database(users, resources, seed, batch_size,
+                               progress=lambda table, rows: click.echo(f"  {table}: {rows}"))
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    click.echo(
+        f"Inserted {counts['users']} user(s), {counts['profiles']} profile(s) and "
+        f"{counts['resources']} resource(s) in {elapsed:.1f}s. Seeded users' password: {SEED_PASSWORD}"
+    )
@@ -4,9 +4,13 @@ Models package for the PovertyLine application.
 from app.models.user import User, UserRole, UserStatus
 from app.models.profile import Profile
 from app.models.resource import Resource, ResourceCategory, ResourceStatus
+from app.models.token import RevokedToken, UserDeletion, PasswordResetToken
+from app.models.change_log import ResourceChangeLog
 
 __all__ = [
     'User', 'UserRole', 'UserStatus',
     'Profile',
-    'Resource', 'ResourceCategory', 'ResourceStatus'
+    'Resource', 'ResourceCategory', 'ResourceStatus',
+    'RevokedToken', 'UserDeletion', 'PasswordResetToken',
+    'ResourceChangeLog'
 ]
@@ -0,0 +1,57 @@
+"""
+Change log of public resource listings, used for delta sync.
+"""
+from app import db
+from app.models.base import Base
+
+class ResourceChangeLog(Base):
+    """
+    One row per resource touched by a flush.
+    
+    The autoincrement ``id`` is the sync token: a client that has seen every
+    change up to ``id`` N asks for ``id > N``. Rows only name the resource;
+    its current state is read when changes are requested, so a resource
+    that changed many times is sent once.
+    """
+    
+    __tablename__ = 'resource_change_log'
+    
+    resource_id = db.Column(db.Integer, nullable=False)  # no FK: deleted resources keep their entries
+    op = db.Column(db.String(10), nullable=False)  # 'created', 'updated' or 'deleted'
+    
+    @classmethod
+    def latest_id(cls):
+        """
+        Get the newest change token.
+        
+        Returns:
+            int: The highest ID in the log, or 0 if it is empty
+        """
+        return db.session.query(db.func.max(cls.id)).scalar() or 0
+    
+    @classmethod
+    def oldest_id(cls):
+        """
+        Get the oldest retained change token.
+        
+        Returns:
+            int: The lowest ID in the log, or None if it is empty
+        """
+        return db.session.query(db.func.min(cls.id)).scalar()
+    
+    @classmethod
+    def purge_before(cls, cutoff):
+        """
+        Delete entries older than a cutoff; clients with older tokens must resync.
+        
+        Args:
+            cutoff (datetime): Entries created before this are deleted
+            
+        Returns:
+            int: Number of rows deleted
+        """
+        # Reason: always keep the newest entry so the token sequence cannot restart from 1
+        newest = cls.latest_id()
+        deleted = cls.query.filter(cls.created_at < cutoff, cls.id < newest).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
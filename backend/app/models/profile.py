@@ -3,6 +3,24 @@ Profile model for storing user profile information.
 """
 from app import db
 from app.models.base import Base
+from app.models.types import JSONList, json_array_filled
+from sqlalchemy import DDL, and_, case, event
+from sqlalchemy.ext.hybrid import hybrid_property
+
+# Points each filled field adds to the completion score (sums to 100).
+# Required fields carry 70% of the score, optional fields 30%.
+COMPLETION_WEIGHTS = {
+    'phone': 14,
+    'address': 14,
+    'city': 14,
+    'state': 14,
+    'zip_code': 14,
+    'bio': 15,
+    'needs': 15
+}
+
+# A profile counts as complete at or above this score
+COMPLETE_THRESHOLD = 80
 
 class Profile(Base):
     """Profile model for storing user profile information."""
@@ -23,41 +41,77 @@ class Profile(Base):
     zip_code = db.Column(db.String(20), nullable=True)
     
     # Basic needs information
-    needs = db.Column(db.Text, nullable=True)  # JSON-serialized list of needs
+    needs = db.Column(JSONList, nullable=True)  # list of need strings, e.g. 'food'
     
     # Profile completion tracking
     is_complete = db.Column(db.Boolean, default=False)
     completion_percentage = db.Column(db.Integer, default=0)
     
+    @hybrid_property
+    def completion_score(self):
+        """Completion score computed from the current field values."""
+        return sum(points for field, points in COMPLETION_WEIGHTS.items() if getattr(self, field))
+    
+    @completion_score.expression
+    def completion_score(cls):
+        # Reason: same rule as the Python side, so filters and bulk updates agree with saved rows
+        return sum(case((cls._filled(field), points), else_=0) for field, points in COMPLETION_WEIGHTS.items())
+    
+    @classmethod
+    def _filled(cls, field):
+        """SQL test matching Python truthiness: not NULL, and not '' or an empty list."""
+        column = getattr(cls, field)
+        if isinstance(column.type, db.JSON):
+            return json_array_filled(column)
+        return and_(column.isnot(None), column != '')
+    
     def update_completion_percentage(self):
         """
-        Calculate and update the profile completion percentage.
+        Recalculate the stored completion percentage; the caller commits.
         
         Returns:
             int: The updated completion percentage
         """
-        # Define required fields for a complete profile
-        required_fields = ['phone', 'address', 'city', 'state', 'zip_code']
-        optional_fields = ['bio', 'needs']
-        
-        # Calculate percentage based on filled required fields
-        filled_required = sum(1 for field in required_fields if getattr(self, field))
-        filled_optional = sum(1 for field in optional_fields if getattr(self, field))
-        
-        # Weight required fields more heavily than optional fields
-        required_weight = 0.7
-        optional_weight = 0.3
-        
-        required_percentage = (filled_required / len(required_fields)) * required_weight * 100
-        optional_percentage = (filled_optional / len(optional_fields)) * optional_weight * 100
-        
-        total_percentage = int(required_percentage + optional_percentage)
+        self.completion_percentage = self.completion_score
+        self.is_complete = self.completion_percentage >= COMPLETE_THRESHOLD
+        return self.completion_percentage
+    
+    @classmethod
+    def recompute_completion(cls, chunk_size=1000):
+        """
+        Recalculate stored completion for all profiles in the database.
         
-        # Update fields
-        self.completion_percentage = total_percentage
-        self.is_complete = total_percentage >= 80  # Consider complete if 80% or more
+        Runs one set-based UPDATE per ``chunk_size`` range of IDs, committing
+        after each, so no rows are loaded and locks are held briefly.
         
-        # Save changes
-        db.session.commit()
+        Args:
+            chunk_size (int): Number of IDs per UPDATE
+            
+        Returns:
+            int: Number of profiles whose stored values changed
+        """
+        low, high = db.session.query(db.func.min(cls.id), db.func.max(cls.id)).one()
+        if low is None:
+            return 0
         
-        return self.completion_percentage
+        score = cls.completion_score
+        updated = 0
+        for start in range(low, high + 1, chunk_size):
+            result = db.session.execute(
+                db.update(cls)
+                .where(cls.id >= start, cls.id < start + chunk_size)
+                .where(db.or_(cls.completion_percentage.is_(None), cls.completion_percentage != score,
+                              cls.is_complete.is_(None), cls.is_complete != (score >= COMPLETE_THRESHOLD)))
+                .values(completion_percentage=score, is_complete=score >= COMPLETE_THRESHOLD)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            updated += result.rowcount
+        return updated
+
+# GIN index answering ``needs @> ...`` filters (PostgreSQL only; see resource.py)
+event.listen(
+    Profile.__table__, 'after_create',
+    DDL('CREATE INDEX IF NOT EXISTS ix_profiles_needs ON profiles USING gin (needs jsonb_path_ops)')
+    .execute_if(dialect='postgresql')
+)
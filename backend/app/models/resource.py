@@ -3,8 +3,11 @@ Resource model for storing information about available resources.
 """
 from app import db
 from app.models.base import Base
+from app.models.types import CodedEnum, JSONList
 from datetime import datetime
 from enum import Enum as PyEnum
+from sqlalchemy import DDL, event
+from app.services.notifications import send_resource_approved
 
 class ResourceCategory(PyEnum):
     """Enum for resource categories."""
@@ -26,18 +29,47 @@ class ResourceStatus(PyEnum):
     EXPIRED = 'expired'
     ARCHIVED = 'archived'
 
+# Stored codes for the enums above. Never renumber or reuse a code; new
+# members get the next free one.
+RESOURCE_CATEGORY = CodedEnum({
+    ResourceCategory.FOOD: 1,
+    ResourceCategory.HOUSING: 2,
+    ResourceCategory.HEALTHCARE: 3,
+    ResourceCategory.EMPLOYMENT: 4,
+    ResourceCategory.EDUCATION: 5,
+    ResourceCategory.TRANSPORTATION: 6,
+    ResourceCategory.FINANCIAL: 7,
+    ResourceCategory.LEGAL: 8,
+    ResourceCategory.OTHER: 9,
+})
+RESOURCE_STATUS = CodedEnum({
+    ResourceStatus.PENDING: 1,
+    ResourceStatus.APPROVED: 2,
+    ResourceStatus.REJECTED: 3,
+    ResourceStatus.EXPIRED: 4,
+    ResourceStatus.ARCHIVED: 5,
+})
+
 class Resource(Base):
     """Resource model for storing information about available resources."""
     
     __tablename__ = 'resources'
+    __table_args__ = (
+        # Public listings always filter on status, usually with a category
+        db.Index('ix_resources_status_category', 'status', 'category'),
+        # Provider dashboards: per-status counts and filtered pages are answered from this index
+        db.Index('ix_resources_provider_status_category', 'provider_id', 'status', 'category'),
+        db.CheckConstraint(RESOURCE_CATEGORY.check('category'), name='ck_resources_category'),
+        db.CheckConstraint(RESOURCE_STATUS.check('status'), name='ck_resources_status'),
+    )
     
     # Basic information
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
     
-    # Category and status
-    category = db.Column(db.String(50), nullable=False)
-    status = db.Column(db.String(20), default=ResourceStatus.PENDING.value, nullable=False)
+    # Category and status, stored as small integer codes
+    category = db.Column(RESOURCE_CATEGORY, nullable=False)
+    status = db.Column(RESOURCE_STATUS, default=ResourceStatus.PENDING.value, nullable=False)
     
     # Provider information
     provider_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -59,7 +91,7 @@ class Resource(Base):
     end_date = db.Column(db.Date, nullable=True)
     
     # Requirements and additional information
-    requirements = db.Column(db.Text, nullable=True)  # JSON-serialized list of requirements
+    requirements = db.Column(JSONList, nullable=True)  # list of requirement strings
     additional_info = db.Column(db.Text, nullable=True)
     
     # Approval information
@@ -82,6 +114,7 @@ class Resource(Base):
         self.approved_at = datetime.utcnow()
         self.approved_by_id = admin_id
         db.session.commit()
+        send_resource_approved(self)
         return self
     
     def reject(self, admin_id, reason):
@@ -138,3 +171,16 @@ class Resource(Base):
             return False
             
         return True
+
+# Trigram indexes backing fuzzy search (see app.services.fuzzy), and a GIN
+# index answering ``requirements @> ...`` filters. These are
+# PostgreSQL-specific, so they are emitted as DDL after the table is created
+# rather than declared as indexes that every dialect would try to build.
+for _statement in (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS ix_resources_title_trgm ON resources USING gin (title gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_resources_description_trgm ON resources USING gin (description gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_resources_city_trgm ON resources USING gin (city gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_resources_requirements ON resources USING gin (requirements jsonb_path_ops)',
+):
+    event.listen(Resource.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
@@ -0,0 +1,170 @@
+"""
+Token models: revoked JWTs, deleted users' tokens and password reset tokens.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from app import db
+from app.models.base import Base
+
+class RevokedToken(Base):
+    """A JWT that must no longer be accepted, identified by its ``jti`` claim."""
+    
+    __tablename__ = 'revoked_tokens'
+    __table_args__ = (
+        # Workers re-read recently created rows on every blocklist refresh
+        db.Index('ix_revoked_tokens_created_at', 'created_at'),
+    )
+    
+    jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    
+    # Rows can be purged once the token would have expired anyway
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    @classmethod
+    def revoke(cls, jwt_data):
+        """
+        Add a decoded token to the revocation table.
+        
+        Args:
+            jwt_data (dict): The decoded token
+            
+        Returns:
+            RevokedToken: The new (uncommitted) row
+        """
+        token = cls(
+            jti=jwt_data['jti'],
+            token_type=jwt_data['type'],
+            user_id=int(jwt_data['sub']),
+            expires_at=datetime.utcfromtimestamp(jwt_data['exp'])
+        )
+        db.session.add(token)
+        return token
+    
+    @classmethod
+    def purge_expired(cls):
+        """
+        Delete rows for tokens that have expired.
+        
+        Returns:
+            int: Number of rows deleted
+        """
+        deleted = cls.query.filter(cls.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+
+class UserDeletion(Base):
+    """
+    A deleted user, whose tokens issued before ``created_at`` must be rejected.
+    
+    Role checks read token claims instead of loading the user, so without
+    this record a deleted user's tokens would keep working until they expire.
+    """
+    
+    __tablename__ = 'user_deletions'
+    __table_args__ = (
+        # Workers read deletions made since their last refresh
+        db.Index('ix_user_deletions_created_at', 'created_at'),
+    )
+    
+    # Not a foreign key: the user row is gone
+    user_id = db.Column(db.Integer, nullable=False)
+    
+    # Rows can be purged once every token issued before the deletion has expired
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    @classmethod
+    def purge_expired(cls):
+        """
+        Delete records no longer needed to reject any unexpired token.
+        
+        Returns:
+            int: Number of rows deleted
+        """
+        deleted = cls.query.filter(cls.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+
+class PasswordResetToken(Base):
+    """
+    A single-use password reset token.
+    
+    Only the SHA-256 of the token is stored, so a leaked table cannot be used
+    to reset passwords; the token itself is high-entropy, so an unsalted hash
+    is enough and lookups are a unique index probe on the hash.
+    """
+    
+    __tablename__ = 'password_reset_tokens'
+    
+    token_hash = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    user = db.relationship('User')
+    
+    @staticmethod
+    def hash_token(token):
+        """
+        Hash a reset token for storage and lookup.
+        
+        Args:
+            token (str): The plaintext token
+            
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def issue(cls, user, lifetime=timedelta(hours=24)):
+        """
+        Create a reset token for a user, replacing any earlier ones.
+        
+        Args:
+            user (User): The user resetting their password
+            lifetime (timedelta): How long the token stays valid
+            
+        Returns:
+            str: The plaintext token to send to the user
+        """
+        token = secrets.token_urlsafe(32)
+        cls.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+        db.session.add(cls(
+            token_hash=cls.hash_token(token),
+            user_id=user.id,
+            expires_at=datetime.utcnow() + lifetime
+        ))
+        db.session.commit()
+        return token
+    
+    @classmethod
+    def find_valid(cls, token):
+        """
+        Look up an unexpired reset token.
+        
+        Args:
+            token (str): The plaintext token
+            
+        Returns:
+            PasswordResetToken: The matching row, or None
+        """
+        return cls.query.filter(
+            cls.token_hash == cls.hash_token(token),
+            cls.expires_at > datetime.utcnow()
+        ).first()
+    
+    @classmethod
+    def purge_expired(cls):
+        """
+        Delete expired reset tokens.
+        
+        Returns:
+            int: Number of rows deleted
+        """
+        deleted = cls.query.filter(cls.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
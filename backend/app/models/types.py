@@ -0,0 +1,127 @@
+"""
+Column types and SQL helpers shared by the models.
+"""
+from enum import Enum as PyEnum
+from sqlalchemy import exists, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+from app import db
+
+# Bound for values with no code, so filtering on them matches no rows
+UNKNOWN_CODE = -1
+
+
+class CodedEnum(TypeDecorator):
+    """
+    A string enum stored as a ``SMALLINT`` code.
+
+    Models and the API keep working with the enum's string values: they are
+    mapped to codes when bound into SQL (so ``Resource.status == 'approved'``
+    compares integers) and back to strings when rows are loaded. Codes are
+    part of the stored data, so existing ones must never be renumbered or
+    reused; give new members new codes.
+    """
+
+    impl = db.SmallInteger
+    cache_ok = True
+
+    def __init__(self, codes):
+        """
+        Args:
+            codes (dict): Enum member -> integer code (positive and unique)
+        """
+        super().__init__()
+        if len(set(codes.values())) != len(codes) or min(codes.values()) < 1:
+            raise ValueError('Enum codes must be unique positive integers')
+        # Reason: a hashable attribute named like the argument lets SQLAlchemy cache statements using the type
+        self.codes = tuple(sorted((member.value, code) for member, code in codes.items()))
+        self._by_value = dict(self.codes)
+        self._by_code = {code: value for value, code in self.codes}
+
+    def encode(self, value):
+        """
+        Get the stored code for a value.
+
+        Args:
+            value (str or Enum): The enum value or member
+
+        Returns:
+            int: The code, or ``UNKNOWN_CODE`` for values outside the enum
+        """
+        if isinstance(value, PyEnum):
+            value = value.value
+        return self._by_value.get(value, UNKNOWN_CODE)
+
+    def decode(self, code):
+        """
+        Get the value for a stored code.
+
+        Args:
+            code (int): The stored code
+
+        Returns:
+            str: The enum value
+        """
+        return self._by_code[code]
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else self.encode(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.decode(value)
+
+    def check(self, column_name):
+        """
+        SQL condition restricting a column to known codes, for a ``CheckConstraint``.
+
+        Args:
+            column_name (str): The column name
+
+        Returns:
+            str: The condition
+        """
+        return f"{column_name} IN ({', '.join(str(code) for _, code in self.codes)})"
+
+
+# A JSON list of strings: JSONB on PostgreSQL (so it can be GIN-indexed), the
+# dialect's JSON type elsewhere. Python None is stored as SQL NULL, not JSON null.
+JSONList = db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), 'postgresql')
+
+
+def json_array_contains(column, values, dialect=None):
+    """
+    Build a filter matching rows whose JSON list contains every value.
+
+    On PostgreSQL this is ``column @> '[...]'``, which a GIN index on the
+    column answers. Other dialects test membership with ``json_each``.
+
+    Args:
+        column: A ``JSONList`` column
+        values (list): Strings that must all be present
+        dialect (str): Dialect name; defaults to that of the session's engine
+
+    Returns:
+        ColumnElement: The filter expression
+    """
+    dialect = dialect or db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return column.op('@>')(func.jsonb_build_array(*values))
+    clauses = []
+    for value in values:
+        elements = func.json_each(column).table_valued('value')
+        clauses.append(exists(select(1).select_from(elements).where(elements.c.value == value)))
+    return db.and_(*clauses)
+
+
+def json_array_filled(column):
+    """
+    Build an expression that is true when a JSON list is present and non-empty.
+
+    Args:
+        column: A ``JSONList`` column
+
+    Returns:
+        ColumnElement: The expression
+    """
+    # Reason: JSON columns cannot be compared to '' as text columns are; '[]' is the empty list on every dialect
+    return db.and_(column.isnot(None), db.cast(column, db.Text) != '[]')
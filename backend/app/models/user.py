@@ -3,9 +3,31 @@ User model for authentication and authorization.
 """
 from app import db, bcrypt
 from app.models.base import Base
+from app.models.types import CodedEnum
+from sqlalchemy import event
 from sqlalchemy.ext.hybrid import hybrid_property
-from datetime import datetime
+from sqlalchemy.orm.attributes import NO_VALUE
+import calendar
+from datetime import datetime, timedelta
 from enum import Enum as PyEnum
+from flask import current_app, has_app_context
+
+# Session info flag set when a user's token claims change (see app.auth.revocation)
+CLAIMS_CHANGED_SESSION_KEY = 'user_claims_changed'
+
+def claims_version(changed_at):
+    """
+    Version number of a user's token claims.
+    
+    Args:
+        changed_at (datetime): The user's claims_changed_at value
+        
+    Returns:
+        int: The change time in epoch milliseconds, or 0 if never changed
+    """
+    if changed_at is None:
+        return 0
+    return calendar.timegm(changed_at.utctimetuple()) * 1000 + changed_at.microsecond // 1000
 
 class UserRole(PyEnum):
     """Enum for user roles."""
@@ -19,10 +41,27 @@ class UserStatus(PyEnum):
     INACTIVE = 'inactive'
     SUSPENDED = 'suspended'
 
+# Stored codes for the enums above. Never renumber or reuse a code; new
+# members get the next free one.
+USER_ROLE = CodedEnum({
+    UserRole.USER: 1,
+    UserRole.PROVIDER: 2,
+    UserRole.ADMIN: 3,
+})
+USER_STATUS = CodedEnum({
+    UserStatus.ACTIVE: 1,
+    UserStatus.INACTIVE: 2,
+    UserStatus.SUSPENDED: 3,
+})
+
 class User(Base):
     """User model for authentication and authorization."""
     
     __tablename__ = 'users'
+    __table_args__ = (
+        db.CheckConstraint(USER_ROLE.check('role'), name='ck_users_role'),
+        db.CheckConstraint(USER_STATUS.check('status'), name='ck_users_status'),
+    )
     
     # Authentication fields
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
@@ -31,22 +70,21 @@ class User(Base):
     # User information
     name = db.Column(db.String(100), nullable=False)
     
-    # Role and status
-    role = db.Column(db.String(20), default=UserRole.USER.value, nullable=False)
-    status = db.Column(db.String(20), default=UserStatus.ACTIVE.value, nullable=False)
+    # Role and status, stored as small integer codes
+    role = db.Column(USER_ROLE, default=UserRole.USER.value, nullable=False)
+    status = db.Column(USER_STATUS, default=UserStatus.ACTIVE.value, nullable=False)
     
     # Account management
     email_verified = db.Column(db.Boolean, default=False)
     email_verified_at = db.Column(db.DateTime, nullable=True)
     last_login_at = db.Column(db.DateTime, nullable=True)
     
-    # Reset password
-    reset_token = db.Column(db.String(100), nullable=True)
-    reset_token_expires_at = db.Column(db.DateTime, nullable=True)
+    # Tokens issued before this time carry stale role/status claims
+    claims_changed_at = db.Column(db.DateTime, nullable=True, index=True)
     
     # Relationships
     profile = db.relationship('Profile', backref='user', uselist=False, cascade='all, delete-orphan')
-    resources = db.relationship('Resource', backref='provider', lazy='dynamic', 
+    resources = db.relationship('Resource', backref='provider',
                                cascade='all, delete-orphan',
                                foreign_keys='Resource.provider_id')
     
@@ -70,28 +108,9 @@ class User(Base):
         db.session.commit()
     
     def generate_reset_token(self):
-        """Generate a password reset token."""
-        import secrets
-        from datetime import timedelta
-        
-        self.reset_token = secrets.token_urlsafe(32)
-        self.reset_token_expires_at = datetime.utcnow() + timedelta(hours=24)
-        db.session.commit()
-        return self.reset_token
-    
-    def verify_reset_token(self, token):
-        """Verify if the reset token is valid."""
-        if (self.reset_token != token or 
-            self.reset_token_expires_at is None or 
-            datetime.utcnow() > self.reset_token_expires_at):
-            return False
-        return True
-    
-    def clear_reset_token(self):
-        """Clear the reset token after use."""
-        self.reset_token = None
-        self.reset_token_expires_at = None
-        db.session.commit()
+        """Generate a password reset token (stored hashed in password_reset_tokens)."""
+        from app.models.token import PasswordResetToken
+        return PasswordResetToken.issue(self)
     
     def verify_email(self):
         """Mark email as verified."""
@@ -111,13 +130,39 @@ class User(Base):
         """Check if user account is active."""
         return self.status == UserStatus.ACTIVE.value
     
+    def token_claims(self):
+        """Claims embedded in access tokens so role checks need no database lookup."""
+        return {'role': self.role, 'status': self.status, 'cv': claims_version(self.claims_changed_at)}
+    
     def to_dict(self):
         """Convert user to dictionary without sensitive information."""
         user_dict = super().to_dict()
         # Remove sensitive fields
         user_dict.pop('_password', None)
-        user_dict.pop('reset_token', None)
-        user_dict.pop('reset_token_expires_at', None)
         # Rename _password to password in the dictionary
         user_dict['password'] = '********'
         return user_dict
+
+@event.listens_for(User.role, 'set', active_history=True)
+@event.listens_for(User.status, 'set', active_history=True)
+def _revoke_stale_claims(user, value, oldvalue, initiator):
+    """Revoke existing tokens when a saved user's role or status changes."""
+    if oldvalue is NO_VALUE or oldvalue is None or oldvalue == value or user.id is None:
+        return
+    user.claims_changed_at = datetime.utcnow()
+    db.session.info[CLAIMS_CHANGED_SESSION_KEY] = True
+
+@event.listens_for(User, 'after_delete')
+def _revoke_deleted_user_tokens(mapper, connection, user):
+    """Record a deleted user so that every worker rejects their outstanding tokens."""
+    from app.models.token import UserDeletion
+
+    now = datetime.utcnow()
+    lifetime = current_app.config['JWT_REFRESH_TOKEN_EXPIRES'] if has_app_context() else timedelta(days=30)
+    if not isinstance(lifetime, timedelta):
+        lifetime = timedelta(seconds=lifetime)
+    # Reason: rows cannot be added to the session mid-flush, so insert on the flush's connection
+    connection.execute(UserDeletion.__table__.insert().values(
+        user_id=user.id, expires_at=now + lifetime, created_at=now, updated_at=now
+    ))
+    db.session.info[CLAIMS_CHANGED_SESSION_KEY] = True
@@ -1,20 +1,35 @@
 """
 Schemas package for the PovertyLine application.
+
+Building the pydantic models (and importing ``email_validator``) is the
+slowest part of creating the app, and CLI commands never need them. The
+schema modules are therefore imported on first attribute access, e.g.
+``schemas.UserResponse`` inside a view, not when the app starts.
 """
-from app.schemas.user import (
-    UserBase, UserCreate, UserUpdate, UserResponse, 
-    UserPasswordUpdate, UserPasswordReset
-)
-from app.schemas.profile import ProfileBase, ProfileCreate, ProfileUpdate, ProfileResponse
-from app.schemas.resource import (
-    ResourceBase, ResourceCreate, ResourceUpdate, ResourceResponse, 
-    ResourceApproval
-)
+import importlib
+
+_MODULES = {
+    'UserBase': 'user', 'UserCreate': 'user', 'UserUpdate': 'user', 'UserResponse': 'user',
+    'UserPasswordUpdate': 'user', 'UserPasswordReset': 'user',
+    'ProfileBase': 'profile', 'ProfileCreate': 'profile', 'ProfileUpdate': 'profile',
+    'ProfileResponse': 'profile',
+    'ResourceBase': 'resource', 'ResourceCreate': 'resource', 'ResourceUpdate': 'resource',
+    'ResourceResponse': 'resource', 'ResourceApproval': 'resource',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{_MODULES[name]}'), name)
+    # Later lookups find the class directly, without this hook
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    'UserBase', 'UserCreate', 'UserUpdate', 'UserResponse',
-    'UserPasswordUpdate', 'UserPasswordReset',
-    'ProfileBase', 'ProfileCreate', 'ProfileUpdate', 'ProfileResponse',
-    'ResourceBase', 'ResourceCreate', 'ResourceUpdate', 'ResourceResponse',
-    'ResourceApproval'
-]
+def load_all():
+    """Import every schema now, e.g. in a preloading server before it forks workers."""
+    for name in _MODULES:
+        __getattr__(name)
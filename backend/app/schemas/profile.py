@@ -1,10 +1,9 @@
 """
 Profile schemas for data validation.
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from app.schemas.base import BaseSchema
-import json
 
 class ProfileBase(BaseModel):
     """Base schema for profile data."""
@@ -16,16 +15,6 @@ class ProfileBase(BaseModel):
     state: Optional[str] = Field(None, max_length=100)
     zip_code: Optional[str] = Field(None, max_length=20)
     needs: Optional[List[str]] = None
-    
-    @validator('needs', pre=True)
-    def parse_needs(cls, v):
-        """Parse needs from JSON string if needed."""
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                raise ValueError('Invalid JSON for needs')
-        return v
 
 class ProfileCreate(ProfileBase):
     """Schema for creating a new profile."""
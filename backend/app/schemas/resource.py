@@ -6,7 +6,6 @@ from typing import Optional, List, Dict, Any
 from datetime import date, datetime
 from app.schemas.base import BaseSchema
 from app.models.resource import ResourceCategory, ResourceStatus
-import json
 
 class ResourceBase(BaseModel):
     """Base schema for resource data."""
@@ -40,16 +39,6 @@ class ResourceBase(BaseModel):
         if v and 'start_date' in values and values['start_date'] and v < values['start_date']:
             raise ValueError('End date must be after start date')
         return v
-        
-    @validator('requirements', pre=True)
-    def parse_requirements(cls, v):
-        """Parse requirements from JSON string if needed."""
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                raise ValueError('Invalid JSON for requirements')
-        return v
 
 class ResourceCreate(ResourceBase):
     """Schema for creating a new resource."""
@@ -88,16 +77,6 @@ class ResourceUpdate(BaseModel):
         if v and 'start_date' in values and values['start_date'] and v < values['start_date']:
             raise ValueError('End date must be after start date')
         return v
-        
-    @validator('requirements', pre=True)
-    def parse_requirements(cls, v):
-        """Parse requirements from JSON string if needed."""
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                raise ValueError('Invalid JSON for requirements')
-        return v
 
 class ResourceApproval(BaseModel):
     """Schema for approving or rejecting a resource."""
@@ -0,0 +1,6 @@
+"""
+Services package for the PovertyLine application.
+
+Services hold in-process state (indexes, queues, caches) that the API
+layer reads from, kept separate from the request handlers themselves.
+"""
@@ -0,0 +1,49 @@
+"""
+Records resource changes in ``resource_change_log`` for delta sync.
+
+A session hook appends one log row per resource created, modified or
+deleted by each flush, inside the same transaction, so the log commits or
+rolls back together with the change it describes.
+
+Log IDs are handed out at insert time. With several concurrent writers on
+PostgreSQL a transaction can commit after a later-numbered one, so the
+changes endpoint holds back entries younger than ``SYNC_SETTLE_SECONDS``
+before advancing a client's token past them.
+"""
+from sqlalchemy import event
+from app import db
+
+_listening = False
+
+
+def _after_flush(session, flush_context):
+    """Append log rows for the resources written by this flush."""
+    from app.models.change_log import ResourceChangeLog
+    from app.models.resource import Resource
+
+    rows = []
+    for resource in session.new:
+        if isinstance(resource, Resource):
+            rows.append({'resource_id': resource.id, 'op': 'created'})
+    for resource in session.dirty:
+        if isinstance(resource, Resource) and session.is_modified(resource, include_collections=False):
+            rows.append({'resource_id': resource.id, 'op': 'updated'})
+    for resource in session.deleted:
+        if isinstance(resource, Resource):
+            rows.append({'resource_id': resource.id, 'op': 'deleted'})
+    if rows:
+        session.connection().execute(ResourceChangeLog.__table__.insert(), rows)
+
+
+def init_app(app):
+    """
+    Install the session hook that writes the change log.
+
+    Args:
+        app: The Flask application
+    """
+    global _listening
+    if _listening:
+        return
+    event.listen(db.session, 'after_flush', _after_flush)
+    _listening = True
@@ -0,0 +1,74 @@
+"""
+Facet counts for resource search results.
+
+Filter sidebars show how many results fall under each category, city and
+state. All requested facets are computed by one statement: a UNION ALL of
+per-field GROUP BY queries over the already filtered result set.
+"""
+from sqlalchemy import cast, literal, func, union_all
+from app import db
+from app.models.resource import Resource
+from app.models.types import CodedEnum
+
+FACET_FIELDS = ('category', 'city', 'state')
+
+
+def parse_facets(value):
+    """
+    Parse the ``facets`` query parameter.
+
+    Args:
+        value (str): Comma-separated field names, or 'true'/'all' for every field
+
+    Returns:
+        list: The requested facet field names (empty if none were requested)
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not value:
+        return []
+    if value.lower() in ('true', 'all', '1'):
+        return list(FACET_FIELDS)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in FACET_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown facet: {', '.join(unknown)}. Must be one of {list(FACET_FIELDS)}")
+    return list(dict.fromkeys(fields))
+
+
+def facet_counts(query, fields):
+    """
+    Count the rows of a filtered resource query per value of each field.
+
+    Args:
+        query: A filtered ``Resource`` query
+        fields (list): Facet field names from ``FACET_FIELDS``
+
+    Returns:
+        dict: Field name -> list of {'value', 'count'} dicts, most common first
+    """
+    if not fields:
+        return {}
+
+    filtered = query.with_entities(*(getattr(Resource, field) for field in fields)) \
+        .order_by(None).subquery('filtered')
+    statement = union_all(*(
+        db.select(
+            literal(field).label('field'),
+            # Reason: union columns need one type; coded enums are decoded below
+            cast(filtered.c[field], db.String).label('value'),
+            func.count().label('count')
+        ).where(filtered.c[field].isnot(None)).group_by(filtered.c[field])
+        for field in fields
+    ))
+
+    facets = {field: [] for field in fields}
+    for field, value, count in db.session.execute(statement):
+        column_type = Resource.__table__.c[field].type
+        if isinstance(column_type, CodedEnum):
+            value = column_type.decode(int(value))
+        facets[field].append({'value': value, 'count': count})
+    for values in facets.values():
+        values.sort(key=lambda item: (-item['count'], item['value']))
+    return facets
@@ -0,0 +1,286 @@
+"""
+Typo-tolerant resource search.
+
+On PostgreSQL, matching uses the ``pg_trgm`` similarity operators, which are
+served by the GIN trigram indexes created alongside the ``resources`` table.
+Both paths match the same fields: title, description, category and city.
+Other databases (SQLite in development and small deployments) fall back to
+an in-process trigram index over approved resources that mirrors
+``pg_trgm``'s similarity measure, kept current from ``resources_committed``
+notifications in the same way as the suggestion index.
+
+Fuzzy matching is only used when the exact ``ilike`` search finds nothing,
+so ordinary queries pay nothing for it.
+"""
+import threading
+from collections import defaultdict
+from flask import current_app
+from app import db
+from app.models.resource import Resource, ResourceCategory, ResourceStatus
+from app.services.resource_events import resources_committed
+from app.utils.text import tokenize
+
+# Upper bound on ids handed back to the database from the in-process index
+MAX_FUZZY_RESULTS = 200
+
+_INDEXED_FIELDS = ('title', 'description', 'category', 'city')
+
+
+def trigrams(word):
+    """
+    Return the trigram set of a word, padded the way ``pg_trgm`` pads it.
+
+    Args:
+        word (str): A normalized word
+
+    Returns:
+        set: The word's trigrams
+    """
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(left, right):
+    """
+    Jaccard similarity of two trigram sets, as computed by ``pg_trgm``.
+
+    Args:
+        left (set): Trigrams of the first word
+        right (set): Trigrams of the second word
+
+    Returns:
+        float: Similarity between 0 and 1
+    """
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared) if shared else 0.0
+
+
+class TrigramIndex:
+    """In-process trigram index over the words of approved resources."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._word_trigrams = {}                 # word -> trigram set
+        self._trigram_words = defaultdict(set)   # trigram -> words containing it
+        self._word_resources = defaultdict(set)  # word -> resource ids
+        self._by_resource = {}                   # resource id -> words
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._by_resource)
+
+    def add(self, resource_id, values):
+        """
+        Index (or re-index) a single approved resource.
+
+        Args:
+            resource_id (int): The resource ID
+            values (dict): Mapping containing the indexed text fields
+        """
+        with self._lock:
+            self.remove(resource_id)
+            words = set()
+            for field in _INDEXED_FIELDS:
+                words.update(tokenize(values.get(field)))
+            for word in words:
+                if word not in self._word_trigrams:
+                    grams = trigrams(word)
+                    self._word_trigrams[word] = grams
+                    for gram in grams:
+                        self._trigram_words[gram].add(word)
+                self._word_resources[word].add(resource_id)
+            self._by_resource[resource_id] = words
+
+    def remove(self, resource_id):
+        """
+        Drop a resource from the index.
+
+        Args:
+            resource_id (int): The resource ID
+        """
+        with self._lock:
+            for word in self._by_resource.pop(resource_id, ()):
+                resources = self._word_resources[word]
+                resources.discard(resource_id)
+                if resources:
+                    continue
+                del self._word_resources[word]
+                for gram in self._word_trigrams.pop(word):
+                    self._trigram_words[gram].discard(word)
+                    if not self._trigram_words[gram]:
+                        del self._trigram_words[gram]
+
+    def load(self, rows):
+        """
+        Replace the index contents.
+
+        Args:
+            rows: Iterable of (id, title, description, category, city) tuples
+        """
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self.add(row[0], dict(zip(_INDEXED_FIELDS, row[1:])))
+            self.loaded = True
+
+    def apply(self, changes):
+        """
+        Apply committed resource changes.
+
+        Args:
+            changes (list): ResourceChange records from ``resources_committed``
+        """
+        with self._lock:
+            for change in changes:
+                if change.op != 'deleted' and change.values.get('status') == ResourceStatus.APPROVED.value:
+                    self.add(change.id, change.values)
+                else:
+                    self.remove(change.id)
+
+    def search(self, text, threshold):
+        """
+        Score resources against a possibly misspelled query.
+
+        Each query word is matched to its most similar word in a resource;
+        the resource's score is the mean of those similarities.
+
+        Args:
+            text (str): The search text
+            threshold (float): Minimum score for a resource to match
+
+        Returns:
+            dict: Resource ID -> score for the best matches, at most MAX_FUZZY_RESULTS
+        """
+        words = list(dict.fromkeys(tokenize(text)))
+        if not words:
+            return {}
+
+        totals = defaultdict(float)
+        with self._lock:
+            for word in words:
+                grams = trigrams(word)
+                candidates = set()
+                for gram in grams:
+                    candidates.update(self._trigram_words.get(gram, ()))
+                best = {}
+                for candidate in candidates:
+                    score = similarity(grams, self._word_trigrams[candidate])
+                    if score < threshold:
+                        continue
+                    for resource_id in self._word_resources[candidate]:
+                        if score > best.get(resource_id, 0.0):
+                            best[resource_id] = score
+                for resource_id, score in best.items():
+                    totals[resource_id] += score
+
+        scores = {resource_id: total / len(words) for resource_id, total in totals.items()}
+        ranked = sorted(
+            (item for item in scores.items() if item[1] >= threshold),
+            key=lambda item: (-item[1], item[0])
+        )
+        return dict(ranked[:MAX_FUZZY_RESULTS])
+
+
+def get_trigram_index():
+    """
+    Return the current app's trigram index, building it on first use.
+
+    Returns:
+        TrigramIndex: The populated index
+    """
+    index = current_app.extensions['trigram_index']
+    if not index.loaded:
+        with index._lock:
+            if not index.loaded:
+                rows = db.session.query(
+                    Resource.id, Resource.title, Resource.description,
+                    Resource.category, Resource.city
+                ).filter(Resource.status == ResourceStatus.APPROVED.value)
+                index.load(rows)
+    return index
+
+
+def _category_scores(text, threshold):
+    """
+    Score category names against the search text the way the in-process index does.
+
+    Args:
+        text (str): The search text
+        threshold (float): Minimum score for a category to match
+
+    Returns:
+        dict: Category value -> score for matching categories
+    """
+    words = [trigrams(word) for word in dict.fromkeys(tokenize(text))]
+    scores = {}
+    for category in ResourceCategory:
+        name = trigrams(category.value)
+        score = sum(similarity(word, name) for word in words) / len(words) if words else 0.0
+        if score >= threshold:
+            scores[category.value] = score
+    return scores
+
+
+def fuzzy_filter(query, text, threshold=None):
+    """
+    Restrict a resource query to fuzzy matches of the search text.
+
+    Args:
+        query: A filtered ``Resource`` query (without a text search)
+        text (str): The search text
+        threshold (float): Minimum similarity; defaults to SEARCH_FUZZY_THRESHOLD
+
+    Returns:
+        tuple: (query, scores) where scores maps resource IDs to similarity for
+        results ranked in Python, or is None when the query is already ordered
+    """
+    if threshold is None:
+        threshold = current_app.config['SEARCH_FUZZY_THRESHOLD']
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # Reason: the % and <% operators only use the GIN index with the threshold set per transaction
+        db.session.execute(db.select(
+            db.func.set_config('pg_trgm.similarity_threshold', str(threshold), True),
+            db.func.set_config('pg_trgm.word_similarity_threshold', str(threshold), True)
+        ))
+        term = db.literal(text)
+        # Reason: categories are stored as codes, so their names are matched here rather than in SQL
+        categories = _category_scores(text, threshold)
+        score = db.func.greatest(
+            db.func.similarity(Resource.title, term),
+            db.func.word_similarity(term, Resource.description),
+            db.func.coalesce(db.func.word_similarity(term, Resource.city), 0.0),
+            db.case(*((Resource.category == name, value) for name, value in categories.items()), else_=0.0)
+            if categories else db.literal(0.0)
+        )
+        query = query.filter(db.or_(
+            Resource.title.op('%')(term),
+            term.op('<%')(Resource.description),
+            term.op('<%')(Resource.city),
+            Resource.category.in_(list(categories))
+        )).order_by(score.desc())
+        return query, None
+
+    scores = get_trigram_index().search(text, threshold)
+    return query.filter(Resource.id.in_(list(scores))), scores
+
+
+def _on_resources_committed(app, changes):
+    """Keep a loaded index in step with committed resource changes."""
+    index = app.extensions.get('trigram_index')
+    if index is not None and index.loaded:
+        index.apply(changes)
+
+
+def init_app(app):
+    """
+    Attach an empty trigram index to the app.
+
+    Args:
+        app: The Flask application
+    """
+    app.extensions['trigram_index'] = TrigramIndex()
+    resources_committed.connect(_on_resources_committed, sender=app)
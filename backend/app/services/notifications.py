@@ -0,0 +1,357 @@
+"""
+Outbound notification queue.
+
+Request handlers must not wait on mail delivery, so notifications are
+queued in memory and delivered by a small pool of background threads.
+Each worker takes up to ``NOTIFICATIONS_BATCH_SIZE`` queued messages and
+hands them to the transport together, so an SMTP connection is opened once
+per batch rather than once per message. Messages that fail to send are
+retried with exponential backoff, up to ``NOTIFICATIONS_MAX_RETRIES`` times,
+and then dropped with an error log.
+
+Transports (``NOTIFICATIONS_TRANSPORT``):
+
+- ``smtp``: deliver through ``MAIL_SERVER``
+- ``file``: write each message as an ``.eml`` file to
+  ``NOTIFICATIONS_OUTBOX_DIR`` (development and tests)
+
+Worker threads start on first use in each process, so a server that forks
+workers after loading the app does not lose them in the children. The
+queue is in memory: messages still queued when a process exits are
+delivered by an exit hook if possible, and lost otherwise.
+"""
+import atexit
+import heapq
+import logging
+import os
+import queue
+import random
+import smtplib
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class Notification:
+    """
+    An outbound message.
+
+    Attributes:
+        to (str): Recipient email address
+        subject (str): Subject line
+        body (str): Plain text body
+        attempts (int): Failed delivery attempts so far
+    """
+
+    __slots__ = ('to', 'subject', 'body', 'attempts')
+
+    def __init__(self, to, subject, body):
+        self.to = to
+        self.subject = subject
+        self.body = body
+        self.attempts = 0
+
+    def to_email(self, sender):
+        """
+        Build the MIME message.
+
+        Args:
+            sender (str): From address
+
+        Returns:
+            EmailMessage: The message
+        """
+        message = EmailMessage()
+        message['From'] = sender
+        message['To'] = self.to
+        message['Subject'] = self.subject
+        message['Date'] = formatdate(localtime=False)
+        message['Message-ID'] = make_msgid()
+        message.set_content(self.body)
+        return message
+
+    def __repr__(self):
+        return f'<Notification {self.subject!r} to {self.to}>'
+
+
+class SMTPTransport:
+    """Deliver a batch of messages over one SMTP connection."""
+
+    def __init__(self, host, port, sender, username=None, password=None, use_tls=True, timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send(self, notifications):
+        """
+        Send messages.
+
+        Args:
+            notifications (list): Notifications to send
+
+        Returns:
+            list: Notifications that failed and should be retried
+
+        Raises:
+            smtplib.SMTPException, OSError: If the connection fails (retry the whole batch)
+        """
+        failed = []
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for notification in notifications:
+                try:
+                    smtp.send_message(notification.to_email(self.sender))
+                except smtplib.SMTPRecipientsRefused:
+                    # Reason: a refused address will not start working on retry
+                    logger.error(f"Notification recipient refused: {notification.to}")
+                except (smtplib.SMTPDataError, smtplib.SMTPSenderRefused):
+                    failed.append(notification)
+        return failed
+
+
+class FileTransport:
+    """Write messages as ``.eml`` files to a directory."""
+
+    def __init__(self, directory, sender):
+        self.directory = directory
+        self.sender = sender
+
+    def send(self, notifications):
+        """
+        Write messages to the outbox directory.
+
+        Args:
+            notifications (list): Notifications to write
+
+        Returns:
+            list: Always empty; write errors raise and retry the batch
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for notification in notifications:
+            path = os.path.join(self.directory, f'{time.time_ns()}-{uuid.uuid4().hex[:8]}.eml')
+            with open(path, 'wb') as handle:
+                handle.write(bytes(notification.to_email(self.sender)))
+        return []
+
+
+class NotificationQueue:
+    """In-memory queue drained by a pool of worker threads."""
+
+    def __init__(self, transport, workers=2, batch_size=20, max_retries=5, retry_backoff=2.0,
+                 shutdown_timeout=5):
+        self.transport = transport
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self._queue = queue.Queue()
+        self._retries = []                  # heap of (due time, sequence, notification)
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._outstanding = 0               # queued + in flight + awaiting retry
+        self._pid = None
+        self._threads = []
+
+    def _start(self):
+        # Reason: threads do not survive fork, so (re)start them in each process on first use
+        with self._condition:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._work, name=f'notifications-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            self._threads.append(threading.Thread(target=self._schedule_retries, name='notifications-retry', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        # Reason: give queued mail a short chance to go out when the process exits
+        atexit.register(self.flush, self.shutdown_timeout)
+
+    def enqueue(self, notification):
+        """
+        Queue a notification for delivery.
+
+        Args:
+            notification (Notification): The message
+        """
+        if self._pid != os.getpid():
+            self._start()
+        with self._condition:
+            self._outstanding += 1
+        self._queue.put(notification)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                failed = self.transport.send(batch)
+            except Exception as e:
+                logger.warning(f"Notification batch of {len(batch)} failed: {str(e)}")
+                failed = batch
+            failed_ids = {id(notification) for notification in failed}
+            for notification in batch:
+                if id(notification) in failed_ids:
+                    self._retry(notification)
+                else:
+                    self._done()
+
+    def _retry(self, notification):
+        notification.attempts += 1
+        if notification.attempts > self.max_retries:
+            logger.error(f"Dropping {notification!r} after {self.max_retries} retries")
+            self._done()
+            return
+        # Full jitter so a failing server is not hit by every retry at once
+        delay = random.uniform(0, self.retry_backoff * 2 ** (notification.attempts - 1))
+        with self._condition:
+            self._sequence += 1
+            heapq.heappush(self._retries, (time.monotonic() + delay, self._sequence, notification))
+            self._condition.notify_all()
+
+    def _schedule_retries(self):
+        while True:
+            with self._condition:
+                while not self._retries or self._retries[0][0] > time.monotonic():
+                    timeout = self._retries[0][0] - time.monotonic() if self._retries else None
+                    self._condition.wait(timeout)
+                _, _, notification = heapq.heappop(self._retries)
+            self._queue.put(notification)
+
+    def _done(self):
+        with self._condition:
+            self._outstanding -= 1
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued notification is delivered or dropped.
+
+        Args:
+            timeout (float): Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if the queue drained in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+
+def create_transport(app):
+    """
+    Create the configured transport.
+
+    Args:
+        app: The Flask application
+
+    Returns:
+        SMTPTransport or FileTransport: The transport
+    """
+    config = app.config
+    name = config['NOTIFICATIONS_TRANSPORT']
+    if name == 'smtp':
+        return SMTPTransport(
+            config['MAIL_SERVER'], config['MAIL_PORT'], config['MAIL_DEFAULT_SENDER'],
+            username=config['MAIL_USERNAME'], password=config['MAIL_PASSWORD'],
+            use_tls=config['MAIL_USE_TLS']
+        )
+    if name == 'file':
+        directory = config['NOTIFICATIONS_OUTBOX_DIR'] or os.path.join(app.instance_path, 'outbox')
+        if not (app.debug or app.testing):
+            logger.warning(f"NOTIFICATIONS_TRANSPORT is 'file': email is written to {directory}, not sent")
+        return FileTransport(directory, config['MAIL_DEFAULT_SENDER'])
+    raise ValueError(f"Unknown notification transport: {name!r}")
+
+
+def notify(to, subject, body):
+    """
+    Queue a plain text notification for background delivery.
+
+    Args:
+        to (str): Recipient email address
+        subject (str): Subject line
+        body (str): Message body
+    """
+    current_app.extensions['notifications'].enqueue(Notification(to, subject, body))
+
+
+def send_password_reset(user, reset_link):
+    """
+    Queue a password reset email.
+
+    Args:
+        user (User): The user who requested the reset
+        reset_link (str): URL containing the reset token
+    """
+    notify(
+        user.email,
+        'Reset your PovertyLine password',
+        f"Hello {user.name},\n\n"
+        f"Use the link below to choose a new password. It expires in 24 hours.\n\n"
+        f"{reset_link}\n\n"
+        f"If you did not request a password reset, you can ignore this email.\n"
+    )
+
+
+def send_resource_approved(resource):
+    """
+    Queue a notification telling a provider their resource was approved.
+
+    Args:
+        resource (Resource): The approved resource
+    """
+    provider = resource.provider
+    if provider is None:
+        return
+    notify(
+        provider.email,
+        f'Your resource "{resource.title}" has been approved',
+        f"Hello {provider.name},\n\n"
+        f'Your resource "{resource.title}" has been approved and is now visible to the public.\n'
+    )
+
+
+def init_app(app):
+    """
+    Create the notification queue for the app.
+
+    Args:
+        app: The Flask application
+    """
+    notifications = NotificationQueue(
+        create_transport(app),
+        workers=app.config['NOTIFICATIONS_WORKERS'],
+        batch_size=app.config['NOTIFICATIONS_BATCH_SIZE'],
+        max_retries=app.config['NOTIFICATIONS_MAX_RETRIES'],
+        retry_backoff=app.config['NOTIFICATIONS_RETRY_BACKOFF'],
+        shutdown_timeout=app.config['NOTIFICATIONS_SHUTDOWN_TIMEOUT']
+    )
+    app.extensions['notifications'] = notifications
@@ -0,0 +1,237 @@
+"""
+Synonym and translation expansion for resource search queries.
+
+Searchers describe needs in their own words ("rent help", "comida",
+"clinic") while providers use service names ("housing assistance",
+"food pantry", "healthcare"). Before a search reaches the database, known
+phrases are rewritten into category filters, which use the indexed
+``category`` column, and known words also match their canonical keyword:
+"daycare" finds resources mentioning either "daycare" or "childcare".
+
+The dictionary is a JSON file (``SEARCH_SYNONYMS_PATH``) with two sections:
+
+- ``categories``: category value -> phrases that mean that category
+- ``terms``: canonical keyword -> words or phrases that also match it.
+  Keywords are matched as substrings, so they must be at least
+  ``MIN_KEYWORD_LENGTH`` characters long
+
+It is compiled into a phrase lookup table at startup and recompiled
+when the file's modification time changes, checked at most once every
+``SEARCH_SYNONYMS_RELOAD_INTERVAL`` seconds.
+"""
+import json
+import os
+import threading
+import time
+from flask import current_app
+from app.models.resource import ResourceCategory
+from app.utils.text import tokenize
+
+# Shorter keywords would match inside unrelated words ("id" in "aid" or "kids")
+MIN_KEYWORD_LENGTH = 3
+
+
+class QueryExpansion:
+    """
+    The result of expanding a search query.
+
+    Attributes:
+        categories (list): Category values the query refers to
+        text (str): Remaining free text, the searcher's own words
+        segments (list): Tuples of alternatives that together make up ``text``;
+            runs of plain words form one single-element tuple, a synonym is
+            ``(words, canonical keyword)``
+        changed (bool): Whether the dictionary matched anything
+    """
+
+    __slots__ = ('categories', 'text', 'segments', 'changed')
+
+    def __init__(self, categories, text, changed, segments=None):
+        self.categories = categories
+        self.text = text
+        self.segments = segments if segments is not None else ([(text,)] if text else [])
+        self.changed = changed
+
+    @property
+    def terms(self):
+        """Searched words that also match a canonical keyword, as {words: keyword}."""
+        return {segment[0]: segment[1] for segment in self.segments if len(segment) > 1}
+
+    def to_dict(self):
+        """Convert the expansion to a dictionary for API responses."""
+        response = {'categories': self.categories, 'search': self.text}
+        if self.terms:
+            response['terms'] = self.terms
+        return response
+
+
+class SynonymDictionary:
+    """Compiled phrase lookup table for query expansion."""
+
+    def __init__(self, categories=None, terms=None):
+        # Maps a tuple of normalized tokens to ('category', value) or ('term', keyword)
+        self._phrases = {}
+        self.max_phrase_length = 1
+
+        # Category names always stand for their own category
+        for category in ResourceCategory:
+            self._add(category.value, ('category', category.value))
+        for category, phrases in (categories or {}).items():
+            if category not in {c.value for c in ResourceCategory}:
+                raise ValueError(f'Unknown category in synonym dictionary: {category}')
+            for phrase in phrases:
+                self._add(phrase, ('category', category))
+        for keyword, phrases in (terms or {}).items():
+            if len(keyword) < MIN_KEYWORD_LENGTH:
+                raise ValueError(f'Synonym keyword too short to match as text: {keyword!r}')
+            for phrase in phrases:
+                self._add(phrase, ('term', keyword))
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def _add(self, phrase, target):
+        tokens = tuple(tokenize(phrase))
+        if tokens:
+            self._phrases[tokens] = target
+            self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Compile a dictionary from a JSON file.
+
+        Args:
+            path (str): Path to the JSON dictionary
+
+        Returns:
+            SynonymDictionary: The compiled dictionary
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('categories'), data.get('terms'))
+
+    def expand(self, text, category=None):
+        """
+        Rewrite a search query using the dictionary.
+
+        Phrases are matched greedily, longest first, from left to right.
+
+        Args:
+            text (str): The search text
+            category (str): Category the searcher already filtered on; phrases
+                naming another category are kept as text instead
+
+        Returns:
+            QueryExpansion: Category filters and the remaining free text
+        """
+        tokens = tokenize(text)
+        categories = []
+        segments = []
+        plain = []
+        changed = False
+        position = 0
+
+        def end_plain_run():
+            if plain:
+                segments.append((' '.join(plain),))
+                plain.clear()
+
+        while position < len(tokens):
+            for length in range(min(self.max_phrase_length, len(tokens) - position), 0, -1):
+                words = tokens[position:position + length]
+                target = self._phrases.get(tuple(words))
+                if not target:
+                    continue
+                kind, value = target
+                if kind == 'category' and category and value != category:
+                    # Reason: ANDing a second category with the one pinned would match nothing
+                    plain.extend(words)
+                elif kind == 'category':
+                    if value not in categories and value != category:
+                        categories.append(value)
+                    changed = True
+                else:
+                    end_plain_run()
+                    segments.append((' '.join(words), value))
+                    changed = True
+                position += length
+                break
+            else:
+                plain.append(tokens[position])
+                position += 1
+        end_plain_run()
+
+        if not changed:
+            return QueryExpansion([], text, False)
+        return QueryExpansion(categories, ' '.join(segment[0] for segment in segments), True, segments)
+
+
+class _DictionaryLoader:
+    """Holds the compiled dictionary for an app and reloads it when the file changes."""
+
+    def __init__(self, path, reload_interval, logger):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._dictionary = None
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def get(self):
+        now = time.monotonic()
+        if self._dictionary is not None and now - self._checked_at < self.reload_interval:
+            return self._dictionary
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                mtime = None
+            if self._dictionary is None or mtime != self._mtime:
+                self._dictionary = self._compile(mtime)
+                self._mtime = mtime
+        return self._dictionary
+
+    def _compile(self, mtime):
+        if mtime is None:
+            return SynonymDictionary()
+        try:
+            return SynonymDictionary.from_file(self.path)
+        except (OSError, ValueError) as e:
+            # Reason: a bad edit to the dictionary must not take search down
+            self.logger.error(f"Error loading search synonyms from {self.path}: {str(e)}")
+            return self._dictionary or SynonymDictionary()
+
+
+def expand_query(text, category=None):
+    """
+    Expand a search query with the current app's synonym dictionary.
+
+    Args:
+        text (str): The search text
+        category (str): Category the searcher already filtered on, if any
+
+    Returns:
+        QueryExpansion: Category filters and the remaining free text
+    """
+    return current_app.extensions['synonyms'].get().expand(text, category)
+
+
+def init_app(app):
+    """
+    Attach the synonym dictionary loader to the app.
+
+    Args:
+        app: The Flask application
+    """
+    loader = _DictionaryLoader(
+        app.config['SEARCH_SYNONYMS_PATH'],
+        app.config['SEARCH_SYNONYMS_RELOAD_INTERVAL'],
+        app.logger
+    )
+    # Compile at startup so the first search does not pay for it
+    loader.get()
+    app.extensions['synonyms'] = loader
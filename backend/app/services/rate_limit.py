@@ -0,0 +1,224 @@
+"""
+Sliding-window rate limiting for authentication endpoints.
+
+Each rule is a limit such as ``10/15 minutes`` keyed on the client IP or the
+submitted email address. Counts use the sliding window counter approximation:
+the previous fixed window's count is weighted by how much of it still
+overlaps the sliding window and added to the current window's count. That
+needs two counters per key instead of a timestamp per request, and works on
+any store that can increment a key with an expiry.
+
+Counters live in process memory by default. Set ``RATELIMIT_STORAGE_URL`` to
+a ``redis://`` URL to share them between workers (requires the ``redis``
+package).
+"""
+import math
+import re
+import threading
+import time
+from flask import current_app, request
+
+_LIMIT_PATTERN = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$')
+_UNIT_SECONDS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(value):
+    """
+    Parse a limit string such as ``30/minute`` or ``10/15 minutes``.
+
+    Args:
+        value (str): The limit string
+
+    Returns:
+        tuple: (max requests, window seconds)
+
+    Raises:
+        ValueError: If the string is not a valid limit
+    """
+    match = _LIMIT_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    amount, multiplier, unit = match.groups()
+    return int(amount), int(multiplier or 1) * _UNIT_SECONDS[unit]
+
+
+class MemoryStore:
+    """Process-local counters with expiry."""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}     # key -> (count, expires_at)
+        self._operations = 0
+
+    def _sweep(self, now):
+        # Reason: keys are written once per window, so drop expired ones periodically rather than on read
+        self._counters = {key: entry for key, entry in self._counters.items() if entry[1] > now}
+
+    def incr(self, key, expiry):
+        """
+        Increment a counter, creating it with an expiry if needed.
+
+        Args:
+            key (str): Counter key
+            expiry (int): Seconds until a new counter expires
+
+        Returns:
+            int: The new count
+        """
+        now = time.time()
+        with self._lock:
+            self._operations += 1
+            if self._operations % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+            count, expires_at = self._counters.get(key, (0, 0))
+            if expires_at <= now:
+                count, expires_at = 0, now + expiry
+            self._counters[key] = (count + 1, expires_at)
+            return count + 1
+
+    def get(self, key):
+        """
+        Read a counter.
+
+        Args:
+            key (str): Counter key
+
+        Returns:
+            int: The count, or 0 if missing or expired
+        """
+        count, expires_at = self._counters.get(key, (0, 0))
+        return count if expires_at > time.time() else 0
+
+
+class RedisStore:
+    """Counters shared between workers through Redis."""
+
+    def __init__(self, url):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def incr(self, key, expiry):
+        """
+        Increment a counter, creating it with an expiry if needed.
+
+        Args:
+            key (str): Counter key
+            expiry (int): Seconds until a new counter expires
+
+        Returns:
+            int: The new count
+        """
+        pipeline = self._client.pipeline()
+        pipeline.incr(key)
+        pipeline.expire(key, expiry, nx=True)
+        return pipeline.execute()[0]
+
+    def get(self, key):
+        """
+        Read a counter.
+
+        Args:
+            key (str): Counter key
+
+        Returns:
+            int: The count, or 0 if missing
+        """
+        return int(self._client.get(key) or 0)
+
+
+def create_store(url):
+    """
+    Create a counter store from a storage URL.
+
+    Args:
+        url (str): ``memory://`` or a ``redis://`` / ``rediss://`` URL
+
+    Returns:
+        MemoryStore or RedisStore: The store
+    """
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisStore(url)
+    if url == 'memory://':
+        return MemoryStore()
+    raise ValueError(f"Unsupported rate limit storage: {url!r}")
+
+
+class RateLimiter:
+    """Sliding window counters over a counter store."""
+
+    def __init__(self, store, clock=time.time):
+        self.store = store
+        self.clock = clock
+
+    def hit(self, key, limit, window):
+        """
+        Record a request and check it against a limit.
+
+        Args:
+            key (str): What is being limited, e.g. ``login:ip:203.0.113.5``
+            limit (int): Maximum requests per window
+            window (int): Window length in seconds
+
+        Returns:
+            int: Seconds to wait before retrying, or 0 if the request is allowed
+        """
+        # Reason: rejected requests are counted too, so a client that keeps hammering stays blocked
+        now = self.clock()
+        index = int(now // window)
+        elapsed = now - index * window
+        current = self.store.incr(f'{key}:{index}', window * 2)
+        previous = self.store.get(f'{key}:{index - 1}')
+        weighted = previous * (window - elapsed) / window + current
+        if weighted <= limit:
+            return 0
+        return max(1, math.ceil(window - elapsed))
+
+
+def _key_value(kind):
+    """Get the value a rule is keyed on for the current request."""
+    if kind == 'ip':
+        return request.remote_addr or 'unknown'
+    if kind == 'email':
+        data = request.get_json(silent=True)
+        email = data.get('email') if isinstance(data, dict) else None
+        return email.strip().lower() if isinstance(email, str) and email.strip() else None
+    raise ValueError(f"Unknown rate limit key: {kind!r}")
+
+
+def check(scope):
+    """
+    Apply the configured rules for a scope to the current request.
+
+    Args:
+        scope (str): Rule set name, e.g. ``login``
+
+    Returns:
+        int: Seconds to wait before retrying, or 0 if the request is allowed
+    """
+    if not current_app.config['RATELIMIT_ENABLED']:
+        return 0
+    limiter = current_app.extensions['rate_limiter']
+    retry_after = 0
+    for kind, limit, window in current_app.extensions['rate_limit_rules'].get(scope, ()):
+        value = _key_value(kind)
+        if value is None:
+            continue
+        retry_after = max(retry_after, limiter.hit(f'{scope}:{kind}:{value}', limit, window))
+    return retry_after
+
+
+def init_app(app):
+    """
+    Create the rate limiter and parse the configured rules.
+
+    Args:
+        app: The Flask application
+    """
+    app.extensions['rate_limiter'] = RateLimiter(create_store(app.config['RATELIMIT_STORAGE_URL']))
+    app.extensions['rate_limit_rules'] = {
+        scope: [(kind, *parse_limit(value)) for kind, value in rules.items()]
+        for scope, rules in app.config['RATELIMIT_RULES'].items()
+    }
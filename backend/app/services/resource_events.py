@@ -0,0 +1,97 @@
+"""
+Commit-time change notifications for resources.
+
+In-memory indexes (such as the search suggestion index) need to know when
+a resource is created, edited, moderated or deleted. Rather than calling
+every index from every endpoint, a SQLAlchemy session hook records the
+resources touched by each flush and publishes them once the transaction
+commits, so rolled-back changes are never seen by subscribers.
+"""
+from blinker import Namespace
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from app import db
+
+_signals = Namespace()
+
+# Sent with ``changes``: a list of ResourceChange records, after a commit.
+resources_committed = _signals.signal('resources-committed')
+
+_PENDING_KEY = 'pending_resource_changes'
+_listening = False
+
+
+class ResourceChange:
+    """
+    A snapshot of a resource row captured at flush time.
+
+    Attributes:
+        op (str): One of 'created', 'updated' or 'deleted'
+        id (int): The resource ID
+        values (dict): Column values at flush time (empty for deletes)
+    """
+
+    __slots__ = ('op', 'id', 'values')
+
+    def __init__(self, op, resource_id, values):
+        self.op = op
+        self.id = resource_id
+        self.values = values
+
+    def __repr__(self):
+        return f'<ResourceChange {self.op} {self.id}>'
+
+
+def _snapshot(resource):
+    """Copy the loaded column values of a resource without triggering lazy loads."""
+    state = inspect(resource)
+    return {attr.key: state.dict.get(attr.key) for attr in state.mapper.column_attrs}
+
+
+def _after_flush(session, flush_context):
+    """Record resources changed by this flush until the transaction ends."""
+    from app.models.resource import Resource
+
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for resource in session.new:
+        if isinstance(resource, Resource):
+            pending[resource.id] = ResourceChange('created', resource.id, _snapshot(resource))
+    for resource in session.dirty:
+        if isinstance(resource, Resource) and session.is_modified(resource):
+            # Reason: a row created earlier in the same transaction stays 'created'
+            op = pending[resource.id].op if resource.id in pending else 'updated'
+            pending[resource.id] = ResourceChange(op, resource.id, _snapshot(resource))
+    for resource in session.deleted:
+        if isinstance(resource, Resource):
+            resource_id = inspect(resource).identity[0]
+            pending[resource_id] = ResourceChange('deleted', resource_id, {})
+
+
+def _after_commit(session):
+    """Publish the recorded changes once they are durable."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not has_app_context():
+        return
+    resources_committed.send(current_app._get_current_object(), changes=list(pending.values()))
+
+
+def _after_rollback(session, previous_transaction):
+    """Discard changes that never reached the database."""
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def init_app(app):
+    """
+    Install the session hooks that feed ``resources_committed``.
+
+    Args:
+        app: The Flask application
+    """
+    global _listening
+    if _listening:
+        return
+    event.listen(db.session, 'after_flush', _after_flush)
+    event.listen(db.session, 'after_commit', _after_commit)
+    event.listen(db.session, 'after_soft_rollback', _after_rollback)
+    _listening = True
@@ -0,0 +1,321 @@
+"""
+Synthetic data for benchmarks and index tuning.
+
+``flask seed`` fills the database with realistic users, profiles and
+resources:
+- roles, statuses, categories and cities follow skewed distributions
+- profiles list needs
+- resources list requirements and have service date ranges
+- timestamps are spread over two years
+
+The output depends only on the seed and on the rows already in the
+database. Each table draws from its own random stream, so changing
+``--resources`` does not change the generated users.
+
+Rows are written with executemany ``INSERT`` statements in batches, one commit
+per batch. Every user shares one password hash (``SEED_PASSWORD``), so
+there is no per-row bcrypt cost. Bulk inserts bypass the ORM flush. The
+resource change log, commit signals and in-process search indexes
+therefore do not see the new rows, and delta sync clients should resync
+after seeding.
+"""
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+from sqlalchemy import select
+from app import db, bcrypt
+from app.models import (
+    User, UserRole, UserStatus, Profile, Resource, ResourceCategory, ResourceStatus
+)
+from app.models.profile import COMPLETION_WEIGHTS, COMPLETE_THRESHOLD
+
+SEED_PASSWORD = 'SeedUser123'
+
+# Generated timestamps end here, so the same seed gives the same rows on any day
+REFERENCE_TIME = datetime(2025, 1, 1)
+HISTORY_DAYS = 730
+
+# (city, state, ZIP prefix, relative population)
+CITIES = [
+    ('New York', 'NY', '100', 40), ('Los Angeles', 'CA', '900', 20), ('Chicago', 'IL', '606', 14),
+    ('Houston', 'TX', '770', 12), ('Phoenix', 'AZ', '850', 8), ('Philadelphia', 'PA', '191', 8),
+    ('San Antonio', 'TX', '782', 7), ('San Diego', 'CA', '921', 7), ('Dallas', 'TX', '752', 7),
+    ('Jacksonville', 'FL', '322', 5), ('Columbus', 'OH', '432', 5), ('Charlotte', 'NC', '282', 5),
+    ('Indianapolis', 'IN', '462', 5), ('Seattle', 'WA', '981', 4), ('Denver', 'CO', '802', 4),
+    ('Detroit', 'MI', '482', 4), ('Memphis', 'TN', '381', 3), ('Baltimore', 'MD', '212', 3),
+    ('Milwaukee', 'WI', '532', 3), ('Albuquerque', 'NM', '871', 3), ('Fresno', 'CA', '937', 3),
+    ('Atlanta', 'GA', '303', 3), ('Cleveland', 'OH', '441', 2), ('New Orleans', 'LA', '701', 2),
+    ('Springfield', 'IL', '627', 1), ('Flint', 'MI', '485', 1), ('Gary', 'IN', '464', 1),
+]
+
+FIRST_NAMES = [
+    'James', 'Maria', 'Robert', 'Aisha', 'Michael', 'Linda', 'David', 'Fatima', 'Jose', 'Sarah',
+    'Wei', 'Patricia', 'Daniel', 'Nia', 'Carlos', 'Emily', 'Kwame', 'Jennifer', 'Luis', 'Grace',
+]
+LAST_NAMES = [
+    'Smith', 'Garcia', 'Johnson', 'Nguyen', 'Williams', 'Rodriguez', 'Brown', 'Okafor', 'Jones',
+    'Martinez', 'Davis', 'Kim', 'Miller', 'Hernandez', 'Wilson', 'Patel', 'Moore', 'Lopez',
+]
+STREETS = ['Main St', 'Oak Ave', 'Maple Dr', 'Church St', 'Park Ave', 'Washington Blvd', 'Lincoln Rd', 'River Rd']
+
+ROLE_WEIGHTS = {UserRole.USER.value: 940, UserRole.PROVIDER.value: 59, UserRole.ADMIN.value: 1}
+USER_STATUS_WEIGHTS = {UserStatus.ACTIVE.value: 95, UserStatus.INACTIVE.value: 3, UserStatus.SUSPENDED.value: 2}
+
+CATEGORY_WEIGHTS = {
+    ResourceCategory.FOOD.value: 24, ResourceCategory.HOUSING.value: 18,
+    ResourceCategory.HEALTHCARE.value: 14, ResourceCategory.EMPLOYMENT.value: 10,
+    ResourceCategory.FINANCIAL.value: 9, ResourceCategory.EDUCATION.value: 8,
+    ResourceCategory.TRANSPORTATION.value: 7, ResourceCategory.LEGAL.value: 5,
+    ResourceCategory.OTHER.value: 5,
+}
+STATUS_WEIGHTS = {
+    ResourceStatus.APPROVED.value: 75, ResourceStatus.PENDING.value: 12,
+    ResourceStatus.REJECTED.value: 5, ResourceStatus.EXPIRED.value: 5, ResourceStatus.ARCHIVED.value: 3,
+}
+
+TITLE_PREFIXES = [
+    'Community', 'Neighborhood', 'Eastside', 'Westside', 'Northside', 'Southside', 'Hope', 'Unity',
+    'Riverside', 'Harbor', 'Family', 'Grace', 'Open Door', 'New Start', 'Good Neighbor',
+]
+TITLE_NOUNS = {
+    'food': ['Food Pantry', 'Community Kitchen', 'Meal Program', 'Food Bank', 'Grocery Voucher Program'],
+    'housing': ['Family Shelter', 'Rental Assistance', 'Transitional Housing', 'Emergency Shelter'],
+    'healthcare': ['Free Clinic', 'Dental Clinic', 'Mental Health Services', 'Mobile Health Van'],
+    'employment': ['Job Training Program', 'Career Center', 'Resume Workshop', 'Hiring Fair'],
+    'education': ['GED Classes', 'Adult Literacy Program', 'Tutoring Center', 'ESL Classes'],
+    'transportation': ['Bus Pass Program', 'Ride Share for Seniors', 'Bike Repair Co-op'],
+    'financial': ['Utility Bill Assistance', 'Tax Preparation Help', 'Financial Coaching'],
+    'legal': ['Legal Aid Clinic', 'Tenant Rights Hotline', 'Immigration Legal Services'],
+    'other': ['Clothing Closet', 'Diaper Bank', 'Phone Charging Station', 'Community Center'],
+}
+DESCRIPTIONS = [
+    'Serving residents of {city} and surrounding neighborhoods.',
+    'Walk-ins welcome; appointments are recommended during busy weeks.',
+    'Staffed by volunteers and case managers who can refer you to other services.',
+    'Services are free and confidential. Spanish-speaking staff available.',
+    'Priority is given to families with children, seniors and veterans.',
+]
+REQUIREMENTS = [
+    'Photo ID', 'Proof of residence', 'Proof of income', 'Intake interview', 'Background check',
+    'Must be 18 or older', 'Pre-registration required', 'Referral letter', 'Social Security card',
+    'Household size documentation',
+]
+NEEDS = [category for category in CATEGORY_WEIGHTS if category != ResourceCategory.OTHER.value]
+SCHEDULES = [
+    'Open Monday to Friday, 9am to 5pm.', 'Distribution every Tuesday from 10am to 2pm.',
+    'Open 24/7 for emergency intake.', 'Saturdays only, 8am to noon.', 'Evenings, 5pm to 8pm.',
+]
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), list(weights.values()))[0]
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class DataGenerator:
+    """Deterministic rows for the users, profiles and resources tables."""
+
+    def __init__(self, seed=0):
+        """
+        Args:
+            seed (int): Random seed; the same seed gives the same rows
+        """
+        self.seed = seed
+        self._cities = [city[:3] for city in CITIES]
+        self._city_weights = [city[3] for city in CITIES]
+
+    def _rng(self, table):
+        # Reason: one stream per table, so the size of one table does not shift the others
+        return random.Random(f'{self.seed}:{table}')
+
+    def _timestamp(self, rng):
+        return REFERENCE_TIME - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+
+    def _city(self, rng):
+        return rng.choices(self._cities, self._city_weights)[0]
+
+    def users(self, count, start=0, password_hash=''):
+        """
+        Generate user rows.
+
+        The first two are an admin and a provider, so resources always have
+        an owner and an approver.
+
+        Args:
+            count (int): Number of users
+            start (int): Number used in the first email address; pass one past the highest user ID
+            password_hash (str): Stored for every user
+
+        Yields:
+            dict: Column values for the ``users`` table
+        """
+        rng = self._rng('users')
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            role = (UserRole.ADMIN.value, UserRole.PROVIDER.value)[i] if i < 2 else _weighted(rng, ROLE_WEIGHTS)
+            created_at = self._timestamp(rng)
+            verified = rng.random() < 0.8
+            yield {
+                'email': f'{first.lower()}.{last.lower()}.{start + i}@example.org',
+                'password': password_hash,
+                'name': f'{first} {last}' if role != UserRole.PROVIDER.value else f'{last} {rng.choice(TITLE_PREFIXES)} Services',
+                'role': role,
+                'status': UserStatus.ACTIVE.value if i < 2 else _weighted(rng, USER_STATUS_WEIGHTS),
+                'email_verified': verified,
+                'email_verified_at': created_at + timedelta(hours=rng.randrange(1, 72)) if verified else None,
+                'last_login_at': created_at + timedelta(days=rng.randrange(0, 60)) if rng.random() < 0.7 else None,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    def profiles(self, users):
+        """
+        Generate one profile row per user, with stored completion.
+
+        Args:
+            users: ``(user ID, created_at)`` pairs
+
+        Yields:
+            dict: Column values for the ``profiles`` table
+        """
+        rng = self._rng('profiles')
+        for user_id, created_at in users:
+            filled = rng.random()
+            city, state, zip_prefix = self._city(rng)
+            row = {
+                'user_id': user_id,
+                'phone': f'(555) {rng.randrange(100, 1000)}-{rng.randrange(10000):04d}' if filled > 0.3 else None,
+                'bio': None,
+                'address': f'{rng.randrange(1, 9999)} {rng.choice(STREETS)}' if filled > 0.4 else None,
+                'city': city if filled > 0.2 else None,
+                'state': state if filled > 0.2 else None,
+                'zip_code': f'{zip_prefix}{rng.randrange(100):02d}' if filled > 0.4 else None,
+                'needs': rng.sample(NEEDS, rng.randrange(1, 4)) if filled > 0.5 else None,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+            score = sum(points for field, points in COMPLETION_WEIGHTS.items() if row.get(field))
+            row['completion_percentage'] = score
+            row['is_complete'] = score >= COMPLETE_THRESHOLD
+            yield row
+
+    def resources(self, count, provider_ids, approver_ids):
+        """
+        Generate resource rows.
+
+        Args:
+            count (int): Number of resources
+            provider_ids (list): IDs of users who may own resources
+            approver_ids (list): IDs of users who may have approved them
+
+        Yields:
+            dict: Column values for the ``resources`` table
+        """
+        rng = self._rng('resources')
+        for _ in range(count):
+            category = _weighted(rng, CATEGORY_WEIGHTS)
+            status = _weighted(rng, STATUS_WEIGHTS)
+            city, state, zip_prefix = self._city(rng)
+            created_at = self._timestamp(rng)
+            start_date = (created_at + timedelta(days=rng.randrange(0, 30))).date() if rng.random() < 0.6 else None
+            end_date = start_date + timedelta(days=rng.randrange(7, 365)) if start_date and rng.random() < 0.5 else None
+            reviewed_at = created_at + timedelta(hours=rng.randrange(1, 240))
+            reviewed = status != ResourceStatus.PENDING.value
+            title = f'{rng.choice(TITLE_PREFIXES)} {rng.choice(TITLE_NOUNS[category])}'
+            yield {
+                'title': title,
+                'description': ' '.join(
+                    sentence.format(city=city) for sentence in rng.sample(DESCRIPTIONS, rng.randrange(1, 4))
+                ),
+                'category': category,
+                'status': status,
+                'provider_id': rng.choice(provider_ids),
+                'location': f'{city}, {state}',
+                'address': f'{rng.randrange(1, 9999)} {rng.choice(STREETS)}',
+                'city': city,
+                'state': state,
+                'zip_code': f'{zip_prefix}{rng.randrange(100):02d}',
+                'contact_name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}' if rng.random() < 0.7 else None,
+                'contact_phone': f'(555) {rng.randrange(100, 1000)}-{rng.randrange(10000):04d}',
+                'contact_email': f'info{rng.randrange(10000)}@example.org' if rng.random() < 0.6 else None,
+                'start_date': start_date,
+                'end_date': end_date,
+                'requirements': rng.sample(REQUIREMENTS, rng.randrange(0, 4)) or None,
+                'additional_info': rng.choice(SCHEDULES) if rng.random() < 0.5 else None,
+                'approved_at': reviewed_at if status == ResourceStatus.APPROVED.value else None,
+                'approved_by_id': rng.choice(approver_ids) if reviewed and approver_ids else None,
+                'rejection_reason': 'Incomplete contact information' if status == ResourceStatus.REJECTED.value else None,
+                'created_at': created_at,
+                'updated_at': reviewed_at if reviewed else created_at,
+            }
+
+
+def _users_after(last_id, page_size):
+    """Yield ``(id, created_at)`` for users after ``last_id``, one page per query."""
+    # Reason: fetch page by page, since a cursor left open would not survive the commits between batches
+    while True:
+        page = db.session.execute(
+            select(User.id, User.created_at).where(User.id > last_id).order_by(User.id).limit(page_size)
+        ).all()
+        if not page:
+            return
+        yield from page
+        last_id = page[-1].id
+
+
+def seed_database(users=0, resources=0, seed=0, batch_size=10000, progress=None):
+    """
+    Bulk-insert generated users (each with a profile) and resources.
+
+    Args:
+        users (int): Number of users to create
+        resources (int): Number of resources to create
+        seed (int): Random seed
+        batch_size (int): Rows per INSERT statement and commit
+        progress: Optional callable ``progress(table, rows_so_far)`` called after each batch
+
+    Returns:
+        dict: Rows inserted per table
+
+    Raises:
+        ValueError: If resources are requested but the database has no providers
+    """
+    generator = DataGenerator(seed)
+    counts = {'users': 0, 'profiles': 0, 'resources': 0}
+
+    def write(model, table, rows):
+        for batch in _batches(rows, batch_size):
+            # Reason: a Core executemany; ORM bulk inserts drop None values and split the batch by key set
+            db.session.execute(model.__table__.insert(), batch)
+            db.session.commit()
+            counts[table] += len(batch)
+            if progress:
+                progress(table, counts[table])
+
+    if users:
+        last_id = db.session.scalar(select(db.func.max(User.id))) or 0
+        password_hash = bcrypt.generate_password_hash(SEED_PASSWORD).decode('utf-8')
+        # Reason: earlier seeded emails end in numbers below their users' IDs; a count could reuse them after deletes
+        write(User, 'users', generator.users(users, last_id + 1, password_hash))
+        write(Profile, 'profiles', generator.profiles(_users_after(last_id, batch_size)))
+
+    if resources:
+        provider_ids = db.session.scalars(
+            select(User.id).where(User.role == UserRole.PROVIDER.value).order_by(User.id)
+        ).all()
+        if not provider_ids:
+            raise ValueError('Resources need at least one provider; seed some users first')
+        approver_ids = db.session.scalars(
+            select(User.id).where(User.role == UserRole.ADMIN.value).order_by(User.id)
+        ).all()
+        write(Resource, 'resources', generator.resources(resources, provider_ids, approver_ids))
+
+    return counts
@@ -0,0 +1,276 @@
+"""
+Static snapshots of the public resource directory.
+
+The anonymous listing is the same for every visitor, so instead of running
+``GET /api/resources`` for each of them the directory can be written to
+disk as JSON files that nginx or a CDN serves directly:
+
+- ``resources.<hash>.json``: every approved resource
+- ``category/<category>.<hash>.json``: approved resources in one category
+- ``city/<city>.<hash>.json``: approved resources in one city
+- ``manifest.json``: the current file name, hash and count of each of the above
+
+Each file has the same body as the equivalent API listing. ``<hash>`` is
+derived from the content, so the data files never change once written and
+can be cached forever; only ``manifest.json`` needs revalidation. Every
+file is also written pre-compressed (``.gz``, and ``.br`` when the
+``brotli`` package is installed) for ``gzip_static`` / ``brotli_static``.
+
+``flask build-snapshot`` writes a snapshot on demand. With
+``SNAPSHOT_AUTO_REBUILD`` enabled, committed changes to public resources
+schedule a rebuild in a background thread ``SNAPSHOT_DEBOUNCE_SECONDS``
+later, so a burst of moderation actions produces one build.
+
+Every worker process may rebuild, so builds hold an exclusive ``flock`` on
+``.build.lock`` in the snapshot directory. Otherwise one worker could
+delete files another has written but not yet listed in its manifest.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from flask import current_app
+from app.models import Resource, ResourceStatus
+from app.services.resource_events import resources_committed
+from app.utils.text import slugify
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are only serialized within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.build.lock'
+# Hex digits of the SHA-256 used in file names
+HASH_LENGTH = 16
+
+
+def _write_atomic(path, data):
+    """Write a file so readers see either the old or the new content, never a partial one."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def _directory_lock(directory):
+    """Hold an exclusive lock on ``directory`` shared by every process that builds into it."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK_NAME), 'a') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class SnapshotBuilder:
+    """Writes the public directory as static, content-hashed JSON files."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _write(self, name, body):
+        """Write one listing and its compressed variants; return its manifest entry."""
+        data = current_app.json.dumps(body).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        base, _ = os.path.splitext(name)
+        relative = f'{base}.{digest}.json'
+        path = os.path.join(self.directory, relative)
+        # Reason: the name is derived from the content, so an existing file is already correct
+        if not os.path.exists(path):
+            _write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write_atomic(path + '.br', brotli.compress(data, quality=11))
+            _write_atomic(path, data)
+        return {"path": relative, "hash": digest, "count": body["count"]}
+
+    def _read_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        try:
+            with open(path, 'rb') as handle:
+                return current_app.json.loads(handle.read())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _manifest_paths(manifest):
+        if not manifest:
+            return set()
+        entries = [manifest['all'], *manifest['categories'].values(), *manifest['cities'].values()]
+        return {entry['path'] for entry in entries}
+
+    def _remove_stale(self, keep):
+        """Delete data files referenced by neither the new nor the previous manifest."""
+        removed = 0
+        for subdir in ('', 'category', 'city'):
+            folder = os.path.join(self.directory, subdir)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                relative = os.path.join(subdir, name) if subdir else name
+                # Skips the lock file, and temporary files left by an interrupted build
+                if name == MANIFEST_NAME or name.startswith('.') or os.path.isdir(os.path.join(folder, name)):
+                    continue
+                data_name = relative
+                for suffix in ('.gz', '.br'):
+                    if data_name.endswith(suffix):
+                        data_name = data_name[:-len(suffix)]
+                if data_name.replace(os.sep, '/') not in keep:
+                    os.unlink(os.path.join(folder, name))
+                    removed += 1
+        return removed
+
+    def build(self):
+        """
+        Write a snapshot of every approved resource.
+
+        Must be called within an application context.
+
+        Returns:
+            dict: The new manifest
+        """
+        from app.api.includes import serialize_resources
+
+        with self._lock, _directory_lock(self.directory):
+            resources = Resource.query.filter_by(
+                status=ResourceStatus.APPROVED.value
+            ).order_by(Resource.id).all()
+            serialized = serialize_resources(resources)
+
+            by_category = {}
+            by_city = {}
+            city_names = {}
+            for response in serialized:
+                by_category.setdefault(response['category'], []).append(response)
+                city = slugify(response.get('city'))
+                if city:
+                    by_city.setdefault(city, []).append(response)
+                    city_names.setdefault(city, response['city'])
+
+            manifest = {
+                "generated_at": datetime.utcnow().isoformat(),
+                "all": self._write('resources.json', {"resources": serialized, "count": len(serialized)}),
+                "categories": {
+                    category: self._write(f'category/{category}.json', {"resources": items, "count": len(items)})
+                    for category, items in sorted(by_category.items())
+                },
+                "cities": {}
+            }
+            for city, items in sorted(by_city.items()):
+                entry = self._write(f'city/{city}.json', {"resources": items, "count": len(items)})
+                entry["name"] = city_names[city]
+                manifest["cities"][city] = entry
+
+            previous = self._read_manifest()
+            data = current_app.json.dumps(manifest).encode('utf-8')
+            _write_atomic(os.path.join(self.directory, MANIFEST_NAME), data)
+            # Reason: clients that fetched the previous manifest may still request its files
+            self._remove_stale(self._manifest_paths(manifest) | self._manifest_paths(previous))
+            return manifest
+
+
+class SnapshotRebuilder:
+    """Debounces rebuild requests into one background build."""
+
+    def __init__(self, app, builder, delay):
+        self.app = app
+        self.builder = builder
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def schedule(self):
+        """Rebuild ``delay`` seconds from now, unless a rebuild is already scheduled."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self):
+        # Reason: clear first so changes committed during the build schedule another one
+        with self._lock:
+            self._timer = None
+        with self.app.app_context():
+            try:
+                self.builder.build()
+            except Exception as e:
+                logger.error(f"Snapshot rebuild failed: {str(e)}")
+
+    def join(self, timeout=None):
+        """
+        Wait for a scheduled rebuild to finish.
+
+        Args:
+            timeout (float): Seconds to wait, or None to wait indefinitely
+        """
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.join(timeout)
+
+
+def _affects_directory(change):
+    """Whether a committed change can alter the public listing."""
+    # Newly submitted resources stay pending until moderated
+    return change.op != 'created' or change.values.get('status') == ResourceStatus.APPROVED.value
+
+
+def _on_resources_committed(app, changes):
+    """Schedule a rebuild after changes to public resources."""
+    rebuilder = app.extensions.get('snapshot_rebuilder')
+    if rebuilder is not None and any(_affects_directory(change) for change in changes):
+        rebuilder.schedule()
+
+
+def snapshot_dir(app):
+    """
+    Get the directory snapshots are written to.
+
+    Args:
+        app: The Flask application
+
+    Returns:
+        str: ``SNAPSHOT_DIR``, or ``snapshots`` in the instance folder
+    """
+    return app.config['SNAPSHOT_DIR'] or os.path.join(app.instance_path, 'snapshots')
+
+
+def init_app(app):
+    """
+    Create the snapshot builder and, if enabled, rebuild on resource changes.
+
+    Args:
+        app: The Flask application
+    """
+    builder = SnapshotBuilder(snapshot_dir(app))
+    app.extensions['snapshots'] = builder
+    if app.config['SNAPSHOT_AUTO_REBUILD']:
+        app.extensions['snapshot_rebuilder'] = SnapshotRebuilder(
+            app, builder, app.config['SNAPSHOT_DEBOUNCE_SECONDS']
+        )
+        resources_committed.connect(_on_resources_committed, sender=app)
@@ -0,0 +1,220 @@
+"""
+In-memory prefix index backing the search box typeahead.
+
+The index holds title, category and city terms for approved resources in a
+sorted array, so a prefix lookup is a binary search followed by a short
+forward scan instead of an ``ilike`` query against the database. It is
+built lazily from the database on first use and then kept current from
+``resources_committed`` notifications.
+
+Each worker process keeps its own copy; changes committed by another
+process are picked up when that process's index is next rebuilt.
+"""
+import threading
+from bisect import bisect_left, insort
+from flask import current_app
+from app import db
+from app.services.resource_events import resources_committed
+from app.utils.text import normalize_text
+
+# Title suffixes are indexed from each word so "pantry" finds "Community Food Pantry"
+MAX_TITLE_WORDS = 8
+# Upper bound on entries inspected per lookup, which keeps very short prefixes cheap
+MAX_SCAN = 256
+
+
+class SuggestionIndex:
+    """Sorted-array prefix index of resource titles, categories and cities."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._entries = []        # sorted (key, kind, ident) tuples
+        self._terms = {}          # (kind, ident) -> [display text, resource count]
+        self._by_resource = {}    # resource id -> list of (kind, display) terms
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._terms)
+
+    @staticmethod
+    def _terms_for(values):
+        """Return the (kind, display) terms contributed by one resource."""
+        terms = []
+        for kind in ('title', 'category', 'city'):
+            display = (values.get(kind) or '').strip()
+            if display:
+                terms.append((kind, display))
+        return terms
+
+    @staticmethod
+    def _keys_for(kind, ident):
+        """Return the lookup keys for a term."""
+        if kind != 'title':
+            return [ident]
+        words = ident.split(' ')[:MAX_TITLE_WORDS]
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def _add_term(self, kind, display):
+        ident = normalize_text(display)
+        term = self._terms.get((kind, ident))
+        if term:
+            term[1] += 1
+            return
+        self._terms[(kind, ident)] = [display, 1]
+        if self.loaded:
+            for key in self._keys_for(kind, ident):
+                insort(self._entries, (key, kind, ident))
+
+    def _remove_term(self, kind, display):
+        ident = normalize_text(display)
+        term = self._terms.get((kind, ident))
+        if not term:
+            return
+        term[1] -= 1
+        if term[1] > 0:
+            return
+        del self._terms[(kind, ident)]
+        for key in self._keys_for(kind, ident):
+            entry = (key, kind, ident)
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+    def add(self, resource_id, values):
+        """
+        Index (or re-index) a single approved resource.
+
+        Args:
+            resource_id (int): The resource ID
+            values (dict): Mapping with 'title', 'category' and 'city' keys
+        """
+        with self._lock:
+            self.remove(resource_id)
+            terms = self._terms_for(values)
+            for kind, display in terms:
+                self._add_term(kind, display)
+            self._by_resource[resource_id] = terms
+
+    def remove(self, resource_id):
+        """
+        Drop a resource's terms from the index.
+
+        Args:
+            resource_id (int): The resource ID
+        """
+        with self._lock:
+            for kind, display in self._by_resource.pop(resource_id, ()):
+                self._remove_term(kind, display)
+
+    def load(self, rows):
+        """
+        Replace the index contents.
+
+        Args:
+            rows: Iterable of (id, title, category, city) tuples
+        """
+        with self._lock:
+            self._reset()
+            for resource_id, title, category, city in rows:
+                self.add(resource_id, {'title': title, 'category': category, 'city': city})
+            # Reason: one sort after a bulk load avoids a quadratic run of insort calls
+            self._entries = sorted(
+                (key, kind, ident)
+                for kind, ident in self._terms
+                for key in self._keys_for(kind, ident)
+            )
+            self.loaded = True
+
+    def apply(self, changes):
+        """
+        Apply committed resource changes.
+
+        Args:
+            changes (list): ResourceChange records from ``resources_committed``
+        """
+        from app.models.resource import ResourceStatus
+
+        with self._lock:
+            for change in changes:
+                if change.op != 'deleted' and change.values.get('status') == ResourceStatus.APPROVED.value:
+                    self.add(change.id, change.values)
+                else:
+                    self.remove(change.id)
+
+    def suggest(self, prefix, limit=10):
+        """
+        Find terms starting with a prefix, most common first.
+
+        Args:
+            prefix (str): The text typed so far
+            limit (int): Maximum number of suggestions to return
+
+        Returns:
+            list: Dictionaries with 'text', 'type' and 'count' keys
+        """
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            matches = {}
+            position = bisect_left(self._entries, (prefix,))
+            end = min(len(self._entries), position + MAX_SCAN)
+            while position < end:
+                key, kind, ident = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                if (kind, ident) not in matches:
+                    display, count = self._terms[(kind, ident)]
+                    # Reason: terms whose text begins with the prefix rank above mid-title matches
+                    matches[(kind, ident)] = (not ident.startswith(prefix), -count, ident, kind, display)
+                position += 1
+
+        ranked = sorted(matches.values())[:limit]
+        return [{'text': display, 'type': kind, 'count': -count} for _, count, _, kind, display in ranked]
+
+
+def _load_index(index):
+    """Build the index from the approved resources in the database."""
+    from app.models.resource import Resource, ResourceStatus
+
+    rows = db.session.query(
+        Resource.id, Resource.title, Resource.category, Resource.city
+    ).filter(Resource.status == ResourceStatus.APPROVED.value)
+    index.load(rows)
+
+
+def get_suggestion_index():
+    """
+    Return the current app's suggestion index, building it on first use.
+
+    Returns:
+        SuggestionIndex: The populated index
+    """
+    index = current_app.extensions['suggestions']
+    if not index.loaded:
+        with index._lock:
+            if not index.loaded:
+                _load_index(index)
+    return index
+
+
+def _on_resources_committed(app, changes):
+    """Keep a loaded index in step with committed resource changes."""
+    index = app.extensions.get('suggestions')
+    if index is not None and index.loaded:
+        index.apply(changes)
+
+
+def init_app(app):
+    """
+    Attach an empty suggestion index to the app.
+
+    Args:
+        app: The Flask application
+    """
+    app.extensions['suggestions'] = SuggestionIndex()
+    resources_committed.connect(_on_resources_committed, sender=app)
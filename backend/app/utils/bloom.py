@@ -0,0 +1,51 @@
+"""
+A small Bloom filter for fast negative membership checks.
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Probabilistic set: ``in`` never gives false negatives, and gives false
+    positives at roughly ``error_rate`` once ``capacity`` items are added.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        """
+        Size the filter.
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): Target false positive rate at capacity
+        """
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Reason: double hashing derives k positions from one digest (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        """
+        Add an item.
+
+        Args:
+            item (str): The item to add
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,108 @@
+"""
+Response compression for the PovertyLine API.
+
+Most users reach the API over mobile data, where JSON listings compress to
+a fraction of their size. Responses are compressed after the view runs when
+the client advertises support in ``Accept-Encoding``, the body is large
+enough to benefit (``COMPRESS_MIN_SIZE``) and the content type is textual.
+Brotli is preferred when the ``brotli`` package is installed and the client
+accepts it; gzip is used otherwise.
+"""
+import gzip
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/csv',
+}
+
+
+def available_encodings():
+    """
+    Return the encodings this server can produce, in order of preference.
+
+    Returns:
+        list: Content-Encoding tokens
+    """
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(data, encoding, level):
+    """
+    Compress a response body.
+
+    Args:
+        data (bytes): The uncompressed body
+        encoding (str): 'br' or 'gzip'
+        level (int): gzip level (1-9); brotli quality is derived from it
+
+    Returns:
+        bytes: The compressed body
+    """
+    if encoding == 'br':
+        # Reason: brotli quality above ~5 costs far more CPU than it saves bytes on JSON
+        return brotli.compress(data, quality=min(level, 5))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _should_compress(response, min_size):
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    return (response.content_length or 0) >= min_size
+
+
+def compress_response(response):
+    """
+    Compress a response in place if the client accepts it.
+
+    Args:
+        response: The outgoing Flask response
+
+    Returns:
+        Response: The (possibly compressed) response
+    """
+    config = current_app.config
+    if not config['COMPRESS_ENABLED']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if not _should_compress(response, config['COMPRESS_MIN_SIZE']):
+        return response
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    body = compress(response.get_data(), encoding, config['COMPRESS_LEVEL'])
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    # Reason: an ETag must identify the bytes sent, so mark it weak once they change
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """
+    Register response compression on the app.
+
+    Args:
+        app: The Flask application
+    """
+    app.after_request(compress_response)
@@ -0,0 +1,115 @@
+"""
+Conditional GET support for single-entity endpoints.
+
+Every row carries ``updated_at``, which changes whenever the row is written,
+so ``(table, id, updated_at)`` identifies one version of an entity's JSON.
+When a request carries ``If-None-Match`` or ``If-Modified-Since``, endpoints
+first fetch only those columns (plus whatever authorization needs), and
+answer ``304 Not Modified`` without loading or serializing the row when the
+client's copy is current. Unconditional requests skip that extra query and
+load the entity as before; their responses get ``ETag`` and
+``Last-Modified`` headers for next time.
+
+Tags are weak: the body may be re-encoded or compressed, and only semantic
+equivalence is promised.
+"""
+from flask import request, current_app
+
+
+def is_conditional():
+    """
+    Check whether the request carries cache validators.
+
+    Returns:
+        bool: True if ``If-None-Match`` or ``If-Modified-Since`` was sent
+    """
+    return bool(request.if_none_match) or request.if_modified_since is not None
+
+
+def entity_tag(kind, ident, updated_at):
+    """
+    Build the entity tag for one version of an entity.
+
+    Args:
+        kind (str): Entity type, e.g. ``resource``
+        ident (int): Entity ID
+        updated_at (datetime): The row's ``updated_at``
+
+    Returns:
+        str: The opaque tag (without quotes or ``W/``)
+    """
+    version = updated_at.strftime('%Y%m%d%H%M%S%f') if updated_at else '0'
+    return f'{kind}-{ident}-{version}'
+
+
+def _is_fresh(etag, last_modified):
+    # Reason: RFC 9110 gives If-None-Match precedence; If-Modified-Since only applies without it
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since is not None and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def _set_validators(response, etag, last_modified, private):
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Clients may keep the body but must revalidate before reusing it
+    response.cache_control.no_cache = True
+    if private:
+        response.cache_control.private = True
+    return response
+
+
+def not_modified(etag, last_modified, private=True):
+    """
+    Build a 304 response if the client's copy is current.
+
+    Args:
+        etag (str): Tag from ``entity_tag``
+        last_modified (datetime): The row's ``updated_at``
+        private (bool): Whether the response is specific to the requesting user
+
+    Returns:
+        Response: A 304 response, or None if the full body must be sent
+    """
+    if not _is_fresh(etag, last_modified):
+        return None
+    return _set_validators(current_app.response_class(status=304), etag, last_modified, private)
+
+
+def check_not_modified(kind, query, private=True):
+    """
+    Answer a conditional request from a lightweight ``(id, updated_at)`` query.
+
+    Args:
+        kind (str): Entity type for the tag
+        query: A query selecting the entity's ``id`` and ``updated_at`` columns
+        private (bool): Whether the response is specific to the requesting user
+
+    Returns:
+        Response: A 304 response, or None if the full body must be sent
+    """
+    if not is_conditional():
+        return None
+    row = query.first()
+    if row is None:
+        return None
+    return not_modified(entity_tag(kind, row.id, row.updated_at), row.updated_at, private)
+
+
+def with_entity_validators(response, kind, entity, private=True):
+    """
+    Add ``ETag``, ``Last-Modified`` and ``Cache-Control`` for an entity to a response.
+
+    Args:
+        response: The Flask response
+        kind (str): Entity type for the tag
+        entity: The serialized model instance (or a row with ``id`` and ``updated_at``)
+        private (bool): Whether the response is specific to the requesting user
+
+    Returns:
+        The response
+    """
+    return _set_validators(response, entity_tag(kind, entity.id, entity.updated_at), entity.updated_at, private)
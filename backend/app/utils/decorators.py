@@ -3,7 +3,32 @@ Decorators for the PovertyLine application.
 """
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, current_user
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, current_user
+from app.models.user import UserRole, UserStatus
+from app.services import rate_limit
+
+def _current_role():
+    """
+    Get the role of the authenticated user.
+    
+    Reads the ``role`` and ``status`` claims embedded at login, so no user row
+    is loaded. Tokens issued without those claims fall back to the database.
+    
+    Returns:
+        str: The user's role, or None if the account is not active
+    """
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        # Used without @jwt_required(); verify the token here instead
+        verify_jwt_in_request()
+        claims = get_jwt()
+    
+    if 'role' in claims:
+        if claims.get('status', UserStatus.ACTIVE.value) != UserStatus.ACTIVE.value:
+            return None
+        return claims['role']
+    return current_user.role
 
 def admin_required(fn):
     """
@@ -17,8 +42,7 @@ def admin_required(fn):
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        if not current_user.is_admin():
+        if _current_role() != UserRole.ADMIN.value:
             return jsonify({"error": "Admin access required"}), 403
         return fn(*args, **kwargs)
     return wrapper
@@ -35,8 +59,29 @@ def provider_required(fn):
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        if not current_user.is_provider() and not current_user.is_admin():
+        if _current_role() not in (UserRole.PROVIDER.value, UserRole.ADMIN.value):
             return jsonify({"error": "Provider access required"}), 403
         return fn(*args, **kwargs)
     return wrapper
+
+def rate_limited(scope):
+    """
+    Decorator to apply the ``RATELIMIT_RULES`` for a scope before the view runs.
+    
+    Args:
+        scope (str): Rule set name in ``RATELIMIT_RULES``
+        
+    Returns:
+        The decorator
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            retry_after = rate_limit.check(scope)
+            if retry_after:
+                response = jsonify({"error": "Too many requests, please try again later"})
+                response.headers['Retry-After'] = str(retry_after)
+                return response, 429
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
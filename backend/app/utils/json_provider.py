@@ -0,0 +1,82 @@
+"""
+Compact JSON encoding for API responses.
+
+Flask's default provider pretty-prints in debug mode, sorts keys and
+converts ``date``/``datetime`` values through Python callbacks. When
+``orjson`` is installed this provider is used instead: output is always
+compact, and dates are serialized natively as ISO 8601 strings.
+"""
+import decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(obj):
+    """Serialize the few types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson."""
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize data to a JSON string.
+
+        Args:
+            obj: The data to serialize
+            **kwargs: Ignored; accepted for compatibility with ``json.dumps`` callers
+
+        Returns:
+            str: The JSON document
+        """
+        return orjson.dumps(obj, default=_default, option=_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize a JSON string or bytes.
+
+        Args:
+            s: The JSON document
+            **kwargs: Ignored
+
+        Returns:
+            The decoded data
+        """
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Serialize data to a JSON response, as ``jsonify`` does.
+
+        Returns:
+            Response: A response with an ``application/json`` body
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=_OPTIONS),
+            mimetype=self.mimetype
+        )
+
+
+def init_app(app):
+    """
+    Install the orjson provider when orjson is available.
+
+    Args:
+        app: The Flask application
+    """
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
@@ -0,0 +1,76 @@
+"""
+Parsing helpers for list-valued and pagination query parameters.
+"""
+
+
+def parse_include(value, allowed):
+    """
+    Parse an ``include`` query parameter naming related objects to embed.
+
+    Args:
+        value (str): Comma-separated relation names, or None
+        allowed (tuple): Relation names the endpoint supports
+
+    Returns:
+        set: The requested relation names
+
+    Raises:
+        ValueError: If an unsupported relation is requested
+    """
+    if not value:
+        return set()
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = sorted(names - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(unknown)}. Must be one of {list(allowed)}")
+    return names
+
+
+def parse_id_list(value, limit):
+    """
+    Parse a comma-separated list of integer IDs such as ``1,2,3``.
+
+    Args:
+        value (str): The parameter value
+        limit (int): Maximum number of IDs accepted
+
+    Returns:
+        list: Unique IDs in request order
+
+    Raises:
+        ValueError: If an ID is not an integer or there are too many
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+    except ValueError:
+        raise ValueError("ids must be a comma-separated list of integers")
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids can be requested at once")
+    return ids
+
+
+def parse_pagination(args, default_per_page, max_per_page):
+    """
+    Parse ``page`` and ``per_page`` query parameters.
+
+    Args:
+        args: The request's query arguments
+        default_per_page (int): Page size when ``per_page`` is not given
+        max_per_page (int): Largest page size accepted
+
+    Returns:
+        tuple: (page, per_page), with ``page`` starting at 1
+
+    Raises:
+        ValueError: If either value is not a positive integer or the page size is too large
+    """
+    try:
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', default_per_page))
+    except ValueError:
+        raise ValueError("page and per_page must be integers")
+    if page < 1 or per_page < 1:
+        raise ValueError("page and per_page must be positive")
+    if per_page > max_per_page:
+        raise ValueError(f"per_page must be at most {max_per_page}")
+    return page, per_page
@@ -0,0 +1,137 @@
+"""
+Production server profile for gunicorn.
+
+``gunicorn.conf.py`` turns the ``GUNICORN_*`` environment variables into
+gunicorn settings through ``server_settings``. Anything left unset is
+derived from the machine and the database pool:
+
+- ``gthread`` workers by default. Requests mostly wait on the database,
+  and threads wait in one process's memory instead of one process each.
+  ``sync`` and ``uvicorn`` (the ASGI app in ``asgi.py``) are the
+  alternatives.
+- Threads per worker match the SQLAlchemy pool size (``DB_POOL_SIZE``),
+  so a request never waits for a connection its worker cannot give it.
+- Workers default to ``2 x CPUs + 1`` for threaded and sync workers, and
+  to one per CPU for the event loop workers. They are capped so that
+  every worker's full pool fits within ``DB_MAX_CONNECTIONS``.
+- The app is preloaded in the master. Workers then share its imported
+  code and data copy-on-write, and each worker resets the inherited
+  connection pool after the fork.
+- Workers restart after ``max_requests`` requests, staggered by a random
+  jitter so they do not all restart at once. This bounds slow memory
+  growth.
+"""
+import os
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+# SQLAlchemy's QueuePool defaults
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+
+def _int(env, name, default):
+    value = env.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _bool(env, name, default):
+    value = env.get(name)
+    return value.lower() == 'true' if value not in (None, '') else default
+
+
+def server_settings(env=None, cpu_count=None):
+    """
+    Compute gunicorn settings from environment variables.
+
+    Args:
+        env (dict): Environment variables (default ``os.environ``)
+        cpu_count (int): CPUs available (default ``os.cpu_count()``)
+
+    Returns:
+        dict: gunicorn setting names and values
+
+    Raises:
+        ValueError: If ``GUNICORN_WORKER_CLASS`` is not a supported worker class
+    """
+    env = os.environ if env is None else env
+    cpus = cpu_count or os.cpu_count() or 1
+
+    kind = env.get('GUNICORN_WORKER_CLASS', 'gthread')
+    if kind not in WORKER_CLASSES:
+        raise ValueError(f"GUNICORN_WORKER_CLASS must be one of {list(WORKER_CLASSES)}, got {kind!r}")
+
+    pool_size = _int(env, 'DB_POOL_SIZE', DEFAULT_POOL_SIZE)
+    max_overflow = _int(env, 'DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW)
+    async_pool_size = _int(env, 'ASYNC_POOL_SIZE', 20)
+    # Connections one worker may open at most
+    per_worker = async_pool_size if kind == 'uvicorn' else pool_size + max_overflow
+
+    if kind == 'uvicorn':
+        workers = cpus
+        threads = 1
+    else:
+        workers = 2 * cpus + 1
+        threads = pool_size if kind == 'gthread' else 1
+    max_connections = _int(env, 'DB_MAX_CONNECTIONS', 100)
+    workers = max(1, min(workers, max_connections // max(per_worker, 1)))
+
+    max_requests = _int(env, 'GUNICORN_MAX_REQUESTS', 1000)
+    return {
+        'wsgi_app': env.get('GUNICORN_APP', 'asgi:app' if kind == 'uvicorn' else 'wsgi:app'),
+        'bind': env.get('GUNICORN_BIND', f"0.0.0.0:{env.get('PORT', '8000')}"),
+        'worker_class': WORKER_CLASSES[kind],
+        'workers': _int(env, 'GUNICORN_WORKERS', workers),
+        'threads': _int(env, 'GUNICORN_THREADS', threads),
+        'preload_app': _bool(env, 'GUNICORN_PRELOAD', True),
+        'max_requests': max_requests,
+        'max_requests_jitter': _int(env, 'GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10),
+        'timeout': _int(env, 'GUNICORN_TIMEOUT', 30),
+        'graceful_timeout': _int(env, 'GUNICORN_GRACEFUL_TIMEOUT', 30),
+        'keepalive': _int(env, 'GUNICORN_KEEPALIVE', 5),
+        # Reason: worker heartbeats touch a temp file, which can stall on a slow or full disk
+        'worker_tmp_dir': env.get('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None),
+        'accesslog': env.get('GUNICORN_ACCESS_LOG') or None,
+        'loglevel': env.get('GUNICORN_LOG_LEVEL', 'info'),
+    }
+
+
+def flask_app(application):
+    """
+    Find the Flask app behind a loaded WSGI or ASGI application.
+
+    Args:
+        application: The Flask app or an ``AsyncAPI`` wrapping one
+
+    Returns:
+        The Flask application, or None
+    """
+    from flask import Flask
+    if isinstance(application, Flask):
+        return application
+    inner = getattr(application, 'app', None)
+    return inner if isinstance(inner, Flask) else None
+
+
+def reset_after_fork(application):
+    """
+    Drop database connections a worker inherited from the preloading master.
+
+    Connections must not be shared between processes. The pool is
+    discarded without closing them, since the master still owns the
+    sockets.
+
+    Args:
+        application: The loaded WSGI or ASGI application
+    """
+    from app import db
+
+    app = flask_app(application)
+    if app is None:
+        return
+    with app.app_context():
+        db.engine.dispose(close=False)
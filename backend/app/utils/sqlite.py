@@ -0,0 +1,165 @@
+"""
+SQLite production mode.
+
+Small deployments run on a single SQLite file. With SQLite's defaults, a
+writer locks readers out of the whole database, so several gunicorn
+workers soon fail with "database is locked". With
+``SQLITE_PRODUCTION_MODE`` enabled and a file database configured:
+
+- Every new connection applies ``SQLITE_PRAGMAS``. The defaults enable
+  write-ahead logging, so readers never block on the writer. They use
+  ``synchronous=NORMAL``, which is durable across application crashes
+  under WAL. They wait ``busy_timeout`` milliseconds for another
+  process's write lock instead of failing at once. They also enlarge
+  the page cache and memory-map the file.
+- Writes within a process go through a FIFO write queue. A session
+  waits for its turn before its first flush and keeps it until its
+  transaction ends. Threads then take turns in arrival order instead
+  of polling SQLite's file lock, and only one writer per process
+  competes with other processes for it.
+
+Reads never enter the queue.
+"""
+import threading
+from collections import deque
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+
+_SESSION_KEY = 'sqlite_write_turn'
+_listening = False
+
+
+class WriteQueue:
+    """A reentrant FIFO lock giving one thread at a time the right to write."""
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._waiting = deque()
+        self._owner = None
+        self._depth = 0
+
+    def acquire(self):
+        """
+        Wait for this thread's turn to write.
+
+        Raises:
+            TimeoutError: If the turn did not come within ``timeout`` seconds
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._owner == me:
+                self._depth += 1
+                return
+            self._waiting.append(me)
+            try:
+                ready = self._condition.wait_for(
+                    lambda: self._owner is None and self._waiting[0] == me, self.timeout
+                )
+                if not ready:
+                    raise TimeoutError('Timed out waiting for the SQLite write queue')
+            finally:
+                self._waiting.remove(me)
+            self._owner = me
+            self._depth = 1
+            # Reason: the next waiter may already be first in line once this one leaves the deque
+            self._condition.notify_all()
+
+    def release(self):
+        """Give up this thread's turn."""
+        with self._condition:
+            if self._owner != threading.get_ident():
+                raise RuntimeError('Write queue released by a thread that does not hold it')
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                self._condition.notify_all()
+
+    @property
+    def pending(self):
+        """Number of threads waiting for a turn."""
+        with self._condition:
+            return len(self._waiting)
+
+
+def is_file_database(uri):
+    """
+    Check whether a database URI names an SQLite file.
+
+    Args:
+        uri (str): SQLAlchemy database URI
+
+    Returns:
+        bool: True for ``sqlite:///path``, False for other databases and in-memory SQLite
+    """
+    if not uri.startswith('sqlite'):
+        return False
+    path = uri.split(':///', 1)[-1] if ':///' in uri else ''
+    return bool(path) and not path.startswith(':memory:') and 'mode=memory' not in uri
+
+
+def _apply_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    return on_connect
+
+
+def _write_queue():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('sqlite_write_queue')
+
+
+def _take_turn(session):
+    """Wait for this thread's write turn before the transaction's first write."""
+    queue = _write_queue()
+    if queue is None or session.info.get(_SESSION_KEY):
+        return
+    queue.acquire()
+    session.info[_SESSION_KEY] = queue
+
+
+def _before_flush(session, flush_context, instances):
+    _take_turn(session)
+
+
+def _do_orm_execute(orm_execute_state):
+    # Bulk UPDATE and DELETE statements write without flushing
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        _take_turn(orm_execute_state.session)
+
+
+def _after_transaction_end(session, transaction):
+    """Hand the turn on once the outermost transaction commits or rolls back."""
+    if transaction.parent is not None:
+        return
+    queue = session.info.pop(_SESSION_KEY, None)
+    if queue is not None:
+        queue.release()
+
+
+def init_app(app):
+    """
+    Tune SQLite connections and queue writes when SQLite production mode is on.
+
+    Args:
+        app: The Flask application
+    """
+    global _listening
+    if not app.config['SQLITE_PRODUCTION_MODE'] or not is_file_database(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+
+    with app.app_context():
+        event.listen(db.engine, 'connect', _apply_pragmas(dict(app.config['SQLITE_PRAGMAS'])))
+    busy_timeout = app.config['SQLITE_PRAGMAS'].get('busy_timeout')
+    app.extensions['sqlite_write_queue'] = WriteQueue(timeout=busy_timeout / 1000 if busy_timeout else None)
+
+    if not _listening:
+        event.listen(db.session, 'before_flush', _before_flush)
+        event.listen(db.session, 'do_orm_execute', _do_orm_execute)
+        event.listen(db.session, 'after_transaction_end', _after_transaction_end)
+        _listening = True
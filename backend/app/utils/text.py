@@ -0,0 +1,51 @@
+"""
+Text normalization helpers shared by the search services.
+"""
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r'\s+')
+_WORD = re.compile(r'\w+')
+
+
+def normalize_text(value):
+    """
+    Normalize a string for case- and accent-insensitive matching.
+
+    Args:
+        value (str): The text to normalize
+
+    Returns:
+        str: Lowercased text with accents stripped and whitespace collapsed
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE.sub(' ', stripped.casefold()).strip()
+
+
+def tokenize(value):
+    """
+    Split text into normalized word tokens.
+
+    Args:
+        value (str): The text to tokenize
+
+    Returns:
+        list: Normalized word tokens in order of appearance
+    """
+    return _WORD.findall(normalize_text(value))
+
+
+def slugify(value):
+    """
+    Turn text into a lowercase, hyphen-separated name safe for URLs and file names.
+
+    Args:
+        value (str): The text to convert
+
+    Returns:
+        str: Normalized words joined with hyphens (empty if there are none)
+    """
+    return '-'.join(tokenize(value))
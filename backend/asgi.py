@@ -0,0 +1,8 @@
+"""
+ASGI entry point for the PovertyLine application.
+
+Run with an ASGI server, e.g. ``uvicorn asgi:app --workers 2``.
+"""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,6 @@
+"""
+Benchmark scripts for the PovertyLine backend.
+
+Each module can be run directly, e.g. ``python -m benchmarks.bench_json_encoding``
+from the backend directory.
+"""
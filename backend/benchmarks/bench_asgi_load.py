@@ -0,0 +1,187 @@
+"""
+Benchmark concurrent reads served by gunicorn sync workers versus the ASGI app.
+
+Seeds an SQLite file, then starts each server in turn on a free port:
+gunicorn with sync workers on ``wsgi:app``, and uvicorn on ``asgi:app``.
+A pool of client threads keeps ``--concurrency`` requests in flight
+against the public listing, single resources and ``/api/auth/me`` for a
+fixed duration. Reports requests per second, p50/p99 latency and the
+servers' total resident memory, so throughput can be compared per
+megabyte as well as in absolute terms.
+
+Usage:
+    python -m benchmarks.bench_asgi_load [--concurrency 64] [--seconds 10]
+        [--sync-workers 4] [--asgi-workers 1] [--resources 500]
+"""
+import argparse
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(path, resources):
+    """Create the schema and generated data; return a user's access token and public resource IDs."""
+    from flask_jwt_extended import create_access_token
+    from app import create_app, db
+    from app.models import Resource, ResourceStatus, User, UserRole
+    from app.services.seed import seed_database
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+    with app.app_context():
+        db.create_all()
+        seed_database(users=max(resources // 5, 2), resources=resources, seed=42)
+        user = User.query.filter_by(role=UserRole.USER.value).first()
+        token = create_access_token(identity=user, additional_claims=user.token_claims())
+        resource_ids = [row.id for row in Resource.query.with_entities(Resource.id)
+                        .filter_by(status=ResourceStatus.APPROVED.value).order_by(Resource.id).limit(20)]
+        db.engine.dispose()
+    return token, resource_ids
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/resources/1')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of a process and its children, from /proc."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+            with open(f'/proc/{current}/task/{current}/children') as children:
+                pending.extend(int(child) for child in children.read().split())
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def load(port, token, concurrency, seconds, resource_ids):
+    """Keep ``concurrency`` requests in flight; return (latencies in ms, errors)."""
+    paths = ['/api/resources?category=food', '/api/auth/me'] + [f'/api/resources/{i}' for i in resource_ids]
+    deadline = time.monotonic() + seconds
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def loop(seed_value):
+        rng = random.Random(seed_value)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        mine, failed = [], 0
+        while time.monotonic() < deadline:
+            path = rng.choice(paths)
+            headers = {'Authorization': f'Bearer {token}'} if path == '/api/auth/me' else {}
+            started = time.perf_counter()
+            try:
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                except (ConnectionError, http.client.RemoteDisconnected):
+                    # Reason: servers close idle or restarting workers' keep-alive connections; retry once
+                    connection.close()
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            mine.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+            errors.append(failed)
+
+    pool = [threading.Thread(target=loop, args=(i,)) for i in range(concurrency)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies, sum(errors)
+
+
+def run(label, command, env, args, token, resource_ids):
+    port = free_port()
+    server = subprocess.Popen([arg.format(port=port) for arg in command], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        load(port, token, args.concurrency, 1, resource_ids)  # warm up caches and pools
+        latencies, errors = load(port, token, args.concurrency, args.seconds, resource_ids)
+        rss = process_tree_rss(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    latencies.sort()
+    return {
+        'label': label,
+        'rps': len(latencies) / args.seconds,
+        'p50': latencies[len(latencies) // 2] if latencies else 0,
+        'p99': latencies[int(len(latencies) * 0.99)] if latencies else 0,
+        'errors': errors,
+        'rss': rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--concurrency', type=int, default=64, help='Requests kept in flight')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of each run')
+    parser.add_argument('--sync-workers', type=int, default=4, help='gunicorn sync worker processes')
+    parser.add_argument('--asgi-workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--resources', type=int, default=500, help='Resources in the database')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite')
+        token, resource_ids = seed(path, args.resources)
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}', FLASK_ENV='default',
+                   SQLITE_PRODUCTION_MODE='true')
+        servers = [
+            (f'gunicorn sync x{args.sync_workers}',
+             [sys.executable, '-m', 'gunicorn', '--workers', str(args.sync_workers),
+              '--bind', '127.0.0.1:{port}', 'wsgi:app']),
+            (f'uvicorn asgi x{args.asgi_workers}',
+             [sys.executable, '-m', 'uvicorn', '--workers', str(args.asgi_workers), '--no-access-log',
+              '--port', '{port}', 'asgi:app']),
+        ]
+        results = [run(label, command, env, args, token, resource_ids) for label, command in servers]
+
+    print(f'{args.concurrency} concurrent clients, {args.seconds:g}s')
+    print(f"{'':22} {'req/s':>8} {'p50':>9} {'p99':>9} {'errors':>7} {'RSS':>9} {'req/s/100MB':>12}")
+    for result in results:
+        print(f"{result['label']:22} {result['rps']:>8.0f} {result['p50']:>7.1f}ms {result['p99']:>7.1f}ms "
+              f"{result['errors']:>7} {result['rss'] / 1e6:>7.0f}MB {result['rps'] / (result['rss'] / 1e8):>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
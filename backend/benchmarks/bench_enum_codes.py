@@ -0,0 +1,121 @@
+"""
+Benchmark string versus integer-coded enum columns on a large resources table.
+
+Builds two SQLite databases with the same rows and indexes as the
+``resources`` table's status/category columns, one storing the enum
+strings and one storing the codes from ``RESOURCE_STATUS`` and
+``RESOURCE_CATEGORY``, and reports table and index size and the time of
+the filters and counts the API runs on those columns.
+
+Usage:
+    python -m benchmarks.bench_enum_codes [--rows 1000000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import timeit
+from app.models.resource import RESOURCE_CATEGORY, RESOURCE_STATUS, ResourceCategory, ResourceStatus
+
+SCHEMA = """
+CREATE TABLE resources (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    category {category} NOT NULL,
+    status {status} NOT NULL,
+    provider_id INTEGER NOT NULL
+);
+CREATE INDEX ix_resources_status_category ON resources (status, category);
+CREATE INDEX ix_resources_provider_status_category ON resources (provider_id, status, category);
+"""
+
+QUERIES = {
+    'approved in category': 'SELECT COUNT(*) FROM resources WHERE status = ? AND category = ?',
+    'counts per status': 'SELECT status, COUNT(*) FROM resources GROUP BY status',
+    'provider dashboard': 'SELECT status, COUNT(*) FROM resources WHERE provider_id = ? GROUP BY status',
+}
+
+
+def generate_rows(count, seed=42):
+    """Yield (title, category, status, provider_id) with a realistic status mix."""
+    rng = random.Random(seed)
+    categories = [category.value for category in ResourceCategory]
+    statuses = [status.value for status in ResourceStatus]
+    weights = [10, 75, 5, 5, 5]  # mostly approved
+    for i in range(count):
+        yield (f'Resource {i}', rng.choice(categories), rng.choices(statuses, weights)[0], rng.randrange(1, 2001))
+
+
+def build(path, rows, coded):
+    """Create and fill one database; return the connection."""
+    connection = sqlite3.connect(path)
+    column_type = 'SMALLINT' if coded else 'VARCHAR(50)'
+    connection.executescript(SCHEMA.format(category=column_type, status=column_type))
+    if coded:
+        rows = ((title, RESOURCE_CATEGORY.encode(category), RESOURCE_STATUS.encode(status), provider)
+                for title, category, status, provider in rows)
+    connection.executemany(
+        'INSERT INTO resources (title, category, status, provider_id) VALUES (?, ?, ?, ?)', rows
+    )
+    connection.commit()
+    connection.execute('VACUUM')
+    connection.execute('ANALYZE')
+    return connection
+
+
+def object_sizes(connection):
+    """Bytes used by the table and each index, or None if dbstat is unavailable."""
+    try:
+        return dict(connection.execute('SELECT name, SUM(pgsize) FROM dbstat GROUP BY name'))
+    except sqlite3.OperationalError:
+        return None
+
+
+def time_query(connection, sql, params, repeat):
+    """Best time in milliseconds over ``repeat`` runs."""
+    runs = timeit.repeat(lambda: connection.execute(sql, params).fetchall(), number=1, repeat=repeat)
+    return min(runs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the table')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query measurement')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for coded in (False, True):
+            label = 'codes' if coded else 'strings'
+            path = os.path.join(directory, f'{label}.sqlite')
+            connection = build(path, generate_rows(args.rows), coded)
+            approved = RESOURCE_STATUS.encode('approved') if coded else 'approved'
+            food = RESOURCE_CATEGORY.encode('food') if coded else 'food'
+            params = {
+                'approved in category': (approved, food),
+                'counts per status': (),
+                'provider dashboard': (17,),
+            }
+            results[label] = {
+                'file': os.path.getsize(path),
+                'sizes': object_sizes(connection),
+                'times': {name: time_query(connection, sql, params[name], args.repeat)
+                          for name, sql in QUERIES.items()},
+            }
+            connection.close()
+
+    print(f'{args.rows:,} rows')
+    print(f"{'':40} {'strings':>12} {'codes':>12}")
+    print(f"{'database file':40} {results['strings']['file'] / 1e6:>10.1f}MB {results['codes']['file'] / 1e6:>10.1f}MB")
+    if results['strings']['sizes'] and results['codes']['sizes']:
+        for name in ('resources', 'ix_resources_status_category', 'ix_resources_provider_status_category'):
+            strings, codes = results['strings']['sizes'][name], results['codes']['sizes'][name]
+            print(f'{name:40} {strings / 1e6:>10.1f}MB {codes / 1e6:>10.1f}MB')
+    for name in QUERIES:
+        strings, codes = results['strings']['times'][name], results['codes']['times'][name]
+        print(f'{name:40} {strings:>10.2f}ms {codes:>10.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark JSON encoding and compression for a 1,000-resource listing.
+
+Compares Flask's default JSON provider (pretty-printed as in debug mode,
+and compact) with the orjson provider, and reports the payload size after
+gzip and brotli compression.
+
+Usage:
+    python -m benchmarks.bench_json_encoding [--count 1000] [--repeat 20]
+"""
+import argparse
+import timeit
+from datetime import date, datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.utils.compression import compress, brotli
+from app.utils.json_provider import ORJSONProvider
+
+
+def build_listing(count):
+    """Build a response body shaped like GET /api/resources."""
+    now = datetime(2025, 5, 13, 12, 0, 0)
+    categories = ['food', 'housing', 'healthcare', 'employment', 'education']
+    resources = []
+    for i in range(count):
+        resources.append({
+            'id': i + 1,
+            'title': f'Community Resource {i}',
+            'description': 'Weekly distribution for families in need. Bring a bag and arrive early.',
+            'category': categories[i % len(categories)],
+            'status': 'approved',
+            'provider_id': i % 50 + 1,
+            'location': 'Downtown Community Center',
+            'address': f'{100 + i} Market St',
+            'city': 'San Francisco',
+            'state': 'California',
+            'zip_code': '94105',
+            'contact_name': 'Jane Smith',
+            'contact_phone': '555-123-4567',
+            'contact_email': 'jane@example.com',
+            'start_date': date(2025, 1, 1) + timedelta(days=i % 90),
+            'end_date': None,
+            'requirements': ['Photo ID', 'Proof of residence'],
+            'additional_info': 'Please call ahead to confirm availability',
+            'approved_at': now,
+            'approved_by_id': 1,
+            'rejection_reason': None,
+            'created_at': now - timedelta(days=i),
+            'updated_at': now,
+        })
+    return {'resources': resources, 'count': count}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1000, help='Resources in the listing')
+    parser.add_argument('--repeat', type=int, default=20, help='Encodes per measurement')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    body = build_listing(args.count)
+
+    default = DefaultJSONProvider(app)
+    fast = ORJSONProvider(app)
+    encoders = {
+        'flask default (debug, indented)': lambda: default.dumps(body, indent=2).encode('utf-8'),
+        'flask default (compact)': lambda: default.dumps(body, separators=(',', ':')).encode('utf-8'),
+        'orjson provider': lambda: fast.dumps(body).encode('utf-8'),
+    }
+
+    print(f'Listing of {args.count} resources, best of 3 x {args.repeat} encodes\n')
+    print(f'{"encoder":34} {"encode ms":>10} {"raw KB":>9} {"gzip KB":>9} {"br KB":>9}')
+    for name, encode in encoders.items():
+        seconds = min(timeit.repeat(encode, number=args.repeat, repeat=3)) / args.repeat
+        payload = encode()
+        gzip_size = len(compress(payload, 'gzip', 6))
+        br_size = len(compress(payload, 'br', 6)) if brotli is not None else float('nan')
+        print(f'{name:34} {seconds * 1000:10.2f} {len(payload) / 1024:9.1f} '
+              f'{gzip_size / 1024:9.1f} {br_size / 1024:9.1f}')
+
+
+if __name__ == '__main__':
+    main()
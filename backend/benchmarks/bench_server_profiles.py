@@ -0,0 +1,99 @@
+"""
+Benchmark the gunicorn server profile against the development server.
+
+Seeds an SQLite file and serves it in turn with the Werkzeug development
+server in debug mode (what ``run_simple.py`` and ``python wsgi.py`` do),
+plain ``gunicorn wsgi:app``, and ``gunicorn -c gunicorn.conf.py`` with and
+without preloading. Uses the client load and endpoints of
+``bench_asgi_load``, and reports requests per second, latency, and the
+servers' proportional set size. PSS splits shared pages between the
+processes sharing them, so copy-on-write savings from preloading show up.
+
+Usage:
+    python -m benchmarks.bench_server_profiles [--concurrency 32] [--seconds 10]
+        [--resources 500]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_asgi_load import BACKEND_DIR, seed, free_port, wait_until_ready, load
+
+DEV_SERVER = "from wsgi import app; app.run(debug=True, use_reloader=False, port={port})"
+
+
+def process_tree_pss(pid):
+    """Proportional set size in bytes of a process and its children, from /proc."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/smaps_rollup') as rollup:
+                for line in rollup:
+                    if line.startswith('Pss:'):
+                        total += int(line.split()[1]) * 1024
+            with open(f'/proc/{current}/task/{current}/children') as children:
+                pending.extend(int(child) for child in children.read().split())
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def run(command, env, args, token, resource_ids):
+    port = free_port()
+    server = subprocess.Popen([arg.format(port=port) for arg in command], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        started = time.monotonic()
+        wait_until_ready(port)
+        startup = time.monotonic() - started
+        load(port, token, args.concurrency, 1, resource_ids)  # warm up caches and pools
+        latencies, errors = load(port, token, args.concurrency, args.seconds, resource_ids)
+        pss = process_tree_pss(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    latencies.sort()
+    return {
+        'rps': len(latencies) / args.seconds,
+        'p50': latencies[len(latencies) // 2] if latencies else 0,
+        'p99': latencies[int(len(latencies) * 0.99)] if latencies else 0,
+        'errors': errors,
+        'pss': pss,
+        'startup': startup,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--concurrency', type=int, default=32, help='Requests kept in flight')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of each run')
+    parser.add_argument('--resources', type=int, default=500, help='Resources in the database')
+    args = parser.parse_args()
+
+    gunicorn = [sys.executable, '-m', 'gunicorn', '--bind', '127.0.0.1:{port}']
+    profiles = [
+        ('dev server (debug)', [sys.executable, '-c', DEV_SERVER], {}),
+        ('gunicorn defaults', gunicorn + ['wsgi:app'], {}),
+        ('profile, no preload', gunicorn + ['-c', 'gunicorn.conf.py'], {'GUNICORN_PRELOAD': 'false'}),
+        ('profile', gunicorn + ['-c', 'gunicorn.conf.py'], {}),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite')
+        token, resource_ids = seed(path, args.resources)
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}', FLASK_ENV='default',
+                   SQLITE_PRODUCTION_MODE='true')
+        results = [(label, run(command, dict(env, **extra), args, token, resource_ids)) for label, command, extra in profiles]
+
+    print(f'{args.concurrency} concurrent clients, {args.seconds:g}s, {os.cpu_count()} CPUs')
+    print(f"{'':22} {'req/s':>8} {'p50':>9} {'p99':>9} {'errors':>7} {'PSS':>9} {'startup':>9}")
+    for label, result in results:
+        print(f"{label:22} {result['rps']:>8.0f} {result['p50']:>7.1f}ms {result['p99']:>7.1f}ms "
+              f"{result['errors']:>7} {result['pss'] / 1e6:>7.0f}MB {result['startup']:>8.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark mixed read/write throughput on SQLite with and without production mode.
+
+Starts several worker processes (as gunicorn would), each running a few
+threads that list approved resources in a category or edit a resource and
+commit, for a fixed duration. Runs once with SQLite's defaults and once
+with ``SQLITE_PRODUCTION_MODE`` (WAL, tuned pragmas and the write queue),
+and reports operations per second, "database is locked" errors and the
+slowest write.
+
+Usage:
+    python -m benchmarks.bench_sqlite_concurrency [--processes 4] [--threads 4]
+        [--seconds 10] [--write-ratio 0.2] [--resources 2000]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+
+
+def make_app(path, production_mode, busy_timeout_ms):
+    from app import create_app
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'SQLITE_PRODUCTION_MODE': production_mode,
+        'SQLITE_PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': busy_timeout_ms,
+            'cache_size': -64000,
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+        },
+        # Reason: without production mode, pysqlite still waits this long for a lock
+        'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'timeout': busy_timeout_ms / 1000}},
+    })
+
+
+def seed(path, resources):
+    """Create the schema and the resources to read and edit."""
+    from app import db
+    from app.services.seed import seed_database
+
+    app = make_app(path, False, 5000)
+    with app.app_context():
+        db.create_all()
+        seed_database(users=max(resources // 20, 2), resources=resources, seed=42)
+        db.engine.dispose()
+
+
+def run_worker(path, production_mode, threads, seconds, write_ratio, resources, busy_timeout_ms, results):
+    """One worker process: run threads until the deadline and report counts."""
+    from app import db
+    from app.models import Resource, ResourceCategory, ResourceStatus
+
+    app = make_app(path, production_mode, busy_timeout_ms)
+    categories = [category.value for category in ResourceCategory]
+    deadline = time.monotonic() + seconds
+    totals = {'reads': 0, 'writes': 0, 'locked': 0, 'max_write_ms': 0.0}
+    lock = threading.Lock()
+
+    def loop(seed_value):
+        rng = random.Random(seed_value)
+        counts = {'reads': 0, 'writes': 0, 'locked': 0, 'max_write_ms': 0.0}
+        with app.app_context():
+            while time.monotonic() < deadline:
+                try:
+                    if rng.random() < write_ratio:
+                        started = time.perf_counter()
+                        resource = db.session.get(Resource, rng.randrange(1, resources + 1))
+                        resource.contact_name = f'Edited {rng.random():.6f}'
+                        db.session.commit()
+                        elapsed = (time.perf_counter() - started) * 1000
+                        counts['max_write_ms'] = max(counts['max_write_ms'], elapsed)
+                        counts['writes'] += 1
+                    else:
+                        Resource.query.filter_by(
+                            status=ResourceStatus.APPROVED.value, category=rng.choice(categories)
+                        ).limit(50).all()
+                        db.session.rollback()
+                        counts['reads'] += 1
+                except Exception as e:
+                    db.session.rollback()
+                    if 'locked' not in str(e):
+                        raise
+                    counts['locked'] += 1
+        with lock:
+            for key in ('reads', 'writes', 'locked'):
+                totals[key] += counts[key]
+            totals['max_write_ms'] = max(totals['max_write_ms'], counts['max_write_ms'])
+
+    pool = [threading.Thread(target=loop, args=(os.getpid() * 100 + i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(totals)
+
+
+def run(args, production_mode):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite')
+        seed(path, args.resources)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(
+                path, production_mode, args.threads, args.seconds, args.write_ratio,
+                args.resources, args.busy_timeout, results
+            ))
+            for _ in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    return {
+        'reads': sum(total['reads'] for total in totals),
+        'writes': sum(total['writes'] for total in totals),
+        'locked': sum(total['locked'] for total in totals),
+        'max_write_ms': max(total['max_write_ms'] for total in totals),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--processes', type=int, default=4, help='Worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per process')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of each run')
+    parser.add_argument('--write-ratio', type=float, default=0.2, help='Fraction of operations that write')
+    parser.add_argument('--resources', type=int, default=2000, help='Resources in the database')
+    parser.add_argument('--busy-timeout', type=int, default=5000, help='Lock wait in milliseconds')
+    args = parser.parse_args()
+
+    print(f'{args.processes} processes x {args.threads} threads, {args.write_ratio:.0%} writes, {args.seconds:g}s')
+    print(f"{'':26} {'reads/s':>10} {'writes/s':>10} {'locked':>8} {'max write':>11}")
+    for label, production_mode in (('SQLite defaults', False), ('SQLite production mode', True)):
+        result = run(args, production_mode)
+        print(f"{label:26} {result['reads'] / args.seconds:>10.0f} {result['writes'] / args.seconds:>10.0f} "
+              f"{result['locked']:>8} {result['max_write_ms']:>9.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""
+gunicorn configuration for the PovertyLine application.
+
+Run from the backend directory with ``gunicorn -c gunicorn.conf.py``.
+Settings come from ``GUNICORN_*`` environment variables, and unset ones
+are derived from the CPU count and database pool size. See
+``app/utils/server.py`` for how they are derived.
+"""
+import gc
+from app import schemas
+from app.utils.server import server_settings, reset_after_fork
+
+globals().update(server_settings())
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        # Schemas load lazily; build them once here so workers share them
+        schemas.load_all()
+        # Reason: move the preloaded app's objects out of the collector's reach so that
+        # collections in the workers do not write to, and so copy, the shared pages
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        reset_after_fork(server.app.wsgi())
@@ -4,7 +4,6 @@ Database initialization script for the PovertyLine application.
 This script creates the initial database tables and populates them with sample data.
 """
 import os
-import json
 from datetime import datetime, timedelta, date
 from app import create_app, db, bcrypt
 from app.models import User, UserRole, UserStatus, Profile, Resource, ResourceCategory, ResourceStatus
@@ -88,7 +87,7 @@ def init_db():
         user_profile.city = 'User City'
         user_profile.state = 'User State'
         user_profile.zip_code = '67890'
-        user_profile.needs = json.dumps(['food', 'housing', 'employment'])
+        user_profile.needs = ['food', 'housing', 'employment']
         user_profile.update_completion_percentage()
         user_profile.save()
         
@@ -109,7 +108,7 @@ def init_db():
                 'contact_email': 'jane@example.com',
                 'start_date': date.today(),
                 'end_date': date.today() + timedelta(days=90),
-                'requirements': json.dumps(['Photo ID', 'Proof of residence']),
+                'requirements': ['Photo ID', 'Proof of residence'],
                 'additional_info': 'Distribution occurs every Tuesday from 10am to 2pm.',
                 'status': ResourceStatus.APPROVED.value,
                 'approved_at': datetime.utcnow(),
@@ -130,7 +129,7 @@ def init_db():
                 'contact_email': 'robert@example.com',
                 'start_date': date.today(),
                 'end_date': date.today() + timedelta(days=180),
-                'requirements': json.dumps(['Photo ID', 'Intake interview', 'Background check']),
+                'requirements': ['Photo ID', 'Intake interview', 'Background check'],
                 'additional_info': 'Open 24/7 for emergency intake.',
                 'status': ResourceStatus.APPROVED.value,
                 'approved_at': datetime.utcnow(),
@@ -151,7 +150,7 @@ def init_db():
                 'contact_email': 'michael@example.com',
                 'start_date': date.today() + timedelta(days=7),
                 'end_date': date.today() + timedelta(days=7),
-                'requirements': json.dumps(['Pre-registration required', 'Must be 18 or older']),
+                'requirements': ['Pre-registration required', 'Must be 18 or older'],
                 'additional_info': 'Workshop runs from 9am to 3pm. Lunch will be provided.',
                 'status': ResourceStatus.PENDING.value
             }
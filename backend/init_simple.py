@@ -3,7 +3,6 @@ Simplified database initialization script for the PovertyLine application.
 This script doesn't rely on Click and can be run directly with Python.
 """
 import os
-import json
 from datetime import datetime, timedelta, date
 
 # Set environment variables manually
@@ -96,7 +95,7 @@ def init_db():
         user_profile.city = 'User City'
         user_profile.state = 'User State'
         user_profile.zip_code = '67890'
-        user_profile.needs = json.dumps(['food', 'housing', 'employment'])
+        user_profile.needs = ['food', 'housing', 'employment']
         user_profile.update_completion_percentage()
         user_profile.save()
         
@@ -117,7 +116,7 @@ def init_db():
                 'contact_email': 'jane@example.com',
                 'start_date': date.today(),
                 'end_date': date.today() + timedelta(days=90),
-                'requirements': json.dumps(['Photo ID', 'Proof of residence']),
+                'requirements': ['Photo ID', 'Proof of residence'],
                 'additional_info': 'Distribution occurs every Tuesday from 10am to 2pm.',
                 'status': ResourceStatus.APPROVED.value,
                 'approved_at': datetime.utcnow(),
@@ -138,7 +137,7 @@ def init_db():
                 'contact_email': 'robert@example.com',
                 'start_date': date.today(),
                 'end_date': date.today() + timedelta(days=180),
-                'requirements': json.dumps(['Photo ID', 'Intake interview', 'Background check']),
+                'requirements': ['Photo ID', 'Intake interview', 'Background check'],
                 'additional_info': 'Open 24/7 for emergency intake.',
                 'status': ResourceStatus.APPROVED.value,
                 'approved_at': datetime.utcnow(),
@@ -159,7 +158,7 @@ def init_db():
                 'contact_email': 'michael@example.com',
                 'start_date': date.today() + timedelta(days=7),
                 'end_date': date.today() + timedelta(days=7),
-                'requirements': json.dumps(['Pre-registration required', 'Must be 18 or older']),
+                'requirements': ['Pre-registration required', 'Must be 18 or older'],
                 'additional_info': 'Workshop runs from 9am to 3pm. Lunch will be provided.',
                 'status': ResourceStatus.PENDING.value
             }
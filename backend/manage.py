@@ -7,13 +7,11 @@ initializing the database, and running tests.
 """
 import os
 import click
-from flask.cli import FlaskGroup
+from flask.cli import FlaskGroup, with_appcontext
 from app import create_app, db
-from app.models import User, Profile, Resource
 
-app = create_app()
-
-@click.group(cls=FlaskGroup, create_app=lambda: app)
+# Reason: FlaskGroup builds the app only when a command needs it, not when this module is imported
+@click.group(cls=FlaskGroup, create_app=create_app)
 def cli():
     """Management script for the PovertyLine application."""
     pass
@@ -30,33 +28,33 @@ def init_db():
 @click.option("--email", prompt=True, help="Admin email address")
 @click.option("--name", prompt=True, help="Admin name")
 @click.option("--password", prompt=True, hide_input=True, confirmation_prompt=True, help="Admin password")
+@with_appcontext
 def create_admin(email, name, password):
     """Create an admin user."""
-    from app.models import User, UserRole, UserStatus
+    from app.models import User, UserRole, UserStatus, Profile
+    
+    # Check if user already exists
+    existing_user = User.query.filter_by(email=email).first()
+    if existing_user:
+        click.echo(f"User with email {email} already exists.")
+        return
+    
+    # Create new admin user
+    admin = User(
+        email=email,
+        name=name,
+        role=UserRole.ADMIN.value,
+        status=UserStatus.ACTIVE.value,
+        email_verified=True
+    )
+    admin.password = password
+    admin.save()
+    
+    # Create admin profile
+    profile = Profile(user_id=admin.id)
+    profile.save()
     
-    with app.app_context():
-        # Check if user already exists
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
-            click.echo(f"User with email {email} already exists.")
-            return
-        
-        # Create new admin user
-        admin = User(
-            email=email,
-            name=name,
-            role=UserRole.ADMIN.value,
-            status=UserStatus.ACTIVE.value,
-            email_verified=True
-        )
-        admin.password = password
-        admin.save()
-        
-        # Create admin profile
-        profile = Profile(user_id=admin.id)
-        profile.save()
-        
-        click.echo(f"Admin user {email} created successfully!")
+    click.echo(f"Admin user {email} created successfully!")
 
 @cli.command("run-tests")
 def run_tests():
@@ -67,14 +65,14 @@ def run_tests():
 
 @cli.command("reset-db")
 @click.confirmation_option(prompt="Are you sure you want to reset the database? This will delete all data.")
+@with_appcontext
 def reset_db():
     """Reset the database by dropping all tables and recreating them."""
-    with app.app_context():
-        click.echo("Dropping all tables...")
-        db.drop_all()
-        click.echo("Creating all tables...")
-        db.create_all()
-        click.echo("Database reset successfully!")
+    click.echo("Dropping all tables...")
+    db.drop_all()
+    click.echo("Creating all tables...")
+    db.create_all()
+    click.echo("Database reset successfully!")
 
 @cli.command("migrate")
 @click.option("--message", "-m", help="Migration message")
@@ -1,75 +1,72 @@
 """
 Test configuration for the PovertyLine application.
 """
-import os
+import shutil
 import pytest
-import tempfile
+from flask_jwt_extended import create_access_token
 from app import create_app, db
-from app.models import User, UserRole, UserStatus, Profile, Resource
+from app.models import User, UserRole, UserStatus, Profile, Resource, ResourceCategory, ResourceStatus
 
-@pytest.fixture
-def app():
-    """Create and configure a Flask app for testing."""
-    # Create a temporary file to isolate the database for each test
-    db_fd, db_path = tempfile.mkstemp()
-    app = create_app({
-        'TESTING': True,
-        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
-        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
-        'JWT_SECRET_KEY': 'test-secret-key',
-        'JWT_ACCESS_TOKEN_EXPIRES': 3600,  # 1 hour
-    })
+# Settings shared by the template database and every test app
+TEST_SETTINGS = {
+    'TESTING': True,
+    'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    'JWT_SECRET_KEY': 'test-secret-key',
+    'JWT_ACCESS_TOKEN_EXPIRES': 3600,  # 1 hour
+}
+
+def seed_users():
+    """Create the test users and their profiles."""
+    users = [
+        User(email='admin@test.com', name='Test Admin', role=UserRole.ADMIN.value,
+             status=UserStatus.ACTIVE.value, email_verified=True),
+        User(email='provider@test.com', name='Test Provider', role=UserRole.PROVIDER.value,
+             status=UserStatus.ACTIVE.value, email_verified=True),
+        User(email='user@test.com', name='Test User', role=UserRole.USER.value,
+             status=UserStatus.ACTIVE.value, email_verified=True),
+    ]
+    for user, password in zip(users, ('TestAdmin123', 'TestProvider123', 'TestUser123')):
+        user.password = password
+        user.save()
+    for user in users:
+        Profile(user_id=user.id).save()
+
+@pytest.fixture(scope='session')
+def template_db(tmp_path_factory):
+    """
+    A database file with the schema and test users, built once per test session.
 
-    # Create the database and load test data
+    Tests get a copy of this file instead of creating tables and hashing
+    passwords again. Under pytest-xdist each worker has its own
+    ``tmp_path_factory`` directory, and so its own template.
+    """
+    path = tmp_path_factory.mktemp('db') / 'template.sqlite'
+    app = create_app(dict(TEST_SETTINGS, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}'))
     with app.app_context():
         db.create_all()
-        
-        # Create test users
-        admin = User(
-            email='admin@test.com',
-            name='Test Admin',
-            role=UserRole.ADMIN.value,
-            status=UserStatus.ACTIVE.value,
-            email_verified=True
-        )
-        admin.password = 'TestAdmin123'
-        admin.save()
-        
-        provider = User(
-            email='provider@test.com',
-            name='Test Provider',
-            role=UserRole.PROVIDER.value,
-            status=UserStatus.ACTIVE.value,
-            email_verified=True
-        )
-        provider.password = 'TestProvider123'
-        provider.save()
-        
-        user = User(
-            email='user@test.com',
-            name='Test User',
-            role=UserRole.USER.value,
-            status=UserStatus.ACTIVE.value,
-            email_verified=True
-        )
-        user.password = 'TestUser123'
-        user.save()
-        
-        # Create test profiles
-        admin_profile = Profile(user_id=admin.id)
-        admin_profile.save()
-        
-        provider_profile = Profile(user_id=provider.id)
-        provider_profile.save()
-        
-        user_profile = Profile(user_id=user.id)
-        user_profile.save()
+        seed_users()
+        db.engine.dispose()
+    return path
+
+@pytest.fixture
+def app(template_db, tmp_path_factory):
+    """Create and configure a Flask app for testing, on its own copy of the template database."""
+    # Reason: a directory apart from tmp_path, which tests use for their own files
+    directory = tmp_path_factory.mktemp('app')
+    db_path = directory / 'test.sqlite'
+    shutil.copyfile(template_db, db_path)
+    app = create_app(dict(
+        TEST_SETTINGS,
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{db_path}',
+        # Per-test directories keep parallel workers from sharing files
+        NOTIFICATIONS_OUTBOX_DIR=str(directory / 'outbox'),
+        SNAPSHOT_DIR=str(directory / 'snapshots'),
+    ))
 
     yield app
 
-    # Close and remove the temporary database
-    os.close(db_fd)
-    os.unlink(db_path)
+    with app.app_context():
+        db.engine.dispose()
 
 @pytest.fixture
 def client(app):
@@ -82,35 +79,40 @@ def runner(app):
     return app.test_cli_runner()
 
 @pytest.fixture
-def auth_headers(client):
+def auth_headers(app):
     """Get auth headers for different user types."""
+    # Tokens are issued as the login endpoint issues them, without a request and password check per user
     headers = {}
-    
-    # Admin login
-    response = client.post('/auth/login', json={
-        'email': 'admin@test.com',
-        'password': 'TestAdmin123'
-    })
-    headers['admin'] = {
-        'Authorization': f'Bearer {response.json["access_token"]}'
-    }
-    
-    # Provider login
-    response = client.post('/auth/login', json={
-        'email': 'provider@test.com',
-        'password': 'TestProvider123'
-    })
-    headers['provider'] = {
-        'Authorization': f'Bearer {response.json["access_token"]}'
-    }
-    
-    # User login
-    response = client.post('/auth/login', json={
-        'email': 'user@test.com',
-        'password': 'TestUser123'
-    })
-    headers['user'] = {
-        'Authorization': f'Bearer {response.json["access_token"]}'
-    }
-    
+    with app.app_context():
+        for kind in ('admin', 'provider', 'user'):
+            user = User.query.filter_by(email=f'{kind}@test.com').first()
+            token = create_access_token(identity=user, additional_claims=user.token_claims())
+            headers[kind] = {'Authorization': f'Bearer {token}'}
     return headers
+
+def create_resource(title, category, city, status=ResourceStatus.APPROVED.value, **fields):
+    """Create a resource owned by the test provider."""
+    provider = User.query.filter_by(email='provider@test.com').first()
+    resource = Resource(
+        title=title,
+        description=fields.pop('description', f'{title} description'),
+        category=category,
+        location=fields.pop('location', city),
+        city=city,
+        state=fields.pop('state', 'TS'),
+        provider_id=provider.id,
+        status=status,
+        **fields
+    )
+    return resource.save()
+
+@pytest.fixture
+def search_resources(app):
+    """Create a small set of resources to search over."""
+    with app.app_context():
+        create_resource('Community Food Pantry', ResourceCategory.FOOD.value, 'Springfield')
+        create_resource('Food Bank Delivery', ResourceCategory.FOOD.value, 'Shelbyville')
+        create_resource('Family Shelter', ResourceCategory.HOUSING.value, 'Springfield')
+        create_resource('Free Clinic', ResourceCategory.HEALTHCARE.value, 'Springfield')
+        create_resource('Pending Food Drive', ResourceCategory.FOOD.value, 'Springfield',
+                        status=ResourceStatus.PENDING.value)
@@ -0,0 +1,105 @@
+"""
+Tests for the ASGI serving mode.
+"""
+import asyncio
+import json
+import pytest
+from app.models import Resource, ResourceStatus
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('asgiref')
+
+from app.asgi import AsyncAPI, async_database_url
+
+@pytest.fixture
+def asgi_app(app):
+    """The ASGI application wrapping the test app."""
+    asgi = AsyncAPI(app)
+    yield asgi
+    asyncio.run(asgi.engine.dispose())
+
+def asgi_get(asgi, path, headers=None, query=''):
+    """Send one GET request through the ASGI app; return (status, headers, JSON body)."""
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'root_path': '', 'scheme': 'http',
+        'query_string': query.encode(), 'http_version': '1.1',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi(scope, receive, send))
+    start = messages[0]
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    response_headers = {name.decode(): value.decode() for name, value in start['headers']}
+    return start['status'], response_headers, json.loads(body) if body else None
+
+def test_async_database_url():
+    """Test that database URIs are switched to async drivers."""
+    assert async_database_url('postgresql://u:p@db/app') == 'postgresql+asyncpg://u:p@db/app'
+    assert async_database_url('postgresql+psycopg2://db/app') == 'postgresql+asyncpg://db/app'
+    assert async_database_url('sqlite:////tmp/app.db') == 'sqlite+aiosqlite:////tmp/app.db'
+    with pytest.raises(ValueError):
+        async_database_url('mysql://db/app')
+
+def test_listing_matches_wsgi(client, asgi_app, search_resources):
+    """Test that the async listing returns the same body as the Flask view."""
+    for query in ('', 'category=food', 'search=shelter', 'include=provider', 'search=comida'):
+        status, _, body = asgi_get(asgi_app, '/api/resources', query=query)
+        assert status == 200
+        assert body == client.get(f'/api/resources?{query}').json
+
+def test_listing_falls_back_for_facets_and_fuzzy(client, asgi_app, search_resources):
+    """Test that requests the async handler does not cover are served by the Flask view."""
+    status, _, body = asgi_get(asgi_app, '/api/resources', query='facets=category')
+    assert status == 200 and 'facets' in body
+
+    status, _, body = asgi_get(asgi_app, '/api/resources', query='search=pantyr')
+    assert status == 200 and body.get('fuzzy') is True
+
+def test_get_resource_with_validators(app, asgi_app, search_resources):
+    """Test that public resources are served with validators and revalidated."""
+    with app.app_context():
+        resource = Resource.query.filter_by(title='Free Clinic').first()
+        pending = Resource.query.filter_by(status=ResourceStatus.PENDING.value).first()
+        resource_id, pending_id = resource.id, pending.id
+
+    status, headers, body = asgi_get(asgi_app, f'/api/resources/{resource_id}')
+    assert status == 200 and body['resource']['title'] == 'Free Clinic'
+    assert 'no-cache' in headers['cache-control']
+
+    status, _, body = asgi_get(asgi_app, f'/api/resources/{resource_id}', {'If-None-Match': headers['etag']})
+    assert status == 304 and body is None
+
+    # Unpublished resources go through the Flask view's access checks
+    status, _, _ = asgi_get(asgi_app, f'/api/resources/{pending_id}')
+    assert status == 403
+    status, _, _ = asgi_get(asgi_app, '/api/resources/9999')
+    assert status == 404
+
+def test_current_user(client, asgi_app, auth_headers):
+    """Test that /auth/me is served for valid tokens and rejected like the Flask view otherwise."""
+    status, headers, body = asgi_get(asgi_app, '/api/auth/me', auth_headers['user'])
+    assert status == 200
+    assert body == client.get('/api/auth/me', headers=auth_headers['user']).json
+
+    status, _, _ = asgi_get(asgi_app, '/api/auth/me', {'If-None-Match': headers['etag'], **auth_headers['user']})
+    assert status == 304
+
+    status, _, _ = asgi_get(asgi_app, '/api/auth/me')
+    assert status == 401
+
+    client.post('/api/auth/logout', headers=auth_headers['user'])
+    status, _, _ = asgi_get(asgi_app, '/api/auth/me', auth_headers['user'])
+    assert status == 401
+
+def test_other_routes_served_by_flask(asgi_app):
+    """Test that routes without an async handler reach the Flask app."""
+    status, _, body = asgi_get(asgi_app, '/api/resources/suggest', query='q=fo')
+    assert status == 200 and 'suggestions' in body
@@ -0,0 +1,138 @@
+"""
+Tests for role and status claims in access tokens.
+"""
+from flask_jwt_extended import decode_token
+from sqlalchemy import event
+from app import db
+from app.models import User, UserRole, UserStatus
+
+def login(client, email, password):
+    """Log in and return authorization headers."""
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    return {'Authorization': f'Bearer {response.json["token"]}'}
+
+def test_token_contains_role_claims(app, client):
+    """Test that login embeds role and status claims in the access token."""
+    response = client.post('/api/auth/login', json={
+        'email': 'provider@test.com',
+        'password': 'TestProvider123'
+    })
+    
+    assert response.status_code == 200
+    with app.app_context():
+        claims = decode_token(response.json['token'])
+    assert claims['sub'] == str(claims['sub'])
+    assert claims['role'] == UserRole.PROVIDER.value
+    assert claims['status'] == UserStatus.ACTIVE.value
+
+def test_admin_check_does_not_load_user(app, client, auth_headers):
+    """Test that admin_required authorizes from claims without loading the user row."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get('/api/resources/all', headers=auth_headers['admin'])
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    
+    assert response.status_code == 200
+    assert not any('users.password' in statement for statement in statements)
+
+def test_role_checks_from_claims(client, auth_headers):
+    """Test that role claims are enforced by the decorators."""
+    assert client.get('/api/resources/all', headers=auth_headers['provider']).status_code == 403
+    assert client.get('/api/users', headers=auth_headers['user']).status_code == 403
+    assert client.get('/api/users', headers=auth_headers['admin']).status_code == 200
+
+def test_role_change_revokes_tokens(app, client, auth_headers):
+    """Test that tokens issued before a role change are rejected."""
+    with app.app_context():
+        provider_id = User.query.filter_by(email='provider@test.com').first().id
+    
+    response = client.put(
+        f'/api/users/{provider_id}',
+        json={'role': UserRole.USER.value},
+        headers=auth_headers['admin']
+    )
+    assert response.status_code == 200
+    
+    # The old token still claims the provider role, so it is revoked
+    response = client.get('/api/resources/my', headers=auth_headers['provider'])
+    assert response.status_code == 401
+    
+    # A fresh token carries the new role
+    headers = login(client, 'provider@test.com', 'TestProvider123')
+    assert client.get('/api/resources/my', headers=headers).status_code == 200
+    response = client.post('/api/resources', json={}, headers=headers)
+    assert response.status_code == 403
+    
+    # Tokens for other users are unaffected
+    assert client.get('/api/users', headers=auth_headers['admin']).status_code == 200
+
+def test_suspension_revokes_tokens(app, client, auth_headers):
+    """Test that suspending a user rejects their existing tokens."""
+    with app.app_context():
+        user = User.query.filter_by(email='user@test.com').first()
+        user.status = UserStatus.SUSPENDED.value
+        db.session.commit()
+    
+    response = client.get('/api/auth/me', headers=auth_headers['user'])
+    assert response.status_code == 401
+
+def test_late_committed_claims_change_is_seen(app):
+    """Test that a change stamped before one already seen, but committed after it, still revokes."""
+    from datetime import datetime, timedelta
+    from app.auth.revocation import ClaimsRevocationCache
+    from app.models.user import claims_version
+
+    with app.app_context():
+        provider = User.query.filter_by(email='provider@test.com').first()
+        user = User.query.filter_by(email='user@test.com').first()
+        cache = ClaimsRevocationCache(0, timedelta(hours=1), timedelta(seconds=60))
+
+        now = datetime.utcnow()
+        provider.claims_changed_at = now
+        db.session.commit()
+        assert not cache.is_revoked(user.id, 0)
+
+        # Stamped earlier than the change already seen, committed only now
+        user.claims_changed_at = now - timedelta(seconds=5)
+        db.session.commit()
+        assert cache.is_revoked(user.id, 0)
+        assert not cache.is_revoked(user.id, claims_version(user.claims_changed_at))
+
+def test_deleted_admin_token_rejected(app, client, auth_headers):
+    """Test that deleting an admin revokes their tokens, although role checks read claims."""
+    with app.app_context():
+        other = User(email='admin2@test.com', name='Second Admin', role=UserRole.ADMIN.value)
+        other.password = 'TestAdmin123'
+        other.save()
+        admin_id = User.query.filter_by(email='admin@test.com').first().id
+        user_id = User.query.filter_by(email='user@test.com').first().id
+    other_headers = login(client, 'admin2@test.com', 'TestAdmin123')
+
+    response = client.delete(f'/api/users/{admin_id}', headers=other_headers)
+    assert response.status_code == 200
+
+    assert client.get('/api/users', headers=auth_headers['admin']).status_code == 401
+    assert client.delete(f'/api/users/{user_id}', headers=auth_headers['admin']).status_code == 401
+    assert client.get('/api/users', headers=other_headers).status_code == 200
+
+def test_deleted_user_token_rejected(app, client, auth_headers):
+    """Test that a deleted user's token gets 401, not an error from the view."""
+    with app.app_context():
+        User.query.filter_by(email='user@test.com').first().delete()
+    assert client.get('/api/auth/me', headers=auth_headers['user']).status_code == 401
+
+    # Rows removed without the ORM leave no deletion record; the lazy user lookup still answers 401
+    with app.app_context():
+        User.query.filter_by(email='provider@test.com').delete()
+        db.session.commit()
+    response = client.get('/api/auth/me', headers=auth_headers['provider'])
+    assert response.status_code == 401
+    assert 'Error loading the user' in response.json['msg']
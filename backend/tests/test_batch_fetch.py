@@ -0,0 +1,122 @@
+"""
+Tests for embedding related objects and batch fetching.
+"""
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+from app.models import Profile, Resource, ResourceCategory, ResourceStatus, User, UserRole
+
+@contextmanager
+def count_queries(app):
+    """Record the SQL statements executed inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+@pytest.fixture
+def many_users(app):
+    """Add more users with profiles so N+1 queries would show."""
+    with app.app_context():
+        for i in range(10):
+            user = User(email=f'member{i}@test.com', name=f'Member {i}', role=UserRole.USER.value)
+            user._password = 'not-a-real-hash'
+            user.profile = Profile(city='Springfield')
+            db.session.add(user)
+        db.session.commit()
+
+def test_users_include_profile(app, client, auth_headers, many_users):
+    """Test that include=profile embeds profiles using a fixed number of queries."""
+    client.get('/api/users', headers=auth_headers['admin'])  # warm per-process caches
+
+    with count_queries(app) as statements:
+        response = client.get('/api/users?include=profile', headers=auth_headers['admin'])
+
+    assert response.status_code == 200
+    assert response.json['count'] == 13
+    assert all(user['profile']['user_id'] == user['id'] for user in response.json['users'])
+    assert len(statements) == 2
+
+def test_users_include_rejects_unknown(client, auth_headers):
+    """Test that unsupported include values are rejected."""
+    response = client.get('/api/users?include=resources', headers=auth_headers['admin'])
+    assert response.status_code == 400
+
+def test_profiles_batch_by_user_ids(app, client, auth_headers, many_users):
+    """Test that profiles can be fetched for a list of user IDs in one query."""
+    with app.app_context():
+        user_ids = [user.id for user in User.query.order_by(User.id).limit(3)]
+    client.get('/api/profiles?ids=1', headers=auth_headers['admin'])  # warm per-process caches
+
+    with count_queries(app) as statements:
+        response = client.get(f'/api/profiles?ids={",".join(map(str, user_ids))}',
+                              headers=auth_headers['admin'])
+
+    assert response.status_code == 200
+    assert sorted(profile['user_id'] for profile in response.json['profiles']) == user_ids
+    assert len(statements) == 1
+
+def test_profiles_batch_validation(app, client, auth_headers):
+    """Test that malformed or oversized ID lists are rejected."""
+    response = client.get('/api/profiles?ids=1,two', headers=auth_headers['admin'])
+    assert response.status_code == 400
+
+    ids = ','.join(str(i) for i in range(app.config['MAX_BATCH_IDS'] + 1))
+    response = client.get(f'/api/profiles?ids={ids}', headers=auth_headers['admin'])
+    assert response.status_code == 400
+
+@pytest.fixture
+def provider_resources(app):
+    """Create approved resources owned by several providers."""
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@test.com').first()
+        for i in range(5):
+            provider = User(email=f'agency{i}@test.com', name=f'Agency {i}', role=UserRole.PROVIDER.value)
+            provider._password = 'not-a-real-hash'
+            db.session.add(provider)
+            db.session.flush()
+            for j in range(2):
+                db.session.add(Resource(
+                    title=f'Service {i}-{j}', description='Groceries and meals', category=ResourceCategory.FOOD.value,
+                    location='Springfield', provider_id=provider.id, status=ResourceStatus.APPROVED.value,
+                    approved_by_id=admin.id
+                ))
+        db.session.commit()
+
+def test_resources_include_provider(app, client, provider_resources):
+    """Test that include=provider embeds providers in a constant number of queries."""
+    with count_queries(app) as statements:
+        response = client.get('/api/resources?include=provider')
+
+    assert response.status_code == 200
+    resources = response.json['resources']
+    assert len(resources) == 10
+    assert all(resource['provider']['id'] == resource['provider_id'] for resource in resources)
+    assert {resource['provider']['name'] for resource in resources} == {f'Agency {i}' for i in range(5)}
+    assert 'email' not in resources[0]['provider']
+    assert len(statements) == 2
+
+def test_all_resources_include_provider_and_approver(app, client, auth_headers, provider_resources):
+    """Test that admins can embed providers and approvers without per-row queries."""
+    client.get('/api/resources/all', headers=auth_headers['admin'])  # warm per-process caches
+
+    with count_queries(app) as statements:
+        response = client.get('/api/resources/all?include=provider,approved_by', headers=auth_headers['admin'])
+
+    assert response.status_code == 200
+    assert all(resource['approved_by']['name'] == 'Test Admin' for resource in response.json['resources'])
+    assert len(statements) == 3
+
+def test_public_resources_reject_approver_include(client):
+    """Test that the public listing only embeds providers."""
+    response = client.get('/api/resources?include=approved_by')
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+"""
+Tests for ETag / Last-Modified handling on single-entity endpoints.
+"""
+from email.utils import format_datetime
+from datetime import timedelta, timezone
+from sqlalchemy import event
+from app import db
+from app.models import Resource, ResourceCategory, User
+from tests.conftest import create_resource
+
+def record_statements(app):
+    """Start recording SQL statements; returns the list and a function to stop."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    return statements, lambda: event.remove(engine, 'before_cursor_execute', record)
+
+def test_resource_etag_round_trip(app, client):
+    """Test that a matching If-None-Match returns 304 and a changed resource does not."""
+    with app.app_context():
+        resource_id = create_resource('Community Food Pantry', ResourceCategory.FOOD.value, 'Springfield').id
+
+    response = client.get(f'/api/resources/{resource_id}')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    assert response.headers['Last-Modified']
+
+    response = client.get(f'/api/resources/{resource_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    with app.app_context():
+        db.session.get(Resource, resource_id).title = 'Renamed Food Pantry'
+        db.session.commit()
+
+    response = client.get(f'/api/resources/{resource_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['resource']['title'] == 'Renamed Food Pantry'
+    assert response.headers['ETag'] != etag
+
+def test_if_modified_since(app, client, auth_headers):
+    """Test that If-Modified-Since is honoured when no ETag is sent."""
+    with app.app_context():
+        user = User.query.filter_by(email='user@test.com').first()
+        updated_at = user.updated_at.replace(tzinfo=timezone.utc)
+        user_id = user.id
+
+    headers = dict(auth_headers['user'])
+    headers['If-Modified-Since'] = format_datetime(updated_at + timedelta(seconds=1), usegmt=True)
+    assert client.get(f'/api/users/{user_id}', headers=headers).status_code == 304
+
+    headers['If-Modified-Since'] = format_datetime(updated_at - timedelta(seconds=5), usegmt=True)
+    assert client.get(f'/api/users/{user_id}', headers=headers).status_code == 200
+
+def test_profile_poll_not_modified_is_one_query(app, client, auth_headers):
+    """Test that revalidating your own profile runs a single narrow query."""
+    with app.app_context():
+        user_id = User.query.filter_by(email='user@test.com').first().id
+
+    response = client.get(f'/api/profiles/{user_id}', headers=auth_headers['user'])
+    assert response.status_code == 200
+    headers = dict(auth_headers['user'], **{'If-None-Match': response.headers['ETag']})
+
+    statements, stop = record_statements(app)
+    try:
+        response = client.get(f'/api/profiles/{user_id}', headers=headers)
+    finally:
+        stop()
+
+    assert response.status_code == 304
+    assert len(statements) == 1
+    assert 'profiles.bio' not in statements[0]
+
+def test_me_not_modified(client, auth_headers):
+    """Test conditional requests against /api/auth/me."""
+    response = client.get('/api/auth/me', headers=auth_headers['user'])
+    assert response.status_code == 200
+
+    headers = dict(auth_headers['user'], **{'If-None-Match': response.headers['ETag']})
+    assert client.get('/api/auth/me', headers=headers).status_code == 304
+
+    # Another user's tag does not match
+    response = client.get('/api/auth/me', headers=dict(auth_headers['admin'], **{'If-None-Match': headers['If-None-Match']}))
+    assert response.status_code == 200
+
+def test_unavailable_resource_not_revalidated(app, client):
+    """Test that access checks run before a 304 is returned."""
+    with app.app_context():
+        resource = create_resource('Pending Pantry', ResourceCategory.FOOD.value, 'Springfield', status='pending')
+        etag = f'W/"resource-{resource.id}-{resource.updated_at.strftime("%Y%m%d%H%M%S%f")}"'
+
+    response = client.get(f'/api/resources/{resource.id}', headers={'If-None-Match': etag})
+    assert response.status_code == 403
@@ -0,0 +1,52 @@
+"""
+Tests for enum columns stored as small integer codes.
+"""
+import pytest
+from sqlalchemy.exc import IntegrityError
+from tests.conftest import create_resource
+from app import db
+from app.models import Resource, ResourceCategory, ResourceStatus, User, UserRole
+from app.models.resource import RESOURCE_CATEGORY, RESOURCE_STATUS
+
+def test_values_stored_as_codes(app):
+    """Test that enum strings are stored as codes and loaded back as strings."""
+    with app.app_context():
+        resource = create_resource('Food Pantry', ResourceCategory.FOOD.value, 'Springfield')
+        row = db.session.execute(db.text('SELECT category, status FROM resources WHERE id = :id'),
+                                 {'id': resource.id}).one()
+        assert tuple(row) == (RESOURCE_CATEGORY.encode('food'), RESOURCE_STATUS.encode('approved'))
+
+        db.session.expire_all()
+        resource = db.session.get(Resource, resource.id)
+        assert (resource.category, resource.status) == ('food', 'approved')
+
+        role = db.session.execute(db.text("SELECT role FROM users WHERE email = 'admin@test.com'")).scalar()
+        assert isinstance(role, int)
+        assert User.query.filter_by(role=UserRole.ADMIN.value).one().email == 'admin@test.com'
+
+def test_api_returns_string_values(client, auth_headers, search_resources):
+    """Test that API filters and responses keep using string values."""
+    response = client.get('/api/resources?category=food&facets=category,city')
+    assert response.status_code == 200
+    assert {resource['category'] for resource in response.json['resources']} == {'food'}
+    assert response.json['facets']['category'] == [{'value': 'food', 'count': 2}]
+    assert {'value': 'Springfield', 'count': 1} in response.json['facets']['city']
+
+    response = client.get('/api/resources/all?status=pending', headers=auth_headers['admin'])
+    assert [resource['status'] for resource in response.json['resources']] == ['pending']
+
+def test_unknown_value_matches_nothing(client, auth_headers, search_resources):
+    """Test that filtering on a value outside the enum returns no rows."""
+    response = client.get('/api/resources/all?status=published', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    assert response.json['count'] == 0
+
+def test_unknown_value_cannot_be_stored(app):
+    """Test that the check constraint rejects values without a code."""
+    with app.app_context():
+        resource = create_resource('Food Pantry', ResourceCategory.FOOD.value, 'Springfield')
+        resource.status = 'published'
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+        assert db.session.get(Resource, resource.id).status == ResourceStatus.APPROVED.value
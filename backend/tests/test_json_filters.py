@@ -0,0 +1,73 @@
+"""
+Tests for JSON list columns and containment filters.
+"""
+from tests.conftest import create_resource
+from app import db
+from app.models import Profile, Resource, ResourceCategory, User
+
+def test_requirement_filter(app, client):
+    """Test that resources are filtered by every requested requirement."""
+    with app.app_context():
+        create_resource('ID Clinic', ResourceCategory.LEGAL.value, 'Springfield',
+                        requirements=['id_card', 'proof_of_address'])
+        create_resource('Food Pantry', ResourceCategory.FOOD.value, 'Springfield',
+                        requirements=['id_card'])
+        create_resource('Open Shelter', ResourceCategory.HOUSING.value, 'Springfield')
+
+    response = client.get('/api/resources?requirement=id_card')
+    assert response.status_code == 200
+    assert {resource['title'] for resource in response.json['resources']} == {'ID Clinic', 'Food Pantry'}
+
+    response = client.get('/api/resources?requirement=id_card&requirement=proof_of_address')
+    assert [resource['title'] for resource in response.json['resources']] == ['ID Clinic']
+    assert response.json['resources'][0]['requirements'] == ['id_card', 'proof_of_address']
+
+    # Substrings of a requirement do not match
+    response = client.get('/api/resources?requirement=id')
+    assert response.json['count'] == 0
+
+def test_requirements_stored_as_json(app, client, auth_headers):
+    """Test that requirements round-trip as a list rather than an encoded string."""
+    response = client.post('/api/resources', headers=auth_headers['provider'], json={
+        'title': 'Job Center',
+        'description': 'Help finding local employment',
+        'category': ResourceCategory.EMPLOYMENT.value,
+        'location': 'Springfield',
+        'requirements': ['resume']
+    })
+    assert response.status_code == 201
+
+    with app.app_context():
+        resource = Resource.query.filter_by(title='Job Center').one()
+        assert resource.requirements == ['resume']
+        raw = db.session.execute(db.text('SELECT requirements FROM resources WHERE id = :id'),
+                                 {'id': resource.id}).scalar()
+        assert raw == '["resume"]'
+
+def test_need_filter(app, client, auth_headers):
+    """Test that admins can filter profiles by need."""
+    with app.app_context():
+        for email, needs in (('user@test.com', ['food', 'housing']), ('provider@test.com', ['food'])):
+            user = User.query.filter_by(email=email).first()
+            user.profile.needs = needs
+        db.session.commit()
+
+    response = client.get('/api/profiles?need=food', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    assert response.json['count'] == 2
+
+    response = client.get('/api/profiles?need=food&need=housing', headers=auth_headers['admin'])
+    assert [profile['needs'] for profile in response.json['profiles']] == [['food', 'housing']]
+
+def test_empty_needs_do_not_count_toward_completion(app):
+    """Test that the SQL completion score treats an empty needs list as unfilled."""
+    with app.app_context():
+        profiles = Profile.query.order_by(Profile.id).limit(2).all()
+        profiles[0].needs = []
+        profiles[1].needs = ['food']
+        db.session.commit()
+
+        scores = dict(db.session.query(Profile.id, Profile.completion_score)
+                      .filter(Profile.id.in_([profile.id for profile in profiles])).all())
+        assert scores[profiles[0].id] == profiles[0].completion_score == 0
+        assert scores[profiles[1].id] == profiles[1].completion_score == 15
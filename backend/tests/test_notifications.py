@@ -0,0 +1,116 @@
+"""
+Tests for the background notification queue.
+"""
+import email
+import os
+import threading
+import pytest
+from tests.conftest import create_resource
+from app.models import ResourceCategory, ResourceStatus, User
+from app.services.notifications import FileTransport, Notification, NotificationQueue
+
+class RecordingTransport:
+    """Transport that records batches and fails a set number of times."""
+
+    def __init__(self, failures=0, gate=None):
+        self.batches = []
+        self.failures = failures
+        self.gate = gate
+
+    def send(self, notifications):
+        if self.gate:
+            self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise OSError('connection refused')
+        self.batches.append([notification.to for notification in notifications])
+        return []
+
+@pytest.fixture
+def outbox(app, tmp_path):
+    """Route notifications for the app to a temporary outbox directory."""
+    app.extensions['notifications'] = NotificationQueue(FileTransport(str(tmp_path), 'noreply@test.com'))
+    return tmp_path
+
+def read_outbox(directory):
+    """Parse every message in an outbox directory."""
+    messages = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as handle:
+            messages.append(email.message_from_bytes(handle.read()))
+    return messages
+
+def test_queue_batches_messages():
+    """Test that queued messages are handed to the transport in batches."""
+    gate = threading.Event()
+    transport = RecordingTransport(gate=gate)
+    notifications = NotificationQueue(transport, workers=1, batch_size=3)
+
+    for i in range(7):
+        notifications.enqueue(Notification(f'user{i}@test.com', 'Subject', 'Body'))
+    gate.set()
+
+    assert notifications.flush(timeout=5)
+    assert sum(len(batch) for batch in transport.batches) == 7
+    assert max(len(batch) for batch in transport.batches) == 3
+
+def test_queue_retries_with_backoff():
+    """Test that failed batches are retried until they are delivered."""
+    transport = RecordingTransport(failures=2)
+    notifications = NotificationQueue(transport, workers=1, retry_backoff=0.01)
+
+    notifications.enqueue(Notification('user@test.com', 'Subject', 'Body'))
+
+    assert notifications.flush(timeout=5)
+    assert transport.batches == [['user@test.com']]
+
+def test_queue_drops_after_max_retries():
+    """Test that a message is dropped once retries are exhausted."""
+    transport = RecordingTransport(failures=10)
+    notifications = NotificationQueue(transport, workers=1, max_retries=2, retry_backoff=0.01)
+
+    notifications.enqueue(Notification('user@test.com', 'Subject', 'Body'))
+
+    assert notifications.flush(timeout=5)
+    assert transport.batches == []
+    assert transport.failures == 7
+
+def test_production_sends_mail(app, caplog, monkeypatch):
+    """Test that production defaults to SMTP and that the file transport warns outside development."""
+    from app.config import ProductionConfig
+    from app.services.notifications import SMTPTransport, create_transport
+
+    assert ProductionConfig.NOTIFICATIONS_TRANSPORT == 'smtp'
+
+    app.config['NOTIFICATIONS_TRANSPORT'] = 'smtp'
+    assert isinstance(create_transport(app), SMTPTransport)
+
+    app.config['NOTIFICATIONS_TRANSPORT'] = 'file'
+    monkeypatch.setattr(app, 'testing', False)
+    monkeypatch.setattr(app, 'debug', False)
+    assert isinstance(create_transport(app), FileTransport)
+    assert 'not sent' in caplog.text
+
+def test_password_reset_email_queued(app, client, outbox):
+    """Test that requesting a password reset sends the reset link by email."""
+    response = client.post('/api/auth/reset-password', json={'email': 'user@test.com'})
+    assert response.status_code == 200
+
+    assert app.extensions['notifications'].flush(timeout=5)
+    [message] = read_outbox(outbox)
+    assert message['To'] == 'user@test.com'
+    assert '/reset-password/' in message.get_payload()
+
+def test_resource_approval_notifies_provider(app, outbox):
+    """Test that approving a resource notifies its provider."""
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@test.com').first()
+        resource = create_resource('Tax Clinic', ResourceCategory.FINANCIAL.value, 'Springfield',
+                                   status=ResourceStatus.PENDING.value)
+        resource.approve(admin.id)
+        provider_email = resource.provider.email
+
+        assert app.extensions['notifications'].flush(timeout=5)
+    [message] = read_outbox(outbox)
+    assert message['To'] == provider_email
+    assert 'approved' in message['Subject']
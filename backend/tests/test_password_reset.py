@@ -0,0 +1,60 @@
+"""
+Tests for hashed password reset tokens.
+"""
+from datetime import timedelta
+from app.models import PasswordResetToken, User
+
+def issue_token(app, email='user@test.com', lifetime=timedelta(hours=24)):
+    """Issue a reset token for a user and return the plaintext."""
+    with app.app_context():
+        user = User.query.filter_by(email=email).first()
+        return PasswordResetToken.issue(user, lifetime)
+
+def test_token_stored_hashed(app):
+    """Test that only the SHA-256 of a reset token is stored."""
+    token = issue_token(app)
+
+    with app.app_context():
+        stored = PasswordResetToken.query.one()
+        assert stored.token_hash == PasswordResetToken.hash_token(token)
+        assert token not in stored.token_hash
+        assert 'reset_token' not in User.__table__.columns
+
+def test_reissue_replaces_previous_token(app):
+    """Test that issuing a new token invalidates earlier ones."""
+    first = issue_token(app)
+    second = issue_token(app)
+
+    with app.app_context():
+        assert PasswordResetToken.find_valid(first) is None
+        assert PasswordResetToken.find_valid(second) is not None
+
+def test_reset_password_with_token(app, client):
+    """Test that a valid token resets the password once."""
+    token = issue_token(app)
+
+    response = client.post(f'/api/auth/reset-password/{token}', json={'new_password': 'NewPassword123'})
+    assert response.status_code == 200
+
+    response = client.post('/api/auth/login', json={'email': 'user@test.com', 'password': 'NewPassword123'})
+    assert response.status_code == 200
+
+    # Tokens are single use
+    response = client.post(f'/api/auth/reset-password/{token}', json={'new_password': 'OtherPassword123'})
+    assert response.status_code == 400
+
+def test_expired_token_rejected(app, client):
+    """Test that an expired token cannot reset the password."""
+    token = issue_token(app, lifetime=timedelta(seconds=-1))
+
+    response = client.post(f'/api/auth/reset-password/{token}', json={'new_password': 'NewPassword123'})
+    assert response.status_code == 400
+
+def test_purge_expired_reset_tokens(app):
+    """Test that expired reset tokens are purged and live ones kept."""
+    issue_token(app, 'provider@test.com', lifetime=timedelta(seconds=-1))
+    live = issue_token(app)
+
+    with app.app_context():
+        assert PasswordResetToken.purge_expired() == 1
+        assert PasswordResetToken.find_valid(live) is not None
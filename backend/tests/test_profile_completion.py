@@ -0,0 +1,58 @@
+"""
+Tests for profile completion scoring.
+"""
+from app import db
+from app.models import Profile, User
+
+def fill_profile(app, email, **fields):
+    """Set profile fields directly, bypassing completion updates."""
+    with app.app_context():
+        profile = User.query.filter_by(email=email).first().profile
+        for key, value in fields.items():
+            setattr(profile, key, value)
+        db.session.commit()
+        return profile.id
+
+def test_sql_expression_matches_python(app):
+    """Test that the SQL completion expression agrees with the Python score."""
+    fill_profile(app, 'user@test.com', phone='555-0100', address='1 Main St', city='Springfield',
+                 state='TS', zip_code='00001', bio='', needs=['Food'])
+    fill_profile(app, 'provider@test.com', city='Springfield', bio='Provider bio')
+
+    with app.app_context():
+        rows = db.session.query(Profile, Profile.completion_score).all()
+        for profile, sql_score in rows:
+            assert sql_score == profile.completion_score
+        assert sorted(score for _, score in rows) == [0, 29, 85]
+
+def test_recompute_completion_updates_in_chunks(app):
+    """Test that recompute-completion updates stale rows with set-based updates."""
+    fill_profile(app, 'user@test.com', phone='555-0100', address='1 Main St', city='Springfield',
+                 state='TS', zip_code='00001', needs=['Food'])
+    fill_profile(app, 'provider@test.com', bio='Provider bio')
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['recompute-completion', '--chunk-size', '1'])
+    assert 'Updated completion for 2 profile(s)' in result.output
+
+    with app.app_context():
+        profiles = {profile.user.email: profile for profile in Profile.query.all()}
+        assert profiles['user@test.com'].completion_percentage == 85
+        assert profiles['user@test.com'].is_complete is True
+        assert profiles['provider@test.com'].completion_percentage == 15
+        assert profiles['provider@test.com'].is_complete is False
+
+    # Nothing is stale the second time
+    result = runner.invoke(args=['recompute-completion'])
+    assert 'Updated completion for 0 profile(s)' in result.output
+
+def test_admin_filters_by_completion_score(client, auth_headers, app):
+    """Test that admins can filter profiles by completion score."""
+    fill_profile(app, 'user@test.com', phone='555-0100', address='1 Main St', city='Springfield')
+
+    response = client.get('/api/profiles?min_completion=40', headers=auth_headers['admin'])
+    assert response.status_code == 200
+    assert response.json['count'] == 1
+
+    response = client.get('/api/profiles?max_completion=0', headers=auth_headers['admin'])
+    assert response.json['count'] == 2
@@ -0,0 +1,141 @@
+"""
+Tests for rate limiting of authentication endpoints.
+"""
+import shutil
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.models import User
+from app.services.rate_limit import MemoryStore, RateLimiter, parse_limit
+from tests.conftest import TEST_SETTINGS
+
+class FakeClock:
+    """Controllable time source."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_parse_limit():
+    """Test parsing of limit strings."""
+    assert parse_limit('30/minute') == (30, 60)
+    assert parse_limit('10/15 minutes') == (10, 900)
+    assert parse_limit('5 / hour') == (5, 3600)
+    with pytest.raises(ValueError):
+        parse_limit('ten per minute')
+
+def test_sliding_window_weights_previous_window():
+    """Test that the previous window's hits count in proportion to their overlap."""
+    clock = FakeClock(1200.0)  # start of a 60 second window
+    limiter = RateLimiter(MemoryStore(), clock)
+
+    assert all(limiter.hit('k', 10, 60) == 0 for _ in range(10))
+    assert limiter.hit('k', 10, 60) > 0
+
+    # Half way through the next window, half of the previous 11 hits still count
+    clock.now += 90
+    assert all(limiter.hit('k', 10, 60) == 0 for _ in range(4))
+    assert limiter.hit('k', 10, 60) == 30
+
+    # Two windows later nothing remains
+    clock.now += 120
+    assert limiter.hit('k', 10, 60) == 0
+
+def test_login_throttled_per_email(app, client):
+    """Test that repeated logins for one email get 429 without touching the database."""
+    app.config['RATELIMIT_RULES'] = {'login': {'email': '3/minute'}}
+    from app.services import rate_limit
+    rate_limit.init_app(app)
+
+    for _ in range(3):
+        response = client.post('/api/auth/login', json={'email': 'user@test.com', 'password': 'wrong'})
+        assert response.status_code == 401
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.post('/api/auth/login', json={'email': 'USER@test.com', 'password': 'TestUser123'})
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+    assert statements == []
+
+    # Other accounts are unaffected
+    response = client.post('/api/auth/login', json={'email': 'provider@test.com', 'password': 'TestProvider123'})
+    assert response.status_code == 200
+
+def test_login_throttled_per_ip(app, client, monkeypatch):
+    """Test that one IP is throttled across emails while other IPs are not."""
+    app.config['RATELIMIT_RULES'] = {'login': {'ip': '2/minute'}}
+    from app.services import rate_limit
+    rate_limit.init_app(app)
+
+    verified = []
+    original = User.verify_password
+    monkeypatch.setattr(User, 'verify_password', lambda self, password: verified.append(1) or original(self, password))
+
+    attacker = {'REMOTE_ADDR': '203.0.113.5'}
+    for email in ('a@test.com', 'b@test.com'):
+        client.post('/api/auth/login', json={'email': email, 'password': 'x'}, environ_base=attacker)
+    response = client.post('/api/auth/login', json={'email': 'user@test.com', 'password': 'TestUser123'},
+                           environ_base=attacker)
+    assert response.status_code == 429
+    assert verified == []
+
+    response = client.post('/api/auth/login', json={'email': 'user@test.com', 'password': 'TestUser123'},
+                           environ_base={'REMOTE_ADDR': '198.51.100.7'})
+    assert response.status_code == 200
+
+def test_login_throttled_per_forwarded_ip(template_db, tmp_path):
+    """Test that clients behind a trusted proxy are throttled by their X-Forwarded-For address."""
+    db_path = tmp_path / 'test.sqlite'
+    shutil.copyfile(template_db, db_path)
+    app = create_app(dict(
+        TEST_SETTINGS,
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{db_path}',
+        RATELIMIT_RULES={'login': {'ip': '1/minute'}},
+        PROXY_FIX_X_FOR=1
+    ))
+    client = app.test_client()
+    proxy = {'REMOTE_ADDR': '10.0.0.1'}
+
+    def login(forwarded_for):
+        return client.post('/api/auth/login', json={'email': 'x@test.com', 'password': 'x'},
+                           headers={'X-Forwarded-For': forwarded_for}, environ_base=proxy).status_code
+
+    assert [login('203.0.113.5'), login('203.0.113.5')] == [401, 429]
+    # Another client behind the same proxy has its own limit
+    assert login('198.51.100.7') == 401
+    # Only the address appended by the trusted proxy counts, not one forged by the client
+    assert login('198.51.100.9, 203.0.113.5') == 429
+
+def test_password_reset_throttled(app, client):
+    """Test that password reset requests are throttled per email."""
+    app.config['RATELIMIT_RULES'] = {'password_reset': {'email': '2/hour'}}
+    from app.services import rate_limit
+    rate_limit.init_app(app)
+
+    codes = [client.post('/api/auth/reset-password', json={'email': 'user@test.com'}).status_code
+             for _ in range(3)]
+    assert codes == [200, 200, 429]
+
+def test_rate_limit_can_be_disabled(app, client):
+    """Test that RATELIMIT_ENABLED turns throttling off."""
+    app.config['RATELIMIT_RULES'] = {'login': {'ip': '1/minute'}}
+    app.config['RATELIMIT_ENABLED'] = False
+    from app.services import rate_limit
+    rate_limit.init_app(app)
+
+    codes = {client.post('/api/auth/login', json={'email': 'x@test.com', 'password': 'x'}).status_code
+             for _ in range(3)}
+    assert codes == {401}
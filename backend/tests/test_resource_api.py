@@ -5,6 +5,7 @@ import pytest
 import json
 from datetime import date, timedelta
 from app.models import ResourceCategory, ResourceStatus
+from tests.conftest import create_resource
 
 def test_get_resources_public(client):
     """Test getting resources as a public user (no authentication)."""
@@ -378,3 +379,27 @@ def test_delete_resource_unauthorized(client, auth_headers):
     )
     
     assert delete_response.status_code == 200
+
+def test_get_my_resources_paginated_with_status_counts(app, client, auth_headers):
+    """Test that the provider dashboard pages results and counts every status."""
+    with app.app_context():
+        for i in range(5):
+            create_resource(f'Pantry {i}', ResourceCategory.FOOD.value, 'Springfield')
+        create_resource('Shelter', ResourceCategory.HOUSING.value, 'Springfield')
+        for i in range(2):
+            create_resource(f'Pending {i}', ResourceCategory.FOOD.value, 'Springfield',
+                            status=ResourceStatus.PENDING.value)
+
+    response = client.get('/api/resources/my?category=food&per_page=2&page=2', headers=auth_headers['provider'])
+    assert response.status_code == 200
+    assert response.json['status_counts'] == {'pending': 2, 'approved': 5, 'rejected': 0, 'expired': 0, 'archived': 0}
+    assert response.json['total'] == 7
+    assert response.json['pages'] == 4
+    assert response.json['count'] == 2
+
+    response = client.get('/api/resources/my?status=approved&per_page=10', headers=auth_headers['provider'])
+    assert response.json['total'] == 6
+    assert [r['title'] for r in response.json['resources']][:2] == ['Shelter', 'Pantry 4']
+
+    response = client.get('/api/resources/my?per_page=1000', headers=auth_headers['provider'])
+    assert response.status_code == 400
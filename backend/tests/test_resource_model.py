@@ -2,7 +2,6 @@
 Tests for the Resource model.
 """
 import pytest
-import json
 from datetime import date, datetime, timedelta
 from app.models import Resource, ResourceCategory, ResourceStatus, User
 from app import db
@@ -29,7 +28,7 @@ def test_create_resource(app):
             contact_email='contact@test.com',
             start_date=date.today(),
             end_date=date.today() + timedelta(days=30),
-            requirements=json.dumps(['Test Requirement']),
+            requirements=['Test Requirement'],
             additional_info='Test additional info',
             status=ResourceStatus.PENDING.value
         )
@@ -0,0 +1,242 @@
+"""
+Tests for the resource search helpers.
+"""
+import os
+import pytest
+from tests.conftest import create_resource
+from app import db
+from app.models import Resource, ResourceCategory, User
+
+def test_suggest_matches_prefixes(client, search_resources):
+    """Test suggestions for titles, categories and cities."""
+    response = client.get('/api/resources/suggest?q=foo')
+    
+    assert response.status_code == 200
+    suggestions = {(s['type'], s['text']): s['count'] for s in response.json['suggestions']}
+    assert suggestions[('category', 'food')] == 2
+    assert ('title', 'Food Bank Delivery') in suggestions
+    # Matches a later word in the title
+    assert ('title', 'Community Food Pantry') in suggestions
+    # Pending resources are never suggested
+    assert ('title', 'Pending Food Drive') not in suggestions
+    
+    response = client.get('/api/resources/suggest?q=SPRING')
+    assert response.json['suggestions'][0] == {'text': 'Springfield', 'type': 'city', 'count': 3}
+
+def test_suggest_empty_query(client, search_resources):
+    """Test that an empty query returns no suggestions."""
+    response = client.get('/api/resources/suggest?q=')
+    
+    assert response.status_code == 200
+    assert response.json['suggestions'] == []
+    assert response.json['count'] == 0
+
+def test_suggest_limit(client, search_resources):
+    """Test that the limit parameter caps the number of suggestions."""
+    response = client.get('/api/resources/suggest?q=f&limit=2')
+    
+    assert response.status_code == 200
+    assert response.json['count'] == 2
+
+def test_suggest_follows_moderation(app, client, search_resources):
+    """Test that the index is updated when resources are approved, edited or deleted."""
+    # Build the index before making changes
+    client.get('/api/resources/suggest?q=f')
+    
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@test.com').first()
+        pending = Resource.query.filter_by(title='Pending Food Drive').first()
+        pending.approve(admin.id)
+    
+    titles = [s['text'] for s in client.get('/api/resources/suggest?q=pending').json['suggestions']]
+    assert titles == ['Pending Food Drive']
+    
+    with app.app_context():
+        clinic = Resource.query.filter_by(title='Free Clinic').first()
+        clinic.title = 'Walk-in Clinic'
+        db.session.commit()
+    
+    titles = [s['text'] for s in client.get('/api/resources/suggest?q=free').json['suggestions']]
+    assert titles == []
+    titles = [s['text'] for s in client.get('/api/resources/suggest?q=walk').json['suggestions']]
+    assert titles == ['Walk-in Clinic']
+    
+    with app.app_context():
+        Resource.query.filter_by(title='Family Shelter').first().delete()
+    
+    response = client.get('/api/resources/suggest?q=housing')
+    assert response.json['suggestions'] == []
+
+def test_facet_counts(client, search_resources):
+    """Test facet counts returned alongside search results."""
+    response = client.get('/api/resources?facets=category,city')
+    
+    assert response.status_code == 200
+    facets = response.json['facets']
+    assert set(facets) == {'category', 'city'}
+    assert facets['category'][0] == {'value': 'food', 'count': 2}
+    assert facets['city'] == [
+        {'value': 'Springfield', 'count': 3},
+        {'value': 'Shelbyville', 'count': 1}
+    ]
+
+def test_facet_counts_follow_filters(client, search_resources):
+    """Test that facet counts are computed over the filtered set."""
+    response = client.get('/api/resources?category=food&facets=true')
+    
+    assert response.status_code == 200
+    facets = response.json['facets']
+    assert facets['category'] == [{'value': 'food', 'count': 2}]
+    assert facets['state'] == [{'value': 'TS', 'count': 2}]
+    assert sum(item['count'] for item in facets['city']) == response.json['count']
+
+def test_facet_counts_unknown_field(client, search_resources):
+    """Test that unknown facet fields are rejected."""
+    response = client.get('/api/resources?facets=provider_id')
+    
+    assert response.status_code == 400
+    assert 'error' in response.json
+    
+    # Facets are omitted unless requested
+    response = client.get('/api/resources')
+    assert 'facets' not in response.json
+
+def test_fuzzy_search_misspelling(client, search_resources):
+    """Test that misspelled searches fall back to fuzzy matches."""
+    response = client.get('/api/resources?search=shleter')
+    
+    assert response.status_code == 200
+    assert response.json['fuzzy'] is True
+    assert [r['title'] for r in response.json['resources']] == ['Family Shelter']
+    
+    response = client.get('/api/resources?search=comunity pantri')
+    assert response.json['resources'][0]['title'] == 'Community Food Pantry'
+
+def test_fuzzy_search_not_used_for_exact_matches(client, search_resources):
+    """Test that exact matches skip fuzzy matching."""
+    response = client.get('/api/resources?search=Shelter')
+    
+    assert response.status_code == 200
+    assert 'fuzzy' not in response.json
+    assert response.json['count'] == 1
+
+def test_fuzzy_search_disabled_and_threshold(app, client, search_resources):
+    """Test that fuzzy matching can be disabled and respects the threshold."""
+    response = client.get('/api/resources?search=shleter&fuzzy=false')
+    assert response.json['count'] == 0
+    
+    # Nothing is similar enough to unrelated text
+    response = client.get('/api/resources?search=xylophone')
+    assert response.json['fuzzy'] is True
+    assert response.json['count'] == 0
+    
+    app.config['SEARCH_FUZZY_THRESHOLD'] = 0.9
+    response = client.get('/api/resources?search=shleter')
+    assert response.json['count'] == 0
+
+def test_fuzzy_index_skips_pending_resources(client, search_resources):
+    """Test that only approved resources are fuzzy matched."""
+    response = client.get('/api/resources?search=drivve')
+    
+    assert response.status_code == 200
+    assert response.json['count'] == 0
+
+def test_fuzzy_category_scores_match_index():
+    """Test that PostgreSQL category matching scores categories like the in-process index."""
+    from app.services.fuzzy import TrigramIndex, _category_scores
+
+    index = TrigramIndex()
+    index.load([(1, None, None, 'healthcare', None), (2, None, None, 'housing', None)])
+    assert _category_scores('helthcare', 0.3) == {'healthcare': index.search('helthcare', 0.3)[1]}
+    assert _category_scores('xyz', 0.3) == {}
+
+def test_query_expansion_to_categories(client, search_resources):
+    """Test that synonyms and translations become category filters."""
+    response = client.get('/api/resources?search=rent help')
+    
+    assert response.status_code == 200
+    assert response.json['expanded'] == {'categories': ['housing'], 'search': ''}
+    assert [r['title'] for r in response.json['resources']] == ['Family Shelter']
+    
+    response = client.get('/api/resources?search=comida')
+    assert response.json['count'] == 2
+    assert all(r['category'] == 'food' for r in response.json['resources'])
+    
+    # Remaining words are still matched as text within the expanded categories
+    response = client.get('/api/resources?search=comida delivery')
+    assert response.json['expanded'] == {'categories': ['food'], 'search': 'delivery'}
+    assert [r['title'] for r in response.json['resources']] == ['Food Bank Delivery']
+
+def test_query_expansion_keeps_searched_words(app, client):
+    """Test that term synonyms match the searcher's word as well as the canonical keyword."""
+    with app.app_context():
+        create_resource('Daycare center', ResourceCategory.EDUCATION.value, 'Springfield')
+        create_resource('Childcare co-op', ResourceCategory.EDUCATION.value, 'Springfield')
+        create_resource('Legal aid clinic', ResourceCategory.LEGAL.value, 'Springfield')
+        create_resource('Free clothes giveaway', ResourceCategory.OTHER.value, 'Springfield',
+                        description='Coats and shoes for kids')
+        create_resource('Photo ID help', ResourceCategory.LEGAL.value, 'Springfield',
+                        description='Replace lost identification documents')
+
+    response = client.get('/api/resources?search=daycare&fuzzy=false')
+    assert response.json['expanded']['terms'] == {'daycare': 'childcare'}
+    assert sorted(r['title'] for r in response.json['resources']) == ['Childcare co-op', 'Daycare center']
+
+    # Short keywords would match inside "aid" and "kids"
+    response = client.get('/api/resources?search=identification&fuzzy=false')
+    assert [r['title'] for r in response.json['resources']] == ['Photo ID help']
+
+def test_query_expansion_respects_category_filter(app, client, search_resources):
+    """Test that a synonym for another category is searched as text within an explicit category."""
+    with app.app_context():
+        create_resource('Grocery vouchers', ResourceCategory.FOOD.value, 'Springfield',
+                        description='Help for families behind on rent')
+
+    response = client.get('/api/resources?category=food&search=rent&fuzzy=false')
+    assert response.status_code == 200
+    assert 'expanded' not in response.json
+    assert [r['title'] for r in response.json['resources']] == ['Grocery vouchers']
+
+    # A synonym for the pinned category adds nothing
+    response = client.get('/api/resources?category=food&search=comida')
+    assert response.json['count'] == 3
+
+def test_short_synonym_keyword_rejected():
+    """Test that keywords too short to match as substrings are rejected."""
+    from app.services.query_expansion import SynonymDictionary
+
+    with pytest.raises(ValueError):
+        SynonymDictionary(terms={'id': ['identification']})
+
+def test_query_expansion_disabled(client, search_resources):
+    """Test that expansion can be turned off."""
+    response = client.get('/api/resources?search=comida&expand=false&fuzzy=false')
+    
+    assert response.status_code == 200
+    assert 'expanded' not in response.json
+    assert response.json['count'] == 0
+
+def test_query_expansion_hot_reload(app, client, search_resources, tmp_path):
+    """Test that edits to the synonym dictionary are picked up without a restart."""
+    path = tmp_path / 'synonyms.json'
+    path.write_text('{"categories": {"healthcare": ["walk in"]}}')
+    
+    loader = app.extensions['synonyms']
+    loader.path = str(path)
+    loader.reload_interval = 0
+    
+    response = client.get('/api/resources?search=walk in')
+    assert response.json['expanded']['categories'] == ['healthcare']
+    
+    path.write_text('{"categories": {"housing": ["walk in"]}}')
+    os.utime(path, (1, 1))
+    
+    response = client.get('/api/resources?search=walk in')
+    assert response.json['expanded']['categories'] == ['housing']
+    
+    # A broken edit keeps the last good dictionary
+    path.write_text('{"categories": {"not-a-category": ["walk in"]}}')
+    os.utime(path, (2, 2))
+    
+    response = client.get('/api/resources?search=walk in')
+    assert response.json['expanded']['categories'] == ['housing']
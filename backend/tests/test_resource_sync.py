@@ -0,0 +1,134 @@
+"""
+Tests for delta sync of public resources.
+"""
+from datetime import datetime, timedelta
+from tests.conftest import create_resource
+from app import db
+from app.models import Resource, ResourceCategory, ResourceStatus, ResourceChangeLog, User
+
+def sync(client, since=None, **params):
+    """Call the changes endpoint and return the JSON body."""
+    if since is not None:
+        params['since'] = since
+    response = client.get('/api/resources/changes', query_string=params)
+    assert response.status_code == 200
+    return response.json
+
+def test_initial_sync_returns_approved_resources(client, search_resources):
+    """Test that a sync without a token returns every approved resource."""
+    data = sync(client)
+
+    assert data['reset'] is True
+    assert {change['op'] for change in data['changes']} == {'upsert'}
+    assert len(data['changes']) == 4
+    assert data['next'] == str(5)
+
+def test_sync_returns_only_changes_since_token(app, client, search_resources):
+    """Test that created, updated, approved and deleted resources are reported once each."""
+    token = sync(client)['next']
+
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@test.com').first()
+        created = create_resource('Legal Aid Office', ResourceCategory.LEGAL.value, 'Springfield')
+        shelter = Resource.query.filter_by(title='Family Shelter').first()
+        shelter.contact_name = 'Front Desk'
+        shelter.save()
+        shelter.contact_name = 'Shelter Manager'
+        shelter.save()
+        pending = Resource.query.filter_by(title='Pending Food Drive').first()
+        pending.approve(admin.id)
+        clinic = Resource.query.filter_by(title='Free Clinic').first()
+        clinic_id = clinic.id
+        clinic.delete()
+        shelter_id = shelter.id
+        expected_upserts = {created.id, shelter_id, pending.id}
+
+    data = sync(client, token)
+    assert 'reset' not in data
+    upserts = {change['id']: change['resource'] for change in data['changes'] if change['op'] == 'upsert'}
+    deletes = [change['id'] for change in data['changes'] if change['op'] == 'delete']
+    assert set(upserts) == expected_upserts
+    assert len(data['changes']) == 4
+    assert upserts[shelter_id]['contact_name'] == 'Shelter Manager'
+    assert deletes == [clinic_id]
+
+    # Nothing new since the returned token
+    data = sync(client, data['next'])
+    assert data['changes'] == []
+    assert data['has_more'] is False
+
+def test_unpublished_resource_sent_as_delete(app, client, search_resources):
+    """Test that a resource leaving the approved state becomes a tombstone."""
+    token = sync(client)['next']
+
+    with app.app_context():
+        resource = Resource.query.filter_by(title='Food Bank Delivery').first()
+        resource.status = ResourceStatus.ARCHIVED.value
+        resource.save()
+        resource_id = resource.id
+
+    assert sync(client, token)['changes'] == [{'op': 'delete', 'id': resource_id}]
+
+def test_sync_pages_with_has_more(app, client):
+    """Test that large change sets are split across calls."""
+    with app.app_context():
+        for i in range(5):
+            create_resource(f'Pantry {i}', ResourceCategory.FOOD.value, 'Springfield')
+
+    data = sync(client, 0, limit=2)
+    assert len(data['changes']) == 2 and data['has_more'] is True
+    seen = [change['id'] for change in data['changes']]
+    while data['has_more']:
+        data = sync(client, data['next'], limit=2)
+        seen.extend(change['id'] for change in data['changes'])
+    assert len(seen) == len(set(seen)) == 5
+
+def test_full_sync_is_paged(app, client, search_resources):
+    """Test that a full sync honours limit and hands over to delta sync when done."""
+    data = sync(client, limit=3)
+    assert data['reset'] is True and data['has_more'] is True
+    assert len(data['changes']) == 3
+    seen = [change['id'] for change in data['changes']]
+
+    # Edited while the client is still paging, after it was sent
+    with app.app_context():
+        resource = db.session.get(Resource, seen[0])
+        resource.contact_name = 'New Contact'
+        resource.save()
+
+    data = sync(client, data['next'], limit=3)
+    assert 'reset' not in data and data['has_more'] is False
+    seen.extend(change['id'] for change in data['changes'])
+    assert len(seen) == len(set(seen)) == 4
+    assert data['next'] == '5'
+
+    changes = sync(client, data['next'])['changes']
+    assert [(change['id'], change['resource']['contact_name']) for change in changes] == [(seen[0], 'New Contact')]
+
+def test_unsettled_changes_resent(app, client, search_resources):
+    """Test that the token does not move past entries inside the settle window."""
+    app.config['SYNC_SETTLE_SECONDS'] = 60
+
+    data = sync(client, 0)
+    assert len(data['changes']) == 5
+    assert data['next'] == '0'
+
+def test_invalid_token_rejected(client):
+    """Test that a malformed token is rejected."""
+    response = client.get('/api/resources/changes?since=abc')
+    assert response.status_code == 400
+    response = client.get('/api/resources/changes?since=5:x')
+    assert response.status_code == 400
+
+def test_purged_token_requires_resync(app, client, search_resources, runner):
+    """Test that a token older than the retained log is told to resync."""
+    with app.app_context():
+        ResourceChangeLog.query.update({'created_at': datetime.utcnow() - timedelta(days=60)})
+        db.session.commit()
+
+    result = runner.invoke(args=['purge-resource-changes'])
+    assert 'Purged 4' in result.output
+
+    response = client.get('/api/resources/changes?since=1')
+    assert response.status_code == 410
+    assert [change['id'] for change in sync(client, 4)['changes']] == [5]
@@ -0,0 +1,53 @@
+"""
+Tests for response encoding and compression.
+"""
+import gzip
+import brotli
+
+def test_json_dates_are_iso_formatted(client, search_resources):
+    """Test that dates are encoded as compact ISO 8601 strings."""
+    response = client.get('/api/resources')
+    
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert '\n' not in body
+    created_at = response.json['resources'][0]['created_at']
+    assert 'T' in created_at and not created_at.endswith('GMT')
+
+def test_gzip_compression(client, search_resources):
+    """Test that large responses are gzip compressed when accepted."""
+    response = client.get('/api/resources', headers={'Accept-Encoding': 'gzip'})
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    uncompressed = client.get('/api/resources').get_data()
+    assert gzip.decompress(response.get_data()) == uncompressed
+    assert int(response.headers['Content-Length']) < len(uncompressed)
+
+def test_brotli_preferred(client, search_resources):
+    """Test that brotli is chosen when the client accepts both encodings."""
+    response = client.get('/api/resources', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.get_data()) == client.get('/api/resources').get_data()
+    
+    # Client preference wins over server preference
+    response = client.get('/api/resources', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+def test_no_compression_when_not_accepted_or_small(app, client, search_resources):
+    """Test that responses are left alone when compression does not apply."""
+    response = client.get('/api/resources')
+    assert 'Content-Encoding' not in response.headers
+    
+    response = client.get('/api/resources', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    
+    # Below the size threshold
+    response = client.get('/api/resources/suggest?q=zz', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    
+    app.config['COMPRESS_ENABLED'] = False
+    response = client.get('/api/resources', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
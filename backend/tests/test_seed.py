@@ -0,0 +1,72 @@
+"""
+Tests for the synthetic data generator.
+"""
+from app.models import User, UserRole, Profile, Resource, ResourceStatus
+from app.services.seed import DataGenerator, SEED_PASSWORD, REQUIREMENTS, seed_database
+
+def test_generator_is_deterministic():
+    """Test that the same seed gives the same rows and another seed does not."""
+    def rows(seed):
+        generator = DataGenerator(seed)
+        return list(generator.users(50)), list(generator.resources(200, [2, 3], [1]))
+
+    assert rows(7) == rows(7)
+    assert rows(7) != rows(8)
+
+def test_tables_use_independent_streams():
+    """Test that generating more users does not change the resources."""
+    generator = DataGenerator(3)
+    before = list(generator.resources(20, [2], [1]))
+    list(generator.users(500))
+    assert list(generator.resources(20, [2], [1])) == before
+
+def test_seed_database(app):
+    """Test bulk seeding of users, profiles and resources."""
+    with app.app_context():
+        existing = User.query.count()
+        counts = seed_database(users=200, resources=1000, seed=1, batch_size=64)
+        assert counts == {'users': 200, 'profiles': 200, 'resources': 1000}
+
+        assert User.query.count() == existing + 200
+        assert Profile.query.count() == existing + 200
+        seeded = User.query.filter(User.email.like('%@example.org')).order_by(User.id).all()
+        assert seeded[0].role == UserRole.ADMIN.value
+        assert seeded[1].verify_password(SEED_PASSWORD)
+
+        profile = Profile.query.filter(Profile.needs.isnot(None)).first()
+        assert profile.completion_percentage == profile.completion_score
+
+        resources = Resource.query.all()
+        providers = {user.id for user in User.query.filter_by(role=UserRole.PROVIDER.value)}
+        assert {resource.provider_id for resource in resources} <= providers
+        assert {resource.status for resource in resources} == {status.value for status in ResourceStatus}
+        for resource in resources:
+            assert set(resource.requirements or []) <= set(REQUIREMENTS)
+            if resource.end_date:
+                assert resource.end_date >= resource.start_date
+            assert (resource.approved_at is not None) == (resource.status == ResourceStatus.APPROVED.value)
+
+def test_reseed_after_delete(app):
+    """Test that seeding again after users were deleted does not reuse email addresses."""
+    with app.app_context():
+        seed_database(users=20, seed=1)
+        User.query.filter(User.email.like('%@example.org')).order_by(User.id).first().delete()
+        last_id = User.query.order_by(User.id.desc()).first().id
+        assert seed_database(users=20, seed=1)['users'] == 20
+
+        # Numbered past every existing user, whatever the row count
+        reseeded = User.query.filter(User.id > last_id).order_by(User.id).all()
+        assert [user.email.rsplit('.', 2)[1].split('@')[0] for user in reseeded] == \
+            [str(last_id + 1 + i) for i in range(20)]
+
+def test_seed_command(app, runner, client):
+    """Test the ``flask seed`` command and that seeded data is served by the API."""
+    result = runner.invoke(args=['seed', '--users', '30', '--resources', '120', '--seed', '5'])
+    assert result.exit_code == 0, result.output
+    assert 'Inserted 30 user(s), 30 profile(s) and 120 resource(s)' in result.output
+
+    with app.app_context():
+        approved = Resource.query.filter_by(status=ResourceStatus.APPROVED.value).count()
+    response = client.get('/api/resources')
+    assert response.status_code == 200
+    assert response.json['count'] == approved
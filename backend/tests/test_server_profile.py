@@ -0,0 +1,59 @@
+"""
+Tests for the gunicorn server profile.
+"""
+import pytest
+from app.utils.server import server_settings, flask_app, reset_after_fork
+
+def test_defaults_scale_with_cpus_and_pool():
+    """Test that threaded workers are sized from CPUs and threads from the pool."""
+    settings = server_settings({}, cpu_count=4)
+    assert settings['worker_class'] == 'gthread'
+    assert settings['wsgi_app'] == 'wsgi:app'
+    assert settings['workers'] == 6  # 9 capped by 100 connections / 15 per worker
+    assert settings['threads'] == 5
+    assert settings['preload_app'] is True
+    assert settings['max_requests'] == 1000
+    assert settings['max_requests_jitter'] == 100
+    assert settings['bind'] == '0.0.0.0:8000'
+
+    settings = server_settings({'DB_POOL_SIZE': '10', 'DB_MAX_OVERFLOW': '0', 'PORT': '5000'}, cpu_count=1)
+    assert settings['workers'] == 3
+    assert settings['threads'] == 10
+    assert settings['bind'] == '0.0.0.0:5000'
+
+def test_worker_classes():
+    """Test the sync and ASGI worker profiles."""
+    settings = server_settings({'GUNICORN_WORKER_CLASS': 'sync'}, cpu_count=2)
+    assert settings['worker_class'] == 'sync'
+    assert (settings['workers'], settings['threads']) == (5, 1)
+
+    settings = server_settings({'GUNICORN_WORKER_CLASS': 'uvicorn'}, cpu_count=2)
+    assert settings['worker_class'] == 'uvicorn.workers.UvicornWorker'
+    assert settings['wsgi_app'] == 'asgi:app'
+    assert (settings['workers'], settings['threads']) == (2, 1)
+
+    with pytest.raises(ValueError):
+        server_settings({'GUNICORN_WORKER_CLASS': 'eventlet'})
+
+def test_environment_overrides():
+    """Test that explicit settings win over derived ones."""
+    settings = server_settings({
+        'GUNICORN_WORKERS': '3', 'GUNICORN_THREADS': '2', 'GUNICORN_PRELOAD': 'false',
+        'GUNICORN_MAX_REQUESTS': '500', 'GUNICORN_BIND': 'unix:/run/povertyline.sock'
+    }, cpu_count=8)
+    assert (settings['workers'], settings['threads']) == (3, 2)
+    assert settings['preload_app'] is False
+    assert settings['max_requests_jitter'] == 50
+    assert settings['bind'] == 'unix:/run/povertyline.sock'
+
+def test_reset_after_fork(app):
+    """Test that the inherited connection pool is replaced in the worker."""
+    from app import db
+    with app.app_context():
+        pool = db.engine.pool
+    assert flask_app(app) is app
+    assert flask_app(object()) is None
+
+    reset_after_fork(app)
+    with app.app_context():
+        assert db.engine.pool is not pool
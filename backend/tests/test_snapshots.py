@@ -0,0 +1,121 @@
+"""
+Tests for static directory snapshots.
+"""
+import gzip
+import hashlib
+import json
+import os
+import pytest
+from tests.conftest import create_resource
+from app.models import Resource, ResourceCategory, User
+from app.services.snapshots import SnapshotBuilder, SnapshotRebuilder
+
+@pytest.fixture
+def snapshot_builder(app, tmp_path):
+    """Write snapshots for the app to a temporary directory."""
+    builder = SnapshotBuilder(str(tmp_path))
+    app.extensions['snapshots'] = builder
+    return builder
+
+def read_snapshot(directory, relative):
+    """Load one snapshot file."""
+    with open(os.path.join(directory, relative), 'rb') as handle:
+        return handle.read()
+
+def test_build_writes_listings(app, snapshot_builder, search_resources):
+    """Test that listings are split by category and city and named by content hash."""
+    with app.app_context():
+        manifest = snapshot_builder.build()
+
+    directory = snapshot_builder.directory
+    assert manifest['all']['count'] == 4
+    assert manifest['categories']['food']['count'] == 2
+    assert manifest['cities']['springfield']['count'] == 3
+    assert manifest['cities']['springfield']['name'] == 'Springfield'
+
+    entry = manifest['categories']['food']
+    data = read_snapshot(directory, entry['path'])
+    assert hashlib.sha256(data).hexdigest().startswith(entry['hash'])
+    assert entry['hash'] in entry['path']
+    assert {resource['title'] for resource in json.loads(data)['resources']} == {
+        'Community Food Pantry', 'Food Bank Delivery'
+    }
+    assert gzip.decompress(read_snapshot(directory, entry['path'] + '.gz')) == data
+    assert json.loads(read_snapshot(directory, 'manifest.json'))['all'] == manifest['all']
+
+def test_snapshot_matches_api_listing(app, client, snapshot_builder, search_resources):
+    """Test that a snapshot has the same body as the listing endpoint."""
+    with app.app_context():
+        manifest = snapshot_builder.build()
+
+    snapshot = json.loads(read_snapshot(snapshot_builder.directory, manifest['categories']['food']['path']))
+    response = client.get('/api/resources?category=food')
+    assert snapshot == response.json
+
+def test_rebuild_keeps_unchanged_files_and_removes_stale(app, snapshot_builder, search_resources):
+    """Test that rebuilding rewrites only changed listings and drops files two builds old."""
+    with app.app_context():
+        first = snapshot_builder.build()
+        create_resource('Legal Aid Office', ResourceCategory.LEGAL.value, 'Springfield')
+        second = snapshot_builder.build()
+        create_resource('Housing Help Desk', ResourceCategory.HOUSING.value, 'Shelbyville')
+        third = snapshot_builder.build()
+
+    directory = snapshot_builder.directory
+    assert first['categories']['food'] == third['categories']['food']
+    assert first['all']['path'] != second['all']['path']
+    assert os.path.exists(os.path.join(directory, second['all']['path']))
+    assert not os.path.exists(os.path.join(directory, first['all']['path']))
+    assert not os.path.exists(os.path.join(directory, first['all']['path'] + '.gz'))
+
+@pytest.mark.skipif(os.name != 'posix', reason='builds are serialized across processes with flock')
+def test_build_waits_for_other_processes(app, snapshot_builder, search_resources):
+    """Test that a build waits while another process holds the snapshot directory lock."""
+    import fcntl
+    import threading
+    from app.services.snapshots import LOCK_NAME
+
+    def build():
+        with app.app_context():
+            manifests.append(snapshot_builder.build())
+
+    manifests = []
+    # Reason: flock locks taken through separate open files conflict even within one process
+    with open(os.path.join(snapshot_builder.directory, LOCK_NAME), 'a') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join(timeout=0.3)
+        assert thread.is_alive() and not manifests
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    thread.join(timeout=5)
+    assert manifests[0]['all']['count'] == 4
+    assert os.path.exists(os.path.join(snapshot_builder.directory, LOCK_NAME))
+
+def test_moderation_schedules_one_debounced_rebuild(app, snapshot_builder, search_resources):
+    """Test that a burst of approvals triggers a single background rebuild."""
+    builds = []
+    build = snapshot_builder.build
+    snapshot_builder.build = lambda: builds.append(build())
+    rebuilder = SnapshotRebuilder(app, snapshot_builder, 0.2)
+    app.extensions['snapshot_rebuilder'] = rebuilder
+
+    with app.app_context():
+        from app.services.resource_events import resources_committed
+        from app.services.snapshots import _on_resources_committed
+        resources_committed.connect(_on_resources_committed, sender=app)
+        try:
+            # A new submission awaiting moderation does not change the public listing
+            create_resource('Pending Clinic', ResourceCategory.HEALTHCARE.value, 'Springfield',
+                            status='pending')
+            assert rebuilder._timer is None
+
+            admin = User.query.filter_by(email='admin@test.com').first()
+            Resource.query.filter_by(title='Pending Food Drive').first().approve(admin.id)
+            Resource.query.filter_by(title='Pending Clinic').first().approve(admin.id)
+        finally:
+            resources_committed.disconnect(_on_resources_committed, sender=app)
+
+    rebuilder.join(timeout=5)
+    assert len(builds) == 1
+    assert builds[0]['all']['count'] == 6
@@ -0,0 +1,116 @@
+"""
+Tests for SQLite production mode.
+"""
+import threading
+import time
+import pytest
+from app import create_app, db
+from app.models import Resource, ResourceCategory, User
+from app.utils.sqlite import WriteQueue, is_file_database
+from tests.conftest import create_resource
+
+@pytest.fixture
+def sqlite_app(tmp_path):
+    """An app in SQLite production mode on a temporary database file."""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.sqlite"}',
+        'SQLITE_PRODUCTION_MODE': True,
+    })
+    with app.app_context():
+        db.create_all()
+        provider = User(email='provider@test.com', name='Test Provider', role='provider')
+        provider.password = 'TestProvider123'
+        provider.save()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+def test_is_file_database():
+    """Test that only file-backed SQLite URIs enable production mode."""
+    assert is_file_database('sqlite:////srv/app.sqlite')
+    assert is_file_database('sqlite:///app.db')
+    assert not is_file_database('sqlite:///:memory:')
+    assert not is_file_database('sqlite://')
+    assert not is_file_database('postgresql://localhost/app')
+
+def test_pragmas_applied(sqlite_app):
+    """Test that connections use WAL and the configured pragmas."""
+    with sqlite_app.app_context():
+        pragma = lambda name: db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == 5000
+        assert pragma('cache_size') == -64000
+
+def test_write_queue_is_fifo_and_reentrant():
+    """Test that waiting writers are served in arrival order."""
+    queue = WriteQueue(timeout=5)
+    order = []
+    queue.acquire()
+    queue.acquire()
+    queue.release()
+
+    def writer(name):
+        queue.acquire()
+        order.append(name)
+        queue.release()
+
+    threads = []
+    for name in range(5):
+        thread = threading.Thread(target=writer, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while queue.pending < name + 1:
+            time.sleep(0.001)
+    queue.release()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+
+def test_write_queue_timeout():
+    """Test that a writer gives up once the timeout passes."""
+    queue = WriteQueue(timeout=0.05)
+    queue.acquire()
+    errors = []
+
+    def writer():
+        try:
+            queue.acquire()
+        except TimeoutError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+
+def test_concurrent_writes_and_reads(sqlite_app):
+    """Test that threads writing and reading at once never hit a locked database."""
+    with sqlite_app.app_context():
+        resource_ids = [
+            create_resource(f'Pantry {i}', ResourceCategory.FOOD.value, 'Springfield').id for i in range(4)
+        ]
+    errors = []
+
+    def work(worker):
+        with sqlite_app.app_context():
+            try:
+                for i in range(25):
+                    if i % 2:
+                        Resource.query.filter_by(category=ResourceCategory.FOOD.value).all()
+                    else:
+                        resource = db.session.get(Resource, resource_ids[worker % 4])
+                        resource.contact_name = f'Worker {worker} edit {i}'
+                        db.session.commit()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    queue = sqlite_app.extensions['sqlite_write_queue']
+    assert queue.pending == 0 and queue._owner is None
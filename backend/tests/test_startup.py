@@ -0,0 +1,107 @@
+"""
+Tests for application startup cost.
+
+Each check runs in a fresh interpreter, since the test process has
+already imported everything.
+"""
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget for building the app or running a CLI command, in seconds. Wall-clock
+# timings are unreliable on loaded machines (e.g. under pytest -n), so the check is opt-in.
+STARTUP_BUDGET = os.environ.get('STARTUP_BUDGET_SECONDS')
+
+# Modules that must not be imported until they are used
+DEFERRED_MODULES = ('alembic', 'flask_migrate', 'email_validator',
+                    'app.schemas.user', 'app.schemas.profile', 'app.schemas.resource')
+
+CREATE_APP = "from app import create_app; create_app('testing')"
+
+def run_python(*args, env=None):
+    """Run Python in the backend directory; return (completed process, wall time)."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True,
+                            env=env or os.environ.copy())
+    return result, time.perf_counter() - started
+
+def import_profile(code):
+    """
+    Run ``code`` under ``python -X importtime``.
+
+    Returns:
+        tuple: (names of all modules loaded, {module: cumulative import time in ms})
+    """
+    result, _ = run_python('-X', 'importtime', '-c', code + "; import sys; print('\\n'.join(sys.modules))")
+    assert result.returncode == 0, result.stderr
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('| imported package'):
+            _, cumulative, name = line.split('|')
+            timings[name.strip()] = int(cumulative) / 1000
+    return set(result.stdout.split()), timings
+
+def slowest(timings, count=10):
+    return ', '.join(f'{name} {ms:.0f}ms' for name, ms in sorted(timings.items(), key=lambda item: -item[1])[:count])
+
+def test_create_app_defers_heavy_imports():
+    """Test that building the app imports neither Alembic nor the pydantic schemas."""
+    modules, timings = import_profile(CREATE_APP)
+    assert 'app.api.resources' in modules
+    eager = sorted(modules.intersection(DEFERRED_MODULES))
+    assert not eager, f"imported at startup: {eager}; slowest imports: {slowest(timings)}"
+
+def test_schemas_load_on_first_use():
+    """Test that schema classes are imported when first accessed."""
+    modules, _ = import_profile(CREATE_APP + "; from app import schemas; schemas.UserResponse")
+    assert 'app.schemas.user' in modules
+    assert 'app.schemas.resource' not in modules
+
+    from app import schemas
+    assert schemas.ResourceResponse.__name__ == 'ResourceResponse'
+    with pytest.raises(AttributeError):
+        schemas.NotASchema
+
+def test_import_does_not_change_environment():
+    """Test that importing the app leaves the process environment alone."""
+    env = {name: value for name, value in os.environ.items()
+           if name not in ('DATABASE_URL', 'SECRET_KEY', 'JWT_SECRET_KEY')}
+    result, _ = run_python('-c', "import os, app; print(sorted(set(os.environ) & "
+                                 "{'DATABASE_URL', 'SECRET_KEY', 'JWT_SECRET_KEY'}))", env=env)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '[]'
+
+def test_manage_builds_app_only_for_commands():
+    """Test that importing manage.py does not create the app."""
+    result, _ = run_python('-c', "import sys, manage; print('app.api' in sys.modules)")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'False'
+
+def test_production_config_checks_environment():
+    """Test that the factory runs the production config's checks."""
+    env = {name: value for name, value in os.environ.items()
+           if name not in ('DATABASE_URL', 'SECRET_KEY', 'JWT_SECRET_KEY')}
+    result, _ = run_python('-c', "from app import create_app; create_app('production')", env=env)
+    assert result.returncode != 0
+    assert 'SECRET_KEY environment variable is not set' in result.stderr
+
+@pytest.mark.skipif(STARTUP_BUDGET is None, reason='set STARTUP_BUDGET_SECONDS to check cold-start time')
+@pytest.mark.parametrize('args', [
+    ('-c', CREATE_APP),
+    ('manage.py', '--help'),
+], ids=['create_app', 'manage --help'])
+def test_cold_start_within_budget(args):
+    """Test that a cold start stays within the startup budget (retried twice against noisy timings)."""
+    budget = float(STARTUP_BUDGET)
+    timings = []
+    for _ in range(3):
+        result, elapsed = run_python(*args)
+        assert result.returncode == 0, result.stderr
+        timings.append(elapsed)
+        if elapsed < budget:
+            break
+    assert min(timings) < budget, f"cold start took {min(timings):.2f}s, budget {budget}s"
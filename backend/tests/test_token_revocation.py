@@ -0,0 +1,115 @@
+"""
+Tests for refresh tokens, logout and the revoked token blocklist.
+"""
+from datetime import datetime, timedelta
+from app import db
+from app.models import RevokedToken, User
+from app.utils.bloom import BloomFilter
+
+def login(client, email='user@test.com', password='TestUser123'):
+    """Log in and return the response JSON."""
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    assert response.status_code == 200
+    return response.json
+
+def bearer(token):
+    """Build an authorization header for a token."""
+    return {'Authorization': f'Bearer {token}'}
+
+def test_bloom_filter_membership():
+    """Test that the Bloom filter has no false negatives and few false positives."""
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f'jti-{i}')
+
+    assert len(bloom) == 1000
+    assert all(f'jti-{i}' in bloom for i in range(1000))
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+
+def test_refresh_issues_access_token(client):
+    """Test that a refresh token can be exchanged for a new access token."""
+    tokens = login(client)
+
+    response = client.post('/api/auth/refresh', headers=bearer(tokens['refresh_token']))
+    assert response.status_code == 200
+    assert client.get('/api/auth/me', headers=bearer(response.json['token'])).status_code == 200
+
+    # An access token cannot be used to refresh
+    response = client.post('/api/auth/refresh', headers=bearer(tokens['token']))
+    assert response.status_code == 422
+
+def test_logout_revokes_tokens(client):
+    """Test that logout revokes the access token and the supplied refresh token."""
+    tokens = login(client)
+    other_session = login(client)
+
+    response = client.post('/api/auth/logout', headers=bearer(tokens['token']), json={
+        'refresh_token': tokens['refresh_token']
+    })
+    assert response.status_code == 200
+
+    assert client.get('/api/auth/me', headers=bearer(tokens['token'])).status_code == 401
+    assert client.post('/api/auth/refresh', headers=bearer(tokens['refresh_token'])).status_code == 401
+
+    # Tokens from another login are unaffected
+    assert client.get('/api/auth/me', headers=bearer(other_session['token'])).status_code == 200
+
+def test_logout_rejects_foreign_refresh_token(client):
+    """Test that logout only revokes refresh tokens belonging to the caller."""
+    tokens = login(client)
+    other_user = login(client, 'provider@test.com', 'TestProvider123')
+
+    response = client.post('/api/auth/logout', headers=bearer(tokens['token']), json={
+        'refresh_token': other_user['refresh_token']
+    })
+    assert response.status_code == 400
+    assert client.post('/api/auth/refresh', headers=bearer(other_user['refresh_token'])).status_code == 200
+
+def test_revocation_from_another_process(app, client):
+    """Test that rows written by another worker are picked up on refresh."""
+    tokens = login(client)
+
+    with app.app_context():
+        from flask_jwt_extended import decode_token
+        jwt_data = decode_token(tokens['token'])
+        # Another worker writes the row; this process learns of it on its next refresh
+        RevokedToken.revoke(jwt_data)
+        db.session.commit()
+        app.extensions['token_blocklist']._refreshed_at = None
+
+    assert client.get('/api/auth/me', headers=bearer(tokens['token'])).status_code == 401
+
+def test_purge_expired_tokens(app):
+    """Test that expired revocations are purged and live ones kept."""
+    with app.app_context():
+        user = User.query.filter_by(email='user@test.com').first()
+        db.session.add_all([
+            RevokedToken(jti='expired', token_type='access', user_id=user.id,
+                         expires_at=datetime.utcnow() - timedelta(minutes=1)),
+            RevokedToken(jti='live', token_type='refresh', user_id=user.id,
+                         expires_at=datetime.utcnow() + timedelta(days=1))
+        ])
+        db.session.commit()
+
+        assert RevokedToken.purge_expired() == 1
+        assert [token.jti for token in RevokedToken.query.all()] == ['live']
+
+def test_late_committed_revocation_is_seen(app):
+    """Test that a row committed after a higher ID was loaded still reaches the filter."""
+    from app.auth.revocation import TokenBlocklist
+
+    with app.app_context():
+        user = User.query.filter_by(email='user@test.com').first()
+        blocklist = TokenBlocklist(0, 1000, 0.01, timedelta(seconds=60))
+        expires_at = datetime.utcnow() + timedelta(days=1)
+        db.session.add(RevokedToken(id=11, jti='committed-first', token_type='refresh',
+                                    user_id=user.id, expires_at=expires_at))
+        db.session.commit()
+        assert blocklist.is_revoked('committed-first')
+
+        # Got its ID before the row above but committed after it was loaded
+        db.session.add(RevokedToken(id=10, jti='committed-late', token_type='refresh',
+                                    user_id=user.id, expires_at=expires_at))
+        db.session.commit()
+        assert blocklist.is_revoked('committed-late')